@@ -9,6 +9,7 @@ setup(
     python_requires=">=3.11",
     install_requires=[
         "matplotlib>=3.8.0",
+        "numpy>=1.26.0",
         "platformdirs>=4.0.0",
     ],
     extras_require={
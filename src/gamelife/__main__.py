@@ -1,42 +1,266 @@
 """Main entry point for Game of Life application."""
+import argparse
 import logging.handlers
 import os
+import subprocess
+import sys
+from collections import defaultdict
 from pathlib import Path
+from typing import Dict, List, Tuple
 
 import platformdirs
 
-from gamelife.core.config import Config
-from gamelife.gui.app import GameLifeApp
+from gamelife.core.config import Config, config
+from gamelife.core.game import GameEngine
+from gamelife.core.sweeper import sweep_overdue
+from gamelife.data.database import Database
+from gamelife.data.importer import iter_tasks
+
+# Modules imported before the profile screen appears
+STARTUP_MODULES = ("gamelife.__main__", "gamelife.gui.app", "gamelife.gui.views")
 
 def setup_logging():
     """Configure application logging."""
     log_dir = Path(platformdirs.user_log_dir("GameOfLife"))
     log_dir.mkdir(parents=True, exist_ok=True)
     log_file = log_dir / "gamelife.log"
-    
+
     handler = logging.handlers.RotatingFileHandler(
         log_file,
         maxBytes=1048576,  # 1MB
         backupCount=5,
         encoding="utf-8",
     )
-    
+
     formatter = logging.Formatter(
         "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
     handler.setFormatter(formatter)
-    
+
     root_logger = logging.getLogger()
     root_logger.addHandler(handler)
     root_logger.setLevel(logging.INFO)
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog="gamelife",
+        description="Gamified task manager. Runs the GUI when no command is given."
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        help="Path to the database file (defaults to the user data directory)"
+    )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="Report the import-time breakdown of GUI startup and exit"
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    import_parser = subparsers.add_parser(
+        "import",
+        help="Import tasks from a CSV or JSONL file"
+    )
+    import_parser.add_argument("path", type=Path, help="File to import")
+    import_parser.add_argument(
+        "--user",
+        required=True,
+        help="Profile to import into (created if missing)"
+    )
+    import_parser.add_argument(
+        "--format",
+        choices=("csv", "jsonl"),
+        help="Input format (detected from the extension by default)"
+    )
+    import_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help="Tasks written per transaction"
+    )
+
+    recompute_parser = subparsers.add_parser(
+        "recompute-xp",
+        help="Recompute XP and levels from task history after XP rules change"
+    )
+    recompute_parser.add_argument(
+        "--user",
+        help="Only recompute this profile (defaults to all profiles)"
+    )
+    recompute_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show the XP changes without writing them"
+    )
+    recompute_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=10000,
+        help="Tasks read per query"
+    )
+    recompute_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Users written per transaction"
+    )
+
+    sweep_parser = subparsers.add_parser(
+        "sweep",
+        help="Mark tasks past due as overdue and fail long-overdue ones"
+    )
+    sweep_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=config.sweep_config.batch_size,
+        help="Tasks updated per transaction"
+    )
+
+    return parser
+
+def run_import(args: argparse.Namespace) -> int:
+    """Stream tasks from a file into the database.
+    
+    The file is read twice: once to check every record, so a bad record
+    fails the import before anything is written, then to insert the
+    tasks chunk by chunk.
+    """
+    try:
+        for _ in iter_tasks(args.path, 0, args.format):
+            pass
+    except (OSError, ValueError) as e:
+        print(f"Import failed, nothing was imported: {e}", file=sys.stderr)
+        return 1
+    
+    with Database() as db:
+        user = db.get_user(args.user) or db.create_user(args.user)
+        ids = db.create_tasks(
+            iter_tasks(args.path, user.id, args.format),
+            chunk_size=args.chunk_size
+        )
+        # Imported completions can land anywhere in the streak history
+        db.rebuild_completion_calendars([user.id])
+        db.add_task_rollups(ids)
+
+    print(f"Imported {len(ids)} tasks for {user.username}")
+    return 0
+
+def print_recompute_progress(done: int, total: int, tasks: int) -> None:
+    """Report recompute progress on stderr."""
+    print(f"Recomputed {done}/{total} users ({tasks} tasks)", file=sys.stderr)
+
+def run_recompute_xp(args: argparse.Namespace) -> int:
+    """Recompute stored XP under the current XP rules."""
+    from gamelife.core.recompute import recompute_xp  # Deferred: pulls in NumPy
+    
+    with Database() as db:
+        users = None
+        if args.user:
+            user = db.get_user(args.user)
+            if user is None:
+                print(f"No such profile: {args.user}", file=sys.stderr)
+                return 1
+            users = [user]
+
+        rewards = {
+            achievement.__name__: achievement.xp_reward
+            for achievement in GameEngine(db).achievements
+        }
+        changes = recompute_xp(
+            db,
+            rewards,
+            users=users,
+            dry_run=args.dry_run,
+            chunk_size=args.chunk_size,
+            batch_size=args.batch_size,
+            progress=print_recompute_progress
+        )
+
+    for change in changes:
+        print(
+            f"{change.username}: {change.old_xp} -> {change.new_xp} XP "
+            f"({change.delta:+d}), level {change.old_level} -> {change.new_level}"
+        )
+    verb = "Would update" if args.dry_run else "Updated"
+    print(f"{verb} {len(changes)} users")
+    return 0
+
+def run_sweep(args: argparse.Namespace) -> int:
+    """Sweep overdue tasks once, e.g. from cron."""
+    with Database() as db:
+        result = sweep_overdue(GameEngine(db), batch_size=args.batch_size)
+
+    print(
+        f"Marked {result.overdue} tasks overdue, failed {result.failed} "
+        f"({sum(result.xp_lost.values())} XP in penalties)"
+    )
+    return 0
+
+def profile_startup_imports() -> List[Tuple[str, int]]:
+    """Measure startup imports in a fresh interpreter.
+    
+    Runs ``python -X importtime`` on the modules the GUI loads before the
+    profile screen and returns (top-level package, microseconds) pairs,
+    slowest first.
+    """
+    code = "; ".join(f"import {module}" for module in STARTUP_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    
+    totals: Dict[str, int] = defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _cumulative, module = line[len("import time:"):].split("|")
+        totals[module.strip().split(".")[0]] += int(self_us)
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+def run_startup_profile() -> int:
+    """Print the import-time breakdown of GUI startup."""
+    breakdown = profile_startup_imports()
+    total_us = sum(us for _, us in breakdown)
+    
+    print(f"Startup imports: {total_us / 1000:.1f} ms")
+    for package, us in breakdown[:15]:
+        print(f"  {package:<24} {us / 1000:8.1f} ms")
+    for heavy in ("matplotlib", "numpy"):
+        if any(package == heavy for package, _ in breakdown):
+            print(f"Warning: {heavy} is imported at startup")
+    return 0
+
+def main(argv=None):
     """Initialize and run the application."""
+    args = build_parser().parse_args(argv)
+
     setup_logging()
     logger = logging.getLogger(__name__)
+
+    if args.db:
+        config.db_path = args.db
+
+    if args.startup_profile:
+        return run_startup_profile()
+
+    if args.command == "import":
+        return run_import(args)
+
+    if args.command == "recompute-xp":
+        return run_recompute_xp(args)
+
+    if args.command == "sweep":
+        return run_sweep(args)
+
     logger.info("Starting Game of Life Task Manager")
-    
+
     try:
+        from gamelife.gui.app import GameLifeApp  # Deferred: pulls in tkinter
+
         app = GameLifeApp()
         app.run()
     except Exception as e:
@@ -44,4 +268,4 @@ def main():
         raise
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
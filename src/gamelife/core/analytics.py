@@ -0,0 +1,114 @@
+"""Columnar task data and vectorized analytics over it.
+
+Imported on demand by Database.get_task_frame so NumPy is only loaded
+when a report actually asks for a frame.
+"""
+import math
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from gamelife.core.config import TaskPriority, TaskStatus
+
+# Columns a TaskFrame can hold, with their array dtypes
+TASK_FRAME_COLUMNS = {
+    "id": np.int64,
+    "priority": np.int8,
+    "status": np.int8,
+    "due_at": np.float64,
+    "completed_at": np.float64,
+    "category": np.int32,
+}
+
+# Default lateness histogram bins, in hours relative to the due time
+LATENESS_BINS = (-np.inf, -168, -24, -1, 0, 1, 24, 168, np.inf)
+
+@dataclass
+class TaskFrame:
+    """A user's tasks as one NumPy array per column.
+
+    Priority and status hold the enums' integer codes, due_at and
+    completed_at are epoch seconds (completed_at is NaN when unset), and
+    category holds indexes into ``categories`` with -1 for no category.
+    """
+    columns: Dict[str, np.ndarray]
+    categories: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_rows(cls, names: Sequence[str], rows: Sequence[tuple]) -> "TaskFrame":
+        """Build a frame from query rows holding ``names`` in order.
+
+        Timestamps are expected in epoch microseconds and categories as
+        strings. Columns are filled straight from the rows with fromiter,
+        without building intermediate per-column tuples.
+        """
+        columns = {}
+        categories: Dict[str, int] = {}
+        for index, name in enumerate(names):
+            values = map(itemgetter(index), rows)
+            if name == "category":
+                values = (
+                    -1 if category is None else categories.setdefault(category, len(categories))
+                    for category in values
+                )
+            elif name == "completed_at":
+                values = (math.nan if value is None else value for value in values)
+            array = np.fromiter(values, dtype=TASK_FRAME_COLUMNS[name], count=len(rows))
+            if name in ("due_at", "completed_at"):
+                array /= 1e6
+            columns[name] = array
+        return cls(columns, tuple(categories))
+
+    def __len__(self) -> int:
+        """Number of tasks in the frame."""
+        return len(next(iter(self.columns.values()), ()))
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """The array for one column."""
+        return self.columns[name]
+
+def count_by(frame: TaskFrame, column: str) -> Dict[object, int]:
+    """Count tasks grouped by status, priority or category.
+
+    Keys are enum members or category names (None for uncategorized);
+    groups with no tasks are omitted, as in Database.count_tasks_by.
+    """
+    if column == "category":
+        counts = np.bincount(frame[column] + 1, minlength=len(frame.categories) + 1)
+        keys: Sequence[Optional[object]] = (None, *frame.categories)
+    elif column in ("status", "priority"):
+        enum = TaskStatus if column == "status" else TaskPriority
+        counts = np.bincount(frame[column], minlength=max(m.value for m in enum) + 1)
+        keys = [None] * len(counts)
+        for member in enum:
+            keys[member.value] = member
+    else:
+        raise ValueError(f"Cannot group tasks by {column!r}")
+    return {keys[code]: int(count) for code, count in enumerate(counts) if count}
+
+def _lateness_hours(frame: TaskFrame) -> np.ndarray:
+    """Hours between due and completion time of each completed task."""
+    completed = frame["status"] == TaskStatus.COMPLETED.value
+    return (frame["completed_at"][completed] - frame["due_at"][completed]) / 3600
+
+def on_time_rate(frame: TaskFrame) -> float:
+    """Percentage of completed tasks finished by their due time.
+
+    NaN when no task has been completed.
+    """
+    lateness = _lateness_hours(frame)
+    if not len(lateness):
+        return math.nan
+    return 100 * float(np.count_nonzero(lateness <= 0)) / len(lateness)
+
+def lateness_histogram(
+    frame: TaskFrame,
+    bins: Iterable[float] = LATENESS_BINS
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Histogram of completion lateness in hours (negative means early).
+
+    Returns ``(counts, edges)`` as from numpy.histogram.
+    """
+    return np.histogram(_lateness_hours(frame), bins=np.asarray(bins, dtype=float))
@@ -1,8 +1,9 @@
 """Configuration management for Game of Life."""
+import bisect
 from dataclasses import dataclass
 from enum import Enum, auto
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import platformdirs
 
@@ -21,14 +22,100 @@ class TaskStatus(Enum):
     OVERDUE = auto()
     FAILED = auto()
 
+@dataclass(frozen=True)
+class XPRules:
+    """XP configuration compiled into lookup tables.
+
+    Reward and penalty tables are indexed by ``TaskPriority.value - 1``.
+    Early bonus cutoffs are ascending seconds; a task completed
+    ``seconds_early`` before its due time earns
+    ``bonus_pcts[bisect_right(cutoffs, seconds_early)]`` percent extra.
+    """
+    rewards: Tuple[int, ...]
+    penalties: Tuple[int, ...]
+    cutoffs: Tuple[int, ...]
+    bonus_pcts: Tuple[int, ...]
+    xp_floor: int
+
+    @classmethod
+    def compile(cls, xp_config: "XPConfig") -> "XPRules":
+        """Build the tables for an XPConfig."""
+        thresholds = sorted(
+            (
+                threshold["days_early"] * 86400
+                if "days_early" in threshold
+                else threshold["hours_early"] * 3600,
+                threshold["bonus_pct"]
+            )
+            for threshold in xp_config.early_bonus_thresholds
+        )
+        return cls(
+            rewards=tuple(xp_config.base_rewards[p] for p in TaskPriority),
+            penalties=tuple(xp_config.base_penalties[p] for p in TaskPriority),
+            cutoffs=tuple(seconds for seconds, _ in thresholds),
+            bonus_pcts=(0,) + tuple(pct for _, pct in thresholds),
+            xp_floor=xp_config.xp_floor
+        )
+
+    def task_xp(
+        self,
+        priority: TaskPriority,
+        status: TaskStatus,
+        seconds_early: Optional[float] = None
+    ) -> int:
+        """XP for one finished task; penalties are negative.
+
+        Completions earn the priority reward plus the early bonus, rounded
+        down and floored at ``xp_floor``. Unfinished tasks score 0.
+        """
+        if status is TaskStatus.COMPLETED:
+            base = self.rewards[priority.value - 1]
+            if seconds_early is not None:
+                pct = self.bonus_pcts[bisect.bisect_right(self.cutoffs, seconds_early)]
+                base += base * pct // 100
+            return max(base, self.xp_floor)
+        if status is TaskStatus.FAILED:
+            return -self.penalties[priority.value - 1]
+        return 0
+
+    def score(
+        self,
+        priorities: Iterable[TaskPriority],
+        statuses: Iterable[TaskStatus],
+        seconds_early: Iterable[Optional[float]]
+    ) -> List[int]:
+        """XP for many tasks given as parallel columns."""
+        task_xp = self.task_xp
+        return [
+            task_xp(priority, status, early)
+            for priority, status, early in zip(priorities, statuses, seconds_early)
+        ]
+
 @dataclass
 class XPConfig:
-    """Experience points configuration."""
+    """Experience points configuration.
+
+    ``rules`` is compiled on first use and rebuilt after any field is
+    reassigned; assign a new dict or list rather than editing one in place.
+    """
     base_rewards: Dict[TaskPriority, int] = None
     base_penalties: Dict[TaskPriority, int] = None
     early_bonus_thresholds: List[Dict[str, int]] = None
     xp_floor: int = 0
 
+    def __setattr__(self, name, value):
+        """Set a field and drop the compiled rules."""
+        super().__setattr__(name, value)
+        if name != "_rules":
+            super().__setattr__("_rules", None)
+
+    @property
+    def rules(self) -> XPRules:
+        """The compiled rule table for the current settings."""
+        if self._rules is None:
+            self._rules = XPRules.compile(self)
+        return self._rules
+
     def __post_init__(self):
         if self.base_rewards is None:
             self.base_rewards = {
@@ -51,6 +138,40 @@ class XPConfig:
                 {"hours_early": 24, "bonus_pct": 10}
             ]
 
+@dataclass
+class DatabaseConfig:
+    """SQLite connection pool and pragma configuration."""
+    pool_size: int = 4
+    timeout: float = 30.0
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size: int = -16000  # Negative values are KiB, i.e. 16MB
+    mmap_size: int = 268435456  # 256MB
+    xp_snapshot_interval: int = 100  # XP ledger events between balance snapshots
+    object_cache: bool = True  # Read-through cache of users and tasks
+    object_cache_size: int = 10000  # Users, tasks and task id lists kept cached
+
+@dataclass
+class SweepConfig:
+    """Overdue task sweeper configuration."""
+    interval_seconds: int = 300  # How often the GUI sweeps
+    failure_grace_hours: int = 24  # Overdue time before a task fails
+    batch_size: int = 500  # Tasks read and updated per transaction
+
+@dataclass(frozen=True)
+class LevelConfig:
+    """Level curve configuration.
+
+    ``curve`` is "linear" (every level costs ``Config.xp_per_level``),
+    "exponential" (each level costs ``growth`` times the previous one,
+    up to ``max_level``) or "table" (``thresholds`` lists the total XP
+    needed for levels 1, 2, ... and must start at 0).
+    """
+    curve: str = "linear"
+    growth: float = 1.5
+    max_level: int = 100
+    thresholds: Optional[Tuple[int, ...]] = None
+
 @dataclass
 class RankConfig:
     """Rank configuration."""
@@ -64,6 +185,9 @@ class Config:
     ranks: List[RankConfig] = None
     xp_config: XPConfig = None
     db_path: Optional[Path] = None
+    db_config: DatabaseConfig = None
+    level_config: LevelConfig = None
+    sweep_config: SweepConfig = None
 
     def __post_init__(self):
         if self.ranks is None:
@@ -76,8 +200,14 @@ class Config:
                 RankConfig("Master", 1500),
                 RankConfig("Legend", 2500)
             ]
+        if self.level_config is None:
+            self.level_config = LevelConfig()
         if self.xp_config is None:
             self.xp_config = XPConfig()
+        if self.sweep_config is None:
+            self.sweep_config = SweepConfig()
+        if self.db_config is None:
+            self.db_config = DatabaseConfig()
         if self.db_path is None:
             data_dir = Path(platformdirs.user_data_dir("GameOfLife"))
             data_dir.mkdir(parents=True, exist_ok=True)
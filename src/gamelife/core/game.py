@@ -1,15 +1,32 @@
 """Game mechanics implementation for XP, levels, and achievements."""
 import datetime
-from typing import Optional
+from collections import defaultdict
+from dataclasses import dataclass, field
+from enum import Enum, auto
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Type
 
 from gamelife.core.config import TaskPriority, TaskStatus, config
-from gamelife.data.database import Database, Task, User
+from gamelife.core.progression import get_progression
+from gamelife.core.streaks import completion_day
+from gamelife.data.database import DailyRollup, Database, Task, User, XPEvent
+
+class GameEvent(Enum):
+    """Events that can unlock achievements."""
+    TASK_COMPLETED = auto()
+    TASK_FAILED = auto()
+    STREAK_CHANGED = auto()
+    LEVEL_UP = auto()
 
 class Achievement:
-    """Base class for achievements."""
+    """Base class for achievements.
+    
+    ``events`` lists the game events after which the achievement is
+    re-checked; it is never evaluated for other events or once unlocked.
+    """
     name: str
     description: str
     xp_reward: int = 50
+    events: FrozenSet[GameEvent] = frozenset()
     
     @classmethod
     def check(cls, user: User, db: Database) -> bool:
@@ -21,18 +38,19 @@ class FirstTaskCompleted(Achievement):
     name = "First Steps"
     description = "Complete your first task"
     xp_reward = 25
+    events = frozenset({GameEvent.TASK_COMPLETED})
     
     @classmethod
     def check(cls, user: User, db: Database) -> bool:
         """Check if user has completed at least one task."""
-        tasks = db.get_tasks(user.id, TaskStatus.COMPLETED)
-        return bool(tasks)
+        return db.exists_task(user.id, TaskStatus.COMPLETED)
 
 class SevenDayStreak(Achievement):
     """Achievement for maintaining a 7-day streak."""
     name = "Week Warrior"
     description = "Maintain a 7-day completion streak"
     xp_reward = 100
+    events = frozenset({GameEvent.STREAK_CHANGED})
     
     @classmethod
     def check(cls, user: User, db: Database) -> bool:
@@ -44,12 +62,56 @@ class HundredTasksCompleted(Achievement):
     name = "Century Club"
     description = "Complete 100 tasks"
     xp_reward = 500
+    events = frozenset({GameEvent.TASK_COMPLETED})
     
     @classmethod
     def check(cls, user: User, db: Database) -> bool:
         """Check if user has completed 100 tasks."""
-        tasks = db.get_tasks(user.id, TaskStatus.COMPLETED)
-        return len(tasks) >= 100
+        return db.count_tasks(user.id, TaskStatus.COMPLETED) >= 100
+
+class AchievementRegistry:
+    """Achievement classes indexed by the events they listen to."""
+    
+    def __init__(self, achievements: Iterable[Type[Achievement]] = ()):
+        """Initialize the registry with an optional set of achievements."""
+        self._achievements: List[Type[Achievement]] = []
+        self._subscribers: Dict[GameEvent, List[Type[Achievement]]] = defaultdict(list)
+        for achievement_class in achievements:
+            self.register(achievement_class)
+    
+    def __iter__(self) -> Iterator[Type[Achievement]]:
+        """Iterate over achievements in registration order."""
+        return iter(self._achievements)
+    
+    def __len__(self) -> int:
+        """Number of registered achievements."""
+        return len(self._achievements)
+    
+    def register(self, achievement_class: Type[Achievement]) -> Type[Achievement]:
+        """Add an achievement; returns it so this can be used as a decorator."""
+        self._achievements.append(achievement_class)
+        for event in achievement_class.events:
+            self._subscribers[event].append(achievement_class)
+        return achievement_class
+    
+    def subscribers(self, events: Iterable[GameEvent]) -> List[Type[Achievement]]:
+        """Return achievements listening to any of ``events``, in order."""
+        seen = {}
+        for event in events:
+            for achievement_class in self._subscribers.get(event, ()):
+                seen.setdefault(achievement_class, None)
+        return list(seen)
+
+@dataclass
+class BatchCompletionResult:
+    """XP breakdown for a batch of completed tasks."""
+    task_xp: Dict[int, int] = field(default_factory=dict)
+    achievement_xp: Dict[int, int] = field(default_factory=dict)
+    
+    @property
+    def total_xp(self) -> int:
+        """Total XP earned from tasks and achievements."""
+        return sum(self.task_xp.values()) + sum(self.achievement_xp.values())
 
 class GameEngine:
     """Core game mechanics implementation."""
@@ -57,11 +119,11 @@ class GameEngine:
     def __init__(self, db: Database):
         """Initialize game engine with database connection."""
         self.db = db
-        self.achievements = [
+        self.achievements = AchievementRegistry([
             FirstTaskCompleted,
             SevenDayStreak,
             HundredTasksCompleted
-        ]
+        ])
     
     def calculate_task_xp(
         self,
@@ -69,101 +131,204 @@ class GameEngine:
         completion_time: Optional[datetime.datetime] = None
     ) -> int:
         """Calculate XP for task completion or penalty for failure."""
-        if task.status not in (TaskStatus.COMPLETED, TaskStatus.FAILED):
-            return 0
-        
-        # Get base XP values
-        if task.status == TaskStatus.COMPLETED:
-            base_xp = config.xp_config.base_rewards[task.priority]
-            if completion_time:
-                # Calculate early completion bonus
-                time_early = task.due_at - completion_time
-                for threshold in config.xp_config.early_bonus_thresholds:
-                    if "days_early" in threshold:
-                        if time_early >= datetime.timedelta(days=threshold["days_early"]):
-                            bonus = base_xp * (threshold["bonus_pct"] / 100)
-                            base_xp += bonus
-                            break
-                    elif "hours_early" in threshold:
-                        if time_early >= datetime.timedelta(hours=threshold["hours_early"]):
-                            bonus = base_xp * (threshold["bonus_pct"] / 100)
-                            base_xp += bonus
-                            break
-        else:  # FAILED
-            base_xp = -config.xp_config.base_penalties[task.priority]
-        
-        return max(base_xp, config.xp_config.xp_floor)
+        seconds_early = None
+        if completion_time and task.status == TaskStatus.COMPLETED:
+            seconds_early = (task.due_at - completion_time).total_seconds()
+        # FAILED: penalties are negative; the user's balance is floored by
+        # the caller, not the penalty itself
+        return config.xp_config.rules.task_xp(task.priority, task.status, seconds_early)
+    
+    def calculate_xp_batch(
+        self,
+        tasks: Sequence[Task],
+        completion_time: Optional[datetime.datetime] = None
+    ) -> List[int]:
+        """Calculate XP for many tasks in one pass over the rule table.
+        
+        Early bonuses are measured from ``completion_time`` if given,
+        otherwise from each task's own ``completed_at``.
+        """
+        seconds_early = []
+        for task in tasks:
+            completed_at = completion_time or task.completed_at
+            seconds_early.append(
+                (task.due_at - completed_at).total_seconds()
+                if completed_at and task.status == TaskStatus.COMPLETED
+                else None
+            )
+        return config.xp_config.rules.score(
+            (task.priority for task in tasks),
+            (task.status for task in tasks),
+            seconds_early
+        )
     
     def update_user_level(self, user: User) -> None:
         """Update user level based on XP."""
         old_level = user.level
-        new_level = (user.xp // config.xp_per_level) + 1
+        new_level = get_progression().level_for(user.xp)
         
         if new_level != old_level:
             user.level = new_level
-            self.db.update_user_xp(user.id, user.xp, user.level)
+            with self.db.transaction():
+                self.db.update_user_xp(user.id, user.xp, user.level)
     
     def get_user_rank(self, user: User) -> str:
         """Get user's current rank based on XP."""
-        current_rank = config.ranks[0].name
-        for rank in config.ranks:
-            if user.xp >= rank.xp_min:
-                current_rank = rank.name
-            else:
-                break
-        return current_rank
-    
-    def update_streak(self, user: User) -> None:
-        """Update user's completion streak."""
-        today = datetime.date.today()
-        
-        if user.last_completion_date is None:
-            user.streak = 1
-        elif user.last_completion_date == today:
-            return  # Already updated today
-        elif user.last_completion_date == today - datetime.timedelta(days=1):
-            user.streak += 1
-        else:
-            user.streak = 1
-        
-        user.longest_streak = max(user.streak, user.longest_streak)
-        user.last_completion_date = today
-        
-        self.db.update_user_streak(
-            user.id,
-            user.streak,
-            user.longest_streak,
-            user.last_completion_date
-        )
+        return get_progression().rank_for(user.xp)
+    
+    def update_streak(
+        self,
+        user: User,
+        completed_at: Optional[datetime.datetime] = None
+    ) -> None:
+        """Record a completion day and refresh the user's streaks.
+        
+        The day is marked in the user's completion calendar and the
+        streaks are derived from it, so completions backfilled for earlier
+        days count correctly. ``completed_at`` defaults to now.
+        """
+        day = completion_day(completed_at) if completed_at else datetime.date.today()
+        calendar = self.db.get_completion_calendar(user.id)
+        if day in calendar:
+            return  # Already counted
+        calendar.add(day)
+        
+        # A completion dated in the future counts as of that day
+        today = max(datetime.date.today(), calendar.last_day)
+        user.streak = calendar.current_streak(today)
+        user.longest_streak = calendar.longest_streak()
+        user.last_completion_date = calendar.last_day
+        
+        with self.db.transaction():
+            self.db.save_completion_calendar(user.id, calendar)
+            self.db.update_user_streak(
+                user.id,
+                user.streak,
+                user.longest_streak,
+                user.last_completion_date
+            )
     
     def check_achievements(self, user: User) -> list[Achievement]:
-        """Check and return any newly completed achievements."""
+        """Return achievements the user has unlocked or currently meets.
+        
+        This does not persist anything; unlocking happens in dispatch().
+        """
+        unlocked = self.db.get_unlocked_achievements(user.id)
         completed = []
         for achievement_class in self.achievements:
-            if achievement_class.check(user, self.db):
+            if (
+                achievement_class.__name__ in unlocked
+                or achievement_class.check(user, self.db)
+            ):
                 completed.append(achievement_class)
         return completed
     
+    def dispatch(self, user: User, *events: GameEvent) -> list[Achievement]:
+        """Evaluate still-locked achievements subscribed to ``events``.
+        
+        Newly met achievements are recorded in user_achievements and
+        returned; the caller is responsible for granting their XP.
+        """
+        candidates = self.achievements.subscribers(events)
+        if not candidates:
+            return []
+        
+        unlocked = self.db.get_unlocked_achievements(user.id)
+        unlocked_at = datetime.datetime.now(datetime.UTC)
+        newly_unlocked = []
+        for achievement_class in candidates:
+            if achievement_class.__name__ in unlocked:
+                continue
+            if achievement_class.check(user, self.db) and self.db.unlock_achievement(
+                user.id, achievement_class.__name__, unlocked_at
+            ):
+                newly_unlocked.append(achievement_class)
+        return newly_unlocked
+    
+    def _apply_progress(
+        self,
+        user: User,
+        event: GameEvent,
+        completed_at: Optional[datetime.datetime] = None
+    ) -> list[Achievement]:
+        """Update level (and the streak, for completions), then dispatch the events.
+        
+        Rewards of newly unlocked achievements are added to ``user.xp`` and
+        the level is recomputed, dispatching LEVEL_UP again if the rewards
+        raised it. Returns every achievement unlocked along the way.
+        """
+        old_level, old_streak = user.level, user.streak
+        self.update_user_level(user)
+        if completed_at is not None:
+            self.update_streak(user, completed_at)
+        
+        events = [event]
+        if user.streak != old_streak:
+            events.append(GameEvent.STREAK_CHANGED)
+        unlocked: list[Achievement] = []
+        while True:
+            if user.level > old_level:
+                events.append(GameEvent.LEVEL_UP)
+            new_achievements = self.dispatch(user, *events)
+            if not new_achievements:
+                return unlocked
+            unlocked += new_achievements
+            user.xp += sum(a.xp_reward for a in new_achievements)
+            old_level = user.level
+            self.update_user_level(user)
+            events = []
+    
+    @staticmethod
+    def _achievement_events(
+        user: User,
+        achievements: list[Achievement],
+        when: datetime.datetime
+    ) -> List[XPEvent]:
+        """Ledger entries for achievement rewards."""
+        return [
+            XPEvent(user.id, a.xp_reward, f"achievement:{a.__name__}", None, when)
+            for a in achievements
+        ]
+    
+    def xp_at(self, user: User, when: datetime.datetime) -> tuple[int, int]:
+        """Reconstruct a user's (xp, level) at a point in time from the ledger."""
+        xp = self.db.get_xp_balance_at(user.id, when)
+        return xp, get_progression().level_for(xp)
+    
     def complete_task(self, task: Task, completion_time: datetime.datetime) -> int:
         """Handle task completion and return XP earned."""
         if task.status != TaskStatus.COMPLETED:
-            task.status = TaskStatus.COMPLETED
-            task.completed_at = completion_time
-            self.db.update_task_status(task.id, task.status, task.completed_at)
-            
-            xp_earned = self.calculate_task_xp(task, completion_time)
-            user = self.db.get_user_by_id(task.user_id)
-            user.xp += xp_earned
-            
-            self.update_user_level(user)
-            self.update_streak(user)
-            
-            # Check for new achievements
-            new_achievements = self.check_achievements(user)
-            achievement_xp = sum(a.xp_reward for a in new_achievements)
-            user.xp += achievement_xp
-            
-            self.db.update_user_xp(user.id, user.xp, user.level)
+            with self.db.transaction():
+                task.status = TaskStatus.COMPLETED
+                task.completed_at = completion_time
+                self.db.update_task_status(task.id, task.status, task.completed_at)
+                
+                xp_earned = self.calculate_task_xp(task, completion_time)
+                user = self.db.get_user_by_id(task.user_id)
+                user.xp += xp_earned
+                ledger = [XPEvent(
+                    user.id, xp_earned, "task_completed", task.id, completion_time
+                )]
+                
+                # Check for new achievements
+                new_achievements = self._apply_progress(
+                    user, GameEvent.TASK_COMPLETED, completion_time
+                )
+                achievement_xp = sum(a.xp_reward for a in new_achievements)
+                ledger += self._achievement_events(user, new_achievements, completion_time)
+                
+                self.db.update_user_xp(user.id, user.xp, user.level)
+                self.db.record_xp_events(ledger)
+                self.db.add_user_xp_totals(
+                    user.id,
+                    earned=xp_earned + achievement_xp
+                )
+                self.db.add_daily_rollups([(user.id, DailyRollup(
+                    day=completion_day(completion_time),
+                    priority=task.priority,
+                    completed=1,
+                    xp_gained=xp_earned
+                ))])
             return xp_earned + achievement_xp
         
         return 0
@@ -171,15 +336,180 @@ class GameEngine:
     def fail_task(self, task: Task) -> int:
         """Handle task failure and return XP penalty."""
         if task.status != TaskStatus.FAILED:
-            task.status = TaskStatus.FAILED
-            self.db.update_task_status(task.id, task.status)
+            with self.db.transaction():
+                task.status = TaskStatus.FAILED
+                self.db.update_task_status(task.id, task.status)
+                
+                xp_penalty = self.calculate_task_xp(task)
+                user = self.db.get_user_by_id(task.user_id)
+                old_xp = user.xp
+                user.xp = max(0, user.xp + xp_penalty)  # Don't go below 0
+                # Totals, rollups and the ledger hold the XP actually lost
+                xp_lost = old_xp - user.xp
+                failed_at = datetime.datetime.now(datetime.UTC)
+                ledger = [XPEvent(
+                    user.id, -xp_lost, "task_failed", task.id, failed_at
+                )]
+                
+                new_achievements = self._apply_progress(user, GameEvent.TASK_FAILED)
+                achievement_xp = sum(a.xp_reward for a in new_achievements)
+                ledger += self._achievement_events(user, new_achievements, failed_at)
+                
+                self.db.update_user_xp(user.id, user.xp, user.level)
+                self.db.record_xp_events(ledger)
+                self.db.add_user_xp_totals(
+                    user.id,
+                    earned=achievement_xp,
+                    lost=xp_lost
+                )
+                self.db.add_daily_rollups([(user.id, DailyRollup(
+                    day=completion_day(failed_at),
+                    priority=task.priority,
+                    failed=1,
+                    xp_lost=xp_lost
+                ))])
+            return xp_penalty
+        
+        return 0
+    
+    def complete_tasks(
+        self,
+        tasks: Iterable[Task],
+        completion_time: datetime.datetime
+    ) -> BatchCompletionResult:
+        """Complete many tasks at once in a single transaction.
+        
+        Task XP is summed per user, then level, streak and achievements are
+        evaluated once per user rather than once per task. Returns the XP
+        earned by each task id and the achievement XP granted to each user.
+        """
+        result = BatchCompletionResult()
+        by_user: Dict[int, List[Task]] = defaultdict(list)
+        for task in tasks:
+            if task.status == TaskStatus.COMPLETED:
+                result.task_xp[task.id] = 0
+                continue
+            task.status = TaskStatus.COMPLETED
+            task.completed_at = completion_time
+            by_user[task.user_id].append(task)
+        
+        if not by_user:
+            return result
+        
+        with self.db.transaction():
+            self.db.update_task_statuses(
+                (task.id, task.status, task.completed_at)
+                for user_tasks in by_user.values()
+                for task in user_tasks
+            )
             
-            xp_penalty = self.calculate_task_xp(task)
-            user = self.db.get_user_by_id(task.user_id)
-            user.xp = max(0, user.xp + xp_penalty)  # Don't go below 0
+            for user_id, user_tasks in by_user.items():
+                user = self.db.get_user_by_id(user_id)
+                ledger = []
+                task_xp = self.calculate_xp_batch(user_tasks, completion_time)
+                for task, xp_earned in zip(user_tasks, task_xp):
+                    result.task_xp[task.id] = xp_earned
+                    user.xp += xp_earned
+                    ledger.append(XPEvent(
+                        user_id, xp_earned, "task_completed", task.id, completion_time
+                    ))
+                
+                new_achievements = self._apply_progress(
+                    user, GameEvent.TASK_COMPLETED, completion_time
+                )
+                achievement_xp = sum(a.xp_reward for a in new_achievements)
+                result.achievement_xp[user_id] = achievement_xp
+                ledger += self._achievement_events(user, new_achievements, completion_time)
+                
+                self.db.update_user_xp(user.id, user.xp, user.level)
+                self.db.record_xp_events(ledger)
+                self.db.add_user_xp_totals(
+                    user.id,
+                    earned=sum(result.task_xp[t.id] for t in user_tasks) + achievement_xp
+                )
+                
+                rollups: Dict[TaskPriority, DailyRollup] = {}
+                for task in user_tasks:
+                    rollup = rollups.setdefault(task.priority, DailyRollup(
+                        day=completion_day(completion_time),
+                        priority=task.priority
+                    ))
+                    rollup.completed += 1
+                    rollup.xp_gained += result.task_xp[task.id]
+                self.db.add_daily_rollups(
+                    (user_id, rollup) for rollup in rollups.values()
+                )
+        
+        return result
+    
+    def fail_tasks(
+        self,
+        tasks: Iterable[Task],
+        failed_at: Optional[datetime.datetime] = None
+    ) -> Dict[int, int]:
+        """Fail many tasks at once in a single transaction.
+        
+        Penalties are applied per user in one update, with the balance
+        floored at 0 as in fail_task. Unlike fail_task, returns the XP
+        actually lost (as a negative value) by each task id, so penalties
+        cut short by the floor are reported as applied; already failed
+        tasks score 0.
+        """
+        failed_at = failed_at or datetime.datetime.now(datetime.UTC)
+        penalties: Dict[int, int] = {}
+        by_user: Dict[int, List[Task]] = defaultdict(list)
+        for task in tasks:
+            if task.status == TaskStatus.FAILED:
+                penalties[task.id] = 0
+                continue
+            task.status = TaskStatus.FAILED
+            by_user[task.user_id].append(task)
+        
+        if not by_user:
+            return penalties
+        
+        with self.db.transaction():
+            self.db.update_task_statuses(
+                (task.id, task.status, None)
+                for user_tasks in by_user.values()
+                for task in user_tasks
+            )
             
-            self.update_user_level(user)
-            self.db.update_user_xp(user.id, user.xp, user.level)
-            return xp_penalty
+            for user_id, user_tasks in by_user.items():
+                user = self.db.get_user_by_id(user_id)
+                ledger = []
+                rollups: Dict[TaskPriority, DailyRollup] = {}
+                total_lost = 0
+                task_xp = self.calculate_xp_batch(user_tasks)
+                for task, xp_penalty in zip(user_tasks, task_xp):
+                    old_xp = user.xp
+                    user.xp = max(0, user.xp + xp_penalty)
+                    xp_lost = old_xp - user.xp
+                    penalties[task.id] = -xp_lost
+                    total_lost += xp_lost
+                    ledger.append(XPEvent(
+                        user_id, -xp_lost, "task_failed", task.id, failed_at
+                    ))
+                    rollup = rollups.setdefault(task.priority, DailyRollup(
+                        day=completion_day(failed_at),
+                        priority=task.priority
+                    ))
+                    rollup.failed += 1
+                    rollup.xp_lost += xp_lost
+                
+                new_achievements = self._apply_progress(user, GameEvent.TASK_FAILED)
+                achievement_xp = sum(a.xp_reward for a in new_achievements)
+                ledger += self._achievement_events(user, new_achievements, failed_at)
+                
+                self.db.update_user_xp(user.id, user.xp, user.level)
+                self.db.record_xp_events(ledger)
+                self.db.add_user_xp_totals(
+                    user.id,
+                    earned=achievement_xp,
+                    lost=total_lost
+                )
+                self.db.add_daily_rollups(
+                    (user_id, rollup) for rollup in rollups.values()
+                )
         
-        return 0
\ No newline at end of file
+        return penalties
\ No newline at end of file
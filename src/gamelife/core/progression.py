@@ -0,0 +1,145 @@
+"""Level curves and rank lookup."""
+import bisect
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from gamelife.core.config import LevelConfig, RankConfig, config
+
+class LevelCurve:
+    """Maps XP to levels; level 1 starts at 0 XP."""
+
+    def level_for(self, xp: int) -> int:
+        """Level reached with ``xp``."""
+        raise NotImplementedError
+
+    def xp_for_level(self, level: int) -> int:
+        """Total XP needed to reach ``level``."""
+        raise NotImplementedError
+
+class LinearCurve(LevelCurve):
+    """Every level costs the same amount of XP."""
+
+    def __init__(self, xp_per_level: int):
+        """Initialize the curve with the XP cost of one level."""
+        if xp_per_level < 1:
+            raise ValueError("xp_per_level must be at least 1")
+        self.xp_per_level = xp_per_level
+
+    def level_for(self, xp: int) -> int:
+        """Level reached with ``xp``."""
+        return max(xp, 0) // self.xp_per_level + 1
+
+    def xp_for_level(self, level: int) -> int:
+        """Total XP needed to reach ``level``."""
+        return (max(level, 1) - 1) * self.xp_per_level
+
+class TableCurve(LevelCurve):
+    """Levels at precomputed XP thresholds, found with ``bisect``.
+
+    ``thresholds[i]`` is the total XP needed for level ``i + 1``; XP past
+    the last threshold stays at the top level.
+    """
+
+    def __init__(self, thresholds: Sequence[int]):
+        """Initialize the curve from ascending thresholds starting at 0."""
+        thresholds = tuple(thresholds)
+        if not thresholds or thresholds[0] != 0:
+            raise ValueError("Level thresholds must start at 0")
+        if any(a >= b for a, b in zip(thresholds, thresholds[1:])):
+            raise ValueError("Level thresholds must be strictly increasing")
+        self.thresholds = thresholds
+
+    @classmethod
+    def exponential(cls, base: int, growth: float, max_level: int) -> "TableCurve":
+        """Curve where each level costs ``growth`` times the previous one."""
+        thresholds = [0]
+        cost = float(base)
+        for _ in range(max_level - 1):
+            thresholds.append(thresholds[-1] + max(round(cost), 1))
+            cost *= growth
+        return cls(thresholds)
+
+    def level_for(self, xp: int) -> int:
+        """Level reached with ``xp``."""
+        return max(bisect.bisect_right(self.thresholds, xp), 1)
+
+    def xp_for_level(self, level: int) -> int:
+        """Total XP needed to reach ``level``."""
+        return self.thresholds[min(max(level, 1), len(self.thresholds)) - 1]
+
+def build_curve(level_config: LevelConfig, xp_per_level: int) -> LevelCurve:
+    """Create the level curve described by the configuration."""
+    if level_config.curve == "linear":
+        return LinearCurve(xp_per_level)
+    if level_config.curve == "exponential":
+        return TableCurve.exponential(
+            xp_per_level, level_config.growth, level_config.max_level
+        )
+    if level_config.curve == "table":
+        if level_config.thresholds is None:
+            raise ValueError("A table level curve needs thresholds")
+        return TableCurve(level_config.thresholds)
+    raise ValueError(f"Unknown level curve: {level_config.curve}")
+
+class Progression:
+    """Rank and level lookup over precomputed threshold arrays.
+
+    Ranks are sorted by ``xp_min`` once, so lookups are a ``bisect`` over
+    the thresholds no matter how many tiers are configured. XP below the
+    lowest threshold maps to the lowest rank.
+    """
+
+    def __init__(self, ranks: Iterable[RankConfig], curve: LevelCurve):
+        """Initialize lookup tables for the given ranks and level curve."""
+        ranks = sorted(ranks, key=lambda rank: rank.xp_min)
+        if not ranks:
+            raise ValueError("At least one rank is required")
+        self.rank_names: Tuple[str, ...] = tuple(rank.name for rank in ranks)
+        self.rank_thresholds: Tuple[int, ...] = tuple(rank.xp_min for rank in ranks)
+        self.curve = curve
+
+    def rank_for(self, xp: int) -> str:
+        """Rank name for an XP balance."""
+        index = bisect.bisect_right(self.rank_thresholds, xp)
+        return self.rank_names[max(index - 1, 0)]
+
+    def ranks_for(self, xp_values: Iterable[int]) -> List[str]:
+        """Rank names for many XP balances, e.g. a leaderboard page."""
+        names = self.rank_names
+        thresholds = self.rank_thresholds
+        find = bisect.bisect_right
+        return [names[max(find(thresholds, xp) - 1, 0)] for xp in xp_values]
+
+    def level_for(self, xp: int) -> int:
+        """Level for an XP balance."""
+        return self.curve.level_for(xp)
+
+    def levels_for(self, xp_values: Iterable[int]) -> List[int]:
+        """Levels for many XP balances."""
+        level_for = self.curve.level_for
+        return [level_for(xp) for xp in xp_values]
+
+    def xp_for_level(self, level: int) -> int:
+        """Total XP needed to reach ``level``."""
+        return self.curve.xp_for_level(level)
+
+_cache: Optional[Tuple[list, int, LevelConfig, Progression]] = None
+
+def get_progression() -> Progression:
+    """Progression for the global config, rebuilt when it changes.
+
+    Changes are detected by identity, so replace ``config.ranks`` or
+    ``config.level_config`` rather than editing them in place.
+    """
+    global _cache
+    if (
+        _cache is None
+        or _cache[0] is not config.ranks
+        or _cache[1] != config.xp_per_level
+        or _cache[2] is not config.level_config
+    ):
+        progression = Progression(
+            config.ranks,
+            build_curve(config.level_config, config.xp_per_level)
+        )
+        _cache = (config.ranks, config.xp_per_level, config.level_config, progression)
+    return _cache[3]
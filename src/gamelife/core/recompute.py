@@ -0,0 +1,200 @@
+"""Bulk recomputation of user XP after the XP rules change."""
+import bisect
+import datetime
+import functools
+import math
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from gamelife.core.config import TaskStatus, XPRules, config
+from gamelife.core.progression import get_progression
+from gamelife.data.database import Database, FinishedTask, User, XPEvent
+
+# Called with (users done, total users, tasks scored) after each batch
+Progress = Callable[[int, int, int], None]
+
+@dataclass
+class XPChange:
+    """A user whose stored XP differs from the recomputed value."""
+    user_id: int
+    username: str
+    old_xp: int
+    new_xp: int
+    old_level: int
+    new_level: int
+
+    @property
+    def delta(self) -> int:
+        """XP added (or removed, if negative) by the recomputation."""
+        return self.new_xp - self.old_xp
+
+def _epoch(moment: datetime.datetime) -> float:
+    """Seconds since the epoch, treating naive datetimes as UTC."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.UTC)
+    return moment.timestamp()
+
+@functools.lru_cache(maxsize=4)
+def _price_tables(rules: XPRules) -> Tuple[np.ndarray, ...]:
+    """XPRules tables as arrays; rewards and penalties indexed by priority value."""
+    return (
+        np.array((0, *rules.rewards), dtype=np.int64),
+        np.array((0, *rules.penalties), dtype=np.int64),
+        np.array(rules.cutoffs, dtype=np.float64),
+        np.array(rules.bonus_pcts, dtype=np.int64),
+    )
+
+def task_deltas(
+    priorities: np.ndarray,
+    statuses: np.ndarray,
+    seconds_early: np.ndarray,
+    rules: XPRules
+) -> np.ndarray:
+    """XP change of each task given as arrays of priority and status values.
+
+    ``seconds_early`` is NaN for tasks without a completion time. Matches
+    ``XPRules.task_xp`` per task: the bonus bucket is found with
+    searchsorted over the cutoffs, and rewards and penalties are looked up
+    by indexing with the priority values. Tasks neither completed nor
+    failed score 0.
+    """
+    rewards, penalties, cutoffs, bonus_pcts = _price_tables(rules)
+    completed = statuses == TaskStatus.COMPLETED.value
+    failed = statuses == TaskStatus.FAILED.value
+
+    deltas = np.zeros(len(statuses), dtype=np.int64)
+    base = rewards[priorities[completed]]
+    early = seconds_early[completed]
+    pct = np.where(
+        np.isnan(early), 0, bonus_pcts[np.searchsorted(cutoffs, early, side="right")]
+    )
+    deltas[completed] = np.maximum(base + base * pct // 100, rules.xp_floor)
+    deltas[failed] = -penalties[priorities[failed]]
+    return deltas
+
+def _chunk_deltas(tasks: Sequence[FinishedTask], rules: XPRules) -> np.ndarray:
+    """Per-task XP changes for a chunk of finished tasks."""
+    count = len(tasks)
+    priorities = np.fromiter((task[0].value for task in tasks), np.int64, count)
+    statuses = np.fromiter((task[1].value for task in tasks), np.int64, count)
+    seconds_early = np.fromiter(
+        (
+            _epoch(task[2]) - _epoch(task[3]) if task[3] else math.nan
+            for task in tasks
+        ),
+        np.float64,
+        count
+    )
+    return task_deltas(priorities, statuses, seconds_early, rules)
+
+def score_tasks(tasks: Sequence[FinishedTask], rules: XPRules) -> int:
+    """Net XP for a chunk of finished tasks under ``rules``, without floors.
+
+    The chunk is turned into one array per column and scored with
+    task_deltas rather than task by task.
+    """
+    return int(_chunk_deltas(tasks, rules).sum())
+
+def replay_balance(balance: int, deltas: np.ndarray) -> int:
+    """Apply ``deltas`` in order to ``balance``, flooring it at 0 after each.
+
+    Equivalent to ``balance = max(0, balance + delta)`` per step, as
+    GameEngine applies failure penalties, computed from the prefix sums:
+    the floor only matters at their lowest point.
+    """
+    if not len(deltas):
+        return balance
+    totals = np.cumsum(deltas)
+    return int(totals[-1] - min(-balance, totals.min()))
+
+def recompute_xp(
+    db: Database,
+    achievement_rewards: Dict[str, int],
+    users: Optional[Iterable[User]] = None,
+    dry_run: bool = False,
+    chunk_size: int = 10000,
+    batch_size: int = 500,
+    progress: Optional[Progress] = None
+) -> List[XPChange]:
+    """Recompute every user's XP and level from their task history.
+
+    A user's finished tasks are replayed in the order they were finished,
+    scored under the current ``config.xp_config``, together with the
+    rewards of their unlocked achievements (``achievement_rewards`` maps
+    achievement keys to XP) at their unlock times. As in GameEngine, the
+    balance is floored at 0 after each failure. Tasks are streamed
+    ``chunk_size`` at a time, and changed users are written ``batch_size``
+    at a time, each batch in one transaction together with a
+    ``recompute`` ledger entry per user. With ``dry_run`` nothing is
+    written.
+
+    Returns the users whose XP or level changed.
+    """
+    rules = config.xp_config.rules
+    progression = get_progression()
+    if users is None:
+        total_users = db.count_users()
+        users = db.iter_users()
+    else:
+        users = list(users)
+        total_users = len(users)
+
+    changes: List[XPChange] = []
+    pending: List[XPChange] = []
+    done = tasks_scored = 0
+
+    def flush() -> None:
+        """Write the pending batch of changes."""
+        if not dry_run and pending:
+            now = datetime.datetime.now(datetime.UTC)
+            with db.transaction():
+                db.update_users_xp(
+                    (change.user_id, change.new_xp, change.new_level)
+                    for change in pending
+                )
+                db.record_xp_events(
+                    XPEvent(change.user_id, change.delta, "recompute", None, now)
+                    for change in pending
+                    if change.delta
+                )
+        pending.clear()
+        if progress is not None:
+            progress(done, total_users, tasks_scored)
+
+    for user in users:
+        unlocks = sorted(
+            (_epoch(unlocked_at), achievement_rewards.get(key, 0))
+            for key, unlocked_at in db.get_unlocked_achievements(user.id).items()
+        )
+        xp = 0
+        for chunk in db.iter_finished_tasks(user.id, chunk_size):
+            times = np.fromiter((_epoch(task[4]) for task in chunk), np.float64, len(chunk))
+            deltas = _chunk_deltas(chunk, rules)
+            # Achievements unlocked before this chunk's last task go in
+            # between its tasks; ties go after the task that unlocked them
+            due = bisect.bisect_left(unlocks, (times[-1], math.inf))
+            if due:
+                unlock_times, rewards = zip(*unlocks[:due])
+                del unlocks[:due]
+                order = np.argsort(
+                    np.concatenate([times, unlock_times]), kind="stable"
+                )
+                deltas = np.concatenate([deltas, rewards])[order]
+            xp = replay_balance(xp, deltas)
+            tasks_scored += len(chunk)
+        xp = replay_balance(xp, np.array([reward for _, reward in unlocks], np.int64))
+
+        done += 1
+        level = progression.level_for(xp)
+        if (xp, level) != (user.xp, user.level):
+            change = XPChange(user.id, user.username, user.xp, xp, user.level, level)
+            changes.append(change)
+            pending.append(change)
+        if done % batch_size == 0:
+            flush()
+
+    if done % batch_size:
+        flush()
+    return changes
@@ -0,0 +1,102 @@
+"""Completion-day calendars and the streaks derived from them."""
+import datetime
+from typing import Iterable, Optional
+
+def completion_day(moment: datetime.datetime) -> datetime.date:
+    """Local calendar day of a completion time.
+
+    Aware timestamps are converted to local time first, so a task
+    completed late in the evening counts for that evening's day even when
+    stored in UTC; naive timestamps are taken as already local.
+    """
+    if moment.tzinfo is not None:
+        moment = moment.astimezone()
+    return moment.date()
+
+class CompletionCalendar:
+    """The days a user completed at least one task, one bit per day.
+
+    Bit ``i`` of ``bits`` is set if a task was completed on
+    ``start + i days``. Marking a day is a single bit operation, and
+    streaks are computed with whole-integer bit operations rather than
+    by walking the days.
+    """
+
+    def __init__(self, start: Optional[datetime.date] = None, bits: int = 0):
+        """Initialize a calendar whose bit 0 is ``start``."""
+        self.start = start
+        self.bits = bits
+
+    @classmethod
+    def from_days(cls, days: Iterable[datetime.date]) -> "CompletionCalendar":
+        """Build a calendar from completion days in any order, in one pass."""
+        ordinals = [day.toordinal() for day in days]
+        if not ordinals:
+            return cls()
+        first = min(ordinals)
+        buffer = bytearray((max(ordinals) - first) // 8 + 1)
+        for ordinal in ordinals:
+            offset = ordinal - first
+            buffer[offset >> 3] |= 1 << (offset & 7)
+        return cls(datetime.date.fromordinal(first), int.from_bytes(buffer, "little"))
+
+    @classmethod
+    def from_bytes(cls, start: datetime.date, data: bytes) -> "CompletionCalendar":
+        """Load a calendar stored with ``to_bytes``."""
+        return cls(start, int.from_bytes(data, "little"))
+
+    def to_bytes(self) -> bytes:
+        """Compact little-endian encoding of the bitmap."""
+        return self.bits.to_bytes((self.bits.bit_length() + 7) // 8, "little")
+
+    @property
+    def last_day(self) -> Optional[datetime.date]:
+        """Most recent completion day."""
+        if not self.bits:
+            return None
+        return self.start + datetime.timedelta(days=self.bits.bit_length() - 1)
+
+    def __contains__(self, day: datetime.date) -> bool:
+        """Whether a task was completed on ``day``."""
+        if self.start is None or day < self.start:
+            return False
+        return bool(self.bits >> (day - self.start).days & 1)
+
+    def add(self, day: datetime.date) -> None:
+        """Mark ``day`` as a completion day."""
+        if self.start is None:
+            self.start, self.bits = day, 1
+            return
+        if day < self.start:
+            # Backfilled completion before the calendar: re-base it
+            self.bits <<= (self.start - day).days
+            self.start = day
+        self.bits |= 1 << (day - self.start).days
+
+    def run_ending(self, day: datetime.date) -> int:
+        """Number of consecutive completion days ending on ``day``."""
+        if day not in self:
+            return 0
+        index = (day - self.start).days
+        gaps = ~self.bits & ((1 << (index + 1)) - 1)
+        return index + 1 - gaps.bit_length()
+
+    def current_streak(self, today: datetime.date) -> int:
+        """Streak still alive on ``today``.
+
+        A streak survives until a whole day passes without a completion,
+        so one ending yesterday still counts.
+        """
+        if today in self:
+            return self.run_ending(today)
+        return self.run_ending(today - datetime.timedelta(days=1))
+
+    def longest_streak(self) -> int:
+        """Longest run of consecutive completion days."""
+        # Each step keeps only days whose following day is also set, so
+        # a run of n days survives exactly n steps
+        bits, length = self.bits, 0
+        while bits:
+            bits &= bits >> 1
+            length += 1
+        return length
@@ -0,0 +1,66 @@
+"""Sweeping of open tasks that are past their due time."""
+import datetime
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from gamelife.core.config import TaskStatus, config
+from gamelife.core.game import GameEngine
+
+@dataclass
+class SweepResult:
+    """What a sweep changed."""
+    overdue: int = 0
+    failed: int = 0
+    xp_lost: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+def _as_utc(moment: datetime.datetime) -> datetime.datetime:
+    """Treat naive datetimes as UTC so they compare with aware ones."""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=datetime.UTC)
+    return moment
+
+def sweep_overdue(
+    game: GameEngine,
+    now: Optional[datetime.datetime] = None,
+    batch_size: Optional[int] = None
+) -> SweepResult:
+    """Mark open tasks past due as OVERDUE and fail long-overdue ones.
+
+    Tasks are read with a keyset range scan over due_at, ``batch_size``
+    at a time (default ``config.sweep_config.batch_size``). In each batch,
+    tasks overdue for more than ``failure_grace_hours`` are failed via
+    GameEngine.fail_tasks, which applies penalties once per user, and the
+    rest are marked OVERDUE; each batch is one transaction.
+    """
+    sweep_config = config.sweep_config
+    now = now or datetime.datetime.now(datetime.UTC)
+    batch_size = batch_size or sweep_config.batch_size
+    fail_before = _as_utc(now) - datetime.timedelta(hours=sweep_config.failure_grace_hours)
+
+    result = SweepResult()
+    after = None
+    while True:
+        tasks = game.db.get_overdue_tasks(now, after=after, limit=batch_size)
+        if not tasks:
+            return result
+        after = (tasks[-1].due_at, tasks[-1].id)
+
+        expired = [task for task in tasks if _as_utc(task.due_at) < fail_before]
+        newly_overdue = [
+            task for task in tasks
+            if task.status != TaskStatus.OVERDUE and _as_utc(task.due_at) >= fail_before
+        ]
+        with game.db.transaction():
+            if newly_overdue:
+                game.db.update_task_statuses(
+                    (task.id, TaskStatus.OVERDUE, None) for task in newly_overdue
+                )
+                for task in newly_overdue:
+                    task.status = TaskStatus.OVERDUE
+                result.overdue += len(newly_overdue)
+            if expired:
+                penalties = game.fail_tasks(expired, now)
+                for task in expired:
+                    result.xp_lost[task.user_id] -= penalties[task.id]
+                result.failed += len(expired)
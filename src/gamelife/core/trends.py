@@ -0,0 +1,77 @@
+"""Time-series report data built from daily rollups."""
+import datetime
+import math
+from typing import Dict, Iterable, List, Tuple
+
+from gamelife.data.database import DailyRollup
+
+Series = Tuple[List[datetime.date], List[float]]
+
+def fill_days(
+    rollups: Iterable[DailyRollup],
+    start: datetime.date,
+    end: datetime.date
+) -> List[DailyRollup]:
+    """Return one rollup per day in [start, end), zero-filling idle days."""
+    by_day: Dict[datetime.date, DailyRollup] = {}
+    for rollup in rollups:
+        day = by_day.setdefault(rollup.day, DailyRollup(day=rollup.day))
+        day.completed += rollup.completed
+        day.failed += rollup.failed
+        day.xp_gained += rollup.xp_gained
+        day.xp_lost += rollup.xp_lost
+
+    days = []
+    day = start
+    while day < end:
+        days.append(by_day.get(day) or DailyRollup(day=day))
+        day += datetime.timedelta(days=1)
+    return days
+
+def week_start(day: datetime.date) -> datetime.date:
+    """Monday of the ISO week containing ``day``."""
+    return day - datetime.timedelta(days=day.weekday())
+
+def _by_week(days: List[DailyRollup]) -> Dict[datetime.date, DailyRollup]:
+    """Sum zero-filled daily rollups into weekly buckets."""
+    weeks: Dict[datetime.date, DailyRollup] = {}
+    for rollup in days:
+        start = week_start(rollup.day)
+        week = weeks.setdefault(start, DailyRollup(day=start))
+        week.completed += rollup.completed
+        week.failed += rollup.failed
+        week.xp_gained += rollup.xp_gained
+        week.xp_lost += rollup.xp_lost
+    return weeks
+
+def xp_over_time(days: List[DailyRollup]) -> Series:
+    """Cumulative net task XP across the window."""
+    total = 0
+    values = []
+    for rollup in days:
+        total += rollup.xp_gained - rollup.xp_lost
+        values.append(total)
+    return [rollup.day for rollup in days], values
+
+def completions_per_day(days: List[DailyRollup]) -> Series:
+    """Number of tasks completed on each day."""
+    return [rollup.day for rollup in days], [rollup.completed for rollup in days]
+
+def completions_per_week(days: List[DailyRollup]) -> Series:
+    """Number of tasks completed in each week."""
+    weeks = _by_week(days)
+    return list(weeks), [week.completed for week in weeks.values()]
+
+def failure_rate_per_week(days: List[DailyRollup]) -> Series:
+    """Percentage of finished tasks that failed, per week.
+
+    Weeks with no completed or failed tasks are NaN so charts show a gap.
+    """
+    weeks = _by_week(days)
+    rates = [
+        100 * week.failed / (week.completed + week.failed)
+        if week.completed + week.failed
+        else math.nan
+        for week in weeks.values()
+    ]
+    return list(weeks), rates
@@ -0,0 +1,184 @@
+"""In-process read-through cache for objects loaded from the database."""
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import (
+    Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+)
+
+class ObjectCache:
+    """Bounded LRU identity map of users and tasks loaded by Database.
+
+    While a key is cached, every read of it returns the same object, so
+    in-memory changes are shared by all holders. Database invalidates or
+    updates the affected keys after each write is applied. Reads pass
+    the ``version`` seen before querying to put(), and the result is not
+    cached if a write happened in between, so a racing read cannot store
+    stale data.
+
+    Reads made by a thread inside its own transaction are staged and
+    published when the transaction commits, or dropped if it rolls back.
+    Other threads' reads are not cached while a transaction is open,
+    since they may see rows from before its commit.
+    """
+
+    def __init__(self, max_entries: int = 10000, enabled: bool = True):
+        """Initialize an empty cache holding at most ``max_entries`` keys."""
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._staged: Dict[int, Dict[Hashable, Any]] = {}
+        self._lock = threading.Lock()
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Number of cached keys."""
+        return len(self._entries)
+
+    @property
+    def version(self) -> int:
+        """Counter bumped by every invalidation and finished transaction."""
+        return self._version
+
+    def _lookup(self, key: Hashable) -> Optional[Any]:
+        """Find ``key`` in the cache or this thread's staged reads."""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            return value
+        staged = self._staged.get(threading.get_ident())
+        return None if staged is None else staged.get(key)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached object for ``key`` and mark it recently used."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            value = self._lookup(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return value
+
+    def get_all(self, keys: Iterable[Hashable]) -> Optional[List[Any]]:
+        """Return the cached objects for ``keys``, or None if any is missing.
+
+        Used to resolve cached lists of keys without counting each lookup.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            values = []
+            for key in keys:
+                value = self._lookup(key)
+                if value is None:
+                    return None
+                values.append(value)
+            return values
+
+    def put(self, key: Hashable, value: Any, version: int) -> Any:
+        """Cache ``value`` read at ``version`` and return the canonical object.
+
+        If ``key`` is already cached, the cached object is returned instead
+        so each row maps to one instance. Nothing is stored if the cache is
+        disabled or a write happened since ``version`` was read.
+        """
+        return self.put_all([(key, value)], version)[0]
+
+    def put_all(self, items: Iterable[Tuple[Hashable, Any]], version: int) -> List[Any]:
+        """Cache many (key, value) pairs read together, as put() does.
+
+        Canonical objects are resolved for every key before any entry is
+        evicted, so the returned objects are the cached ones even when
+        there are more of them than the cache holds.
+        """
+        items = list(items)
+        with self._lock:
+            if not self.enabled:
+                return [value for _, value in items]
+            staged = self._staged.get(threading.get_ident())
+            if staged is None and self._staged:
+                return [value for _, value in items]
+            values = []
+            for key, value in items:
+                cached = self._lookup(key)
+                if cached is not None:
+                    values.append(cached)
+                    continue
+                if version == self._version:
+                    if staged is not None:
+                        staged[key] = value
+                    else:
+                        self._entries[key] = value
+                values.append(value)
+            self._trim()
+            return values
+
+    def _trim(self) -> None:
+        """Evict the least recently used entries past the bound."""
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, keys: Iterable[Hashable]) -> None:
+        """Drop ``keys`` after their rows were written."""
+        with self._lock:
+            self._version += 1
+            for key in keys:
+                self._entries.pop(key, None)
+                for staged in self._staged.values():
+                    staged.pop(key, None)
+
+    def update(self, key: Hashable, **fields: Any) -> None:
+        """Apply a written row's new values to its cached object, if any.
+
+        Keeps the object cached and shared across writes that only change
+        known fields, such as a user's XP after each completed task.
+        """
+        with self._lock:
+            self._version += 1
+            cached = self._lookup(key)
+            if cached is not None:
+                for name, value in fields.items():
+                    setattr(cached, name, value)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Drop every key matching ``predicate``."""
+        with self._lock:
+            self._version += 1
+            for entries in (self._entries, *self._staged.values()):
+                for key in [key for key in entries if predicate(key)]:
+                    del entries[key]
+
+    def clear(self) -> None:
+        """Drop everything, e.g. after a rollback."""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            for staged in self._staged.values():
+                staged.clear()
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """Stage this thread's reads while its transaction is open.
+
+        Staged reads are published if the block exits normally and
+        dropped if it raises.
+        """
+        thread = threading.get_ident()
+        with self._lock:
+            self._staged[thread] = {}
+        committed = False
+        try:
+            yield
+            committed = True
+        finally:
+            with self._lock:
+                staged = self._staged.pop(thread)
+                if committed:
+                    for key, value in staged.items():
+                        self._entries.setdefault(key, value)
+                    self._trim()
+                self._version += 1
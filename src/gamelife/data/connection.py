@@ -0,0 +1,102 @@
+"""Pooled SQLite connection management for Game of Life."""
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from gamelife.core.config import DatabaseConfig, config
+
+class PoolClosedError(sqlite3.Error):
+    """Raised when a connection is requested from a closed pool."""
+
+class ConnectionPool:
+    """Bounded pool of long-lived SQLite connections.
+
+    A thread keeps the connection it checked out for as long as it is
+    inside a ``connection()`` block, so nested calls on the same thread
+    share one connection instead of checking out a second one.
+    """
+
+    def __init__(self, db_path: Path, db_config: Optional[DatabaseConfig] = None):
+        """Initialize the pool; connections are opened lazily."""
+        self.db_path = db_path
+        self.db_config = db_config or config.db_config
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a new connection."""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.db_config.timeout,
+            isolation_level=None,  # Autocommit; transactions are explicit
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA journal_mode = {self.db_config.journal_mode}")
+        conn.execute(f"PRAGMA synchronous = {self.db_config.synchronous}")
+        conn.execute(f"PRAGMA cache_size = {int(self.db_config.cache_size)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.db_config.mmap_size)}")
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _checkout(self) -> sqlite3.Connection:
+        """Take an idle connection, opening one if the pool has room."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._closed:
+                raise PoolClosedError("Connection pool is closed")
+            if len(self._all) < self.db_config.pool_size:
+                conn = self._connect()
+                self._all.append(conn)
+                return conn
+
+        try:
+            return self._idle.get(timeout=self.db_config.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                "Timed out waiting for a pooled connection"
+            ) from None
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Yield this thread's connection, checking one out if needed."""
+        if self._closed:
+            raise PoolClosedError("Connection pool is closed")
+
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self._checkout()
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+    def close(self) -> None:
+        """Close all idle connections; busy ones close when released."""
+        with self._lock:
+            self._closed = True
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                conn.close()
+            self._all.clear()
@@ -1,13 +1,27 @@
 """Database models and repository for Game of Life."""
 import datetime
-import sqlite3
-from dataclasses import dataclass
+import itertools
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import (
+    TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+)
 
-from gamelife.core.config import TaskPriority, TaskStatus, config
+from gamelife.core.config import DatabaseConfig, TaskPriority, TaskStatus, config
+from gamelife.core.streaks import CompletionCalendar, completion_day
+from gamelife.data.cache import ObjectCache
+from gamelife.data.connection import ConnectionPool
 
-@dataclass
+if TYPE_CHECKING:
+    from gamelife.core.analytics import TaskFrame
+
+def _utcnow() -> datetime.datetime:
+    """Current time as an aware UTC datetime."""
+    return datetime.datetime.now(datetime.UTC)
+
+@dataclass(slots=True)
 class User:
     """User profile data model."""
     id: Optional[int]
@@ -17,11 +31,15 @@ class User:
     streak: int = 0
     longest_streak: int = 0
     last_completion_date: Optional[datetime.date] = None
-    created_at: datetime.datetime = datetime.datetime.now(datetime.UTC)
+    created_at: datetime.datetime = field(default_factory=_utcnow)
 
-@dataclass
+@dataclass(slots=True)
 class Task:
-    """Task data model."""
+    """Task data model.
+    
+    Slotted, since reports can hold a profile's whole task history in
+    memory at once.
+    """
     id: Optional[int]
     user_id: int
     title: str
@@ -31,21 +49,416 @@ class Task:
     due_at: datetime.datetime
     completed_at: Optional[datetime.datetime] = None
     category: Optional[str] = None
-    created_at: datetime.datetime = datetime.datetime.now(datetime.UTC)
-    updated_at: datetime.datetime = datetime.datetime.now(datetime.UTC)
+    created_at: datetime.datetime = field(default_factory=_utcnow)
+    updated_at: datetime.datetime = field(default_factory=_utcnow)
+
+def _row_to_user(row) -> User:
+    """Build a User from a users row, decoding stored dates."""
+    data = dict(row)
+    if data["last_completion_date"]:
+        data["last_completion_date"] = datetime.date.fromisoformat(
+            data["last_completion_date"]
+        )
+    if isinstance(data["created_at"], str):
+        data["created_at"] = datetime.datetime.fromisoformat(
+            data["created_at"]
+        ).replace(tzinfo=datetime.UTC)
+    return User(**data)
+
+# Version of the on-disk schema, kept in PRAGMA user_version.
+# 1: task enums stored as integer codes and timestamps as epoch microseconds
+# 2: xp_snapshots.created_at is the latest event time the snapshot covers
+# 3: XP ledger and snapshot times stored as epoch microseconds
+SCHEMA_VERSION = 3
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+# Current time as epoch microseconds, for SQL defaults and updates
+_NOW_EPOCH_SQL = "CAST((julianday('now') - 2440587.5) * 86400000000 AS INTEGER)"
+
+def _to_epoch(moment: datetime.datetime) -> int:
+    """Encode a datetime as integer epoch microseconds (naive means UTC)."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.UTC)
+    return (moment - _EPOCH) // _MICROSECOND
+
+def _from_epoch(value: int) -> datetime.datetime:
+    """Decode epoch microseconds into an aware UTC datetime."""
+    return datetime.datetime.fromtimestamp(value / 1e6, datetime.UTC)
+
+def _code_table(enum) -> tuple:
+    """Tuple mapping each member's integer code (its value) to the member."""
+    table = [None] * (max(member.value for member in enum) + 1)
+    for member in enum:
+        table[member.value] = member
+    return tuple(table)
+
+_PRIORITY_CODES = _code_table(TaskPriority)
+_STATUS_CODES = _code_table(TaskStatus)
+
+_TASKS_TABLE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        description TEXT,
+        priority INTEGER NOT NULL,
+        status INTEGER NOT NULL,
+        category TEXT,
+        due_at INTEGER NOT NULL,
+        completed_at INTEGER,
+        created_at INTEGER NOT NULL DEFAULT ({_NOW_EPOCH_SQL}),
+        updated_at INTEGER NOT NULL DEFAULT ({_NOW_EPOCH_SQL}),
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+"""
+
+_DAILY_ROLLUPS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS daily_rollups (
+        user_id INTEGER NOT NULL,
+        day DATE NOT NULL,
+        priority INTEGER NOT NULL,
+        completed INTEGER NOT NULL DEFAULT 0,
+        failed INTEGER NOT NULL DEFAULT 0,
+        xp_gained INTEGER NOT NULL DEFAULT 0,
+        xp_lost INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, day, priority)
+    ) WITHOUT ROWID
+"""
+
+# Columns in Task field order, so rows map positionally onto Task
+_TASK_COLUMNS = """
+    id, user_id, title, description, priority, status,
+    due_at, completed_at, category, created_at, updated_at
+"""
+
+_INSERT_TASK_SQL = """
+    INSERT INTO tasks (
+        user_id, title, description, priority, status,
+        category, due_at, completed_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def _task_params(task: Task) -> tuple:
+    """Encode a Task into INSERT parameters."""
+    return (
+        task.user_id, task.title, task.description,
+        task.priority.value, task.status.value,
+        task.category, _to_epoch(task.due_at),
+        _to_epoch(task.completed_at) if task.completed_at else None
+    )
+
+def _task_filters(
+    user_id: int,
+    status: Optional[TaskStatus] = None,
+    priority: Optional[TaskPriority] = None,
+    category: Optional[str] = None,
+    due_from: Optional[datetime.datetime] = None,
+    due_before: Optional[datetime.datetime] = None
+) -> Tuple[str, list]:
+    """Build a WHERE clause and parameters for common task filters."""
+    clauses = ["user_id = ?"]
+    params: list = [user_id]
+    if status:
+        clauses.append("status = ?")
+        params.append(status.value)
+    if priority:
+        clauses.append("priority = ?")
+        params.append(priority.value)
+    if category is not None:
+        clauses.append("category = ?")
+        params.append(category)
+    if due_from is not None:
+        clauses.append("due_at >= ?")
+        params.append(_to_epoch(due_from))
+    if due_before is not None:
+        clauses.append("due_at < ?")
+        params.append(_to_epoch(due_before))
+    return " AND ".join(clauses), params
+
+def _task_row(cursor, row: tuple) -> Task:
+    """Row factory building a Task from a ``_TASK_COLUMNS`` tuple.
+    
+    Enum codes are decoded by indexing precomputed tables rather than
+    going through a dict of the row and enum name lookups.
+    """
+    (
+        task_id, user_id, title, description, priority, status,
+        due_at, completed_at, category, created_at, updated_at
+    ) = row
+    return Task(
+        task_id, user_id, title, description,
+        _PRIORITY_CODES[priority], _STATUS_CODES[status],
+        _from_epoch(due_at),
+        _from_epoch(completed_at) if completed_at is not None else None,
+        category, _from_epoch(created_at), _from_epoch(updated_at)
+    )
+
+def _fetch_tasks(conn, query: str, params) -> List[Task]:
+    """Run a query selecting ``_TASK_COLUMNS`` and decode the rows into Tasks."""
+    cursor = conn.cursor()
+    cursor.row_factory = _task_row
+    return cursor.execute(query, params).fetchall()
+
+# Task ids bound per query when selecting tasks by id, e.g. their owners
+_OWNER_LOOKUP_CHUNK = 500
+
+def _task_list_keys(user_id: int) -> List[tuple]:
+    """Object cache keys of every cached get_tasks id list for a user."""
+    return [("tasks", user_id, status) for status in (None, *TaskStatus)]
+
+# (priority, status, due_at, completed_at): the columns that determine task
+# XP, then finished_at, the completion or (for failures) last update time
+FinishedTask = Tuple[
+    TaskPriority, TaskStatus, datetime.datetime, Optional[datetime.datetime],
+    datetime.datetime
+]
+
+_GROUP_DECODERS = {
+    "status": _STATUS_CODES.__getitem__,
+    "priority": _PRIORITY_CODES.__getitem__,
+    "category": lambda value: value,
+}
+
+_STATS_DIMENSIONS = {
+    "status": "{row}.status",
+    "priority": "{row}.priority",
+    "category": "COALESCE({row}.category, '')",
+}
+
+def _stats_delta_sql(row: str, delta: int) -> str:
+    """SQL adding ``delta`` to every stats counter of a trigger row."""
+    return "\n".join(
+        f"""
+        INSERT INTO user_stats (user_id, dimension, value, amount)
+        VALUES ({row}.user_id, '{dimension}', {expr.format(row=row)}, {delta})
+        ON CONFLICT (user_id, dimension, value)
+        DO UPDATE SET amount = amount + excluded.amount;"""
+        for dimension, expr in _STATS_DIMENSIONS.items()
+    )
+
+# Per-user counters keyed by (dimension, value). Task counts per status,
+# priority and category are kept current by triggers; the 'xp' dimension
+# ('earned'/'lost') is maintained by the game engine.
+_USER_STATS_SQL = f"""
+    CREATE TABLE IF NOT EXISTS user_stats (
+        user_id INTEGER NOT NULL,
+        dimension TEXT NOT NULL,
+        value TEXT NOT NULL,
+        amount INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, dimension, value)
+    ) WITHOUT ROWID;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_stats_insert
+    AFTER INSERT ON tasks
+    BEGIN
+        {_stats_delta_sql("new", 1)}
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_stats_update
+    AFTER UPDATE OF user_id, status, priority, category ON tasks
+    BEGIN
+        {_stats_delta_sql("old", -1)}
+        {_stats_delta_sql("new", 1)}
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_stats_delete
+    AFTER DELETE ON tasks
+    BEGIN
+        {_stats_delta_sql("old", -1)}
+    END;
+"""
+
+# Full-text index over task text, stored as an external-content FTS5
+# table so the text itself is only kept once, in tasks. user_id is
+# indexed too so a search only ranks the searching user's matches, and
+# the prefix indexes make the as-you-type prefix queries cheap.
+_TASK_SEARCH_SQL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, description, category, user_id,
+        content = 'tasks', content_rowid = 'id',
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    );
+    
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_insert
+    AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (rowid, title, description, category, user_id)
+        VALUES (new.id, new.title, new.description, new.category, new.user_id);
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_update
+    AFTER UPDATE OF title, description, category, user_id ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description, category, user_id)
+        VALUES ('delete', old.id, old.title, old.description, old.category, old.user_id);
+        INSERT INTO tasks_fts (rowid, title, description, category, user_id)
+        VALUES (new.id, new.title, new.description, new.category, new.user_id);
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_delete
+    AFTER DELETE ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description, category, user_id)
+        VALUES ('delete', old.id, old.title, old.description, old.category, old.user_id);
+    END;
+"""
+
+# bm25 column weights for (title, description, category, user_id)
+_SEARCH_WEIGHTS = (10.0, 1.0, 5.0, 0.0)
+
+def _fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching all of its words.
+    
+    Each word is quoted so FTS5 operators typed by the user are taken
+    literally, and the last word matches as a prefix so results follow
+    the text as it is typed.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return ""
+    return " ".join(f'"{word}"' for word in words) + "*"
+
+def _table_exists(conn, name: str) -> bool:
+    """Check whether a table exists."""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (name,)
+    ).fetchone() is not None
+
+@dataclass
+class DailyRollup:
+    """Completion and XP totals for one user-day (and optionally priority)."""
+    day: datetime.date
+    completed: int = 0
+    failed: int = 0
+    xp_gained: int = 0
+    xp_lost: int = 0
+    priority: Optional[TaskPriority] = None
+
+@dataclass
+class XPEvent:
+    """One append-only entry in the XP ledger."""
+    user_id: int
+    delta: int
+    reason: str
+    task_id: Optional[int] = None
+    created_at: Optional[datetime.datetime] = None
+    id: Optional[int] = None
+
+@dataclass
+class UserStats:
+    """Precomputed per-user task and XP totals."""
+    by_status: Dict[TaskStatus, int]
+    by_priority: Dict[TaskPriority, int]
+    by_category: Dict[Optional[str], int]
+    xp_earned: int = 0
+    xp_lost: int = 0
+    
+    @property
+    def total_tasks(self) -> int:
+        """Total number of tasks."""
+        return sum(self.by_status.values())
+
+# Ranking columns of each users-table leaderboard, most significant first;
+# the first column is the reported value
+_LEADERBOARD_KEYS = {
+    "xp": ("xp",),
+    "level": ("level", "xp"),
+    "longest_streak": ("longest_streak",),
+}
+
+# Net task XP per user over a date range; users without activity score 0.
+# daily_rollups is clustered on (user_id, day), so each user is one seek.
+_WEEKLY_XP_SQL = """
+    (
+        SELECT u.id AS id, u.username AS username,
+               COALESCE(SUM(r.xp_gained - r.xp_lost), 0) AS weekly_xp
+        FROM users u
+        LEFT JOIN daily_rollups r
+            ON r.user_id = u.id AND r.day >= ? AND r.day < ?
+        GROUP BY u.id
+    )
+"""
+
+LEADERBOARD_METRICS = (*_LEADERBOARD_KEYS, "weekly_xp")
+
+@dataclass
+class LeaderboardEntry:
+    """A user's position on a leaderboard."""
+    rank: int
+    user_id: int
+    username: str
+    value: int
 
 class Database:
     """Database connection and repository implementation."""
     
-    def __init__(self, db_path: Optional[Path] = None):
-        """Initialize database connection."""
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        db_config: Optional[DatabaseConfig] = None
+    ):
+        """Initialize database connection pool and object cache."""
         self.db_path = db_path or config.db_path
+        self.db_config = db_config or config.db_config
+        self._pool = ConnectionPool(self.db_path, self.db_config)
+        self.cache = ObjectCache(
+            self.db_config.object_cache_size, self.db_config.object_cache
+        )
         self._init_db()
     
+    def __enter__(self) -> "Database":
+        """Use the database as a context manager that closes on exit."""
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Close the database when leaving the context."""
+        self.close()
+    
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self._pool.close()
+        self.cache.clear()
+    
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Run the enclosed calls as a single atomic unit of work.
+        
+        Every Database method called inside the block on this thread shares
+        one connection and is committed together (one fsync) on exit, or
+        rolled back if the block raises. Nested blocks join the outer one.
+        
+        Objects read in the block are cached once it commits. Cached
+        objects may have been changed in memory by the block, so a
+        rollback clears the cache.
+        """
+        with self._pool.connection() as conn:
+            if conn.in_transaction:
+                yield
+                return
+            
+            with self.cache.writing():
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    yield
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    self.cache.clear()
+                    raise
+    
     def _init_db(self):
         """Create database tables if they don't exist."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.executescript("""
+        with self._pool.connection() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            migrated = version < 1 and _table_exists(conn, "tasks")
+            if migrated:
+                self._migrate_typed_columns(conn)
+            
+            conn.executescript(f"""
                 CREATE TABLE IF NOT EXISTS users (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     username TEXT UNIQUE NOT NULL,
@@ -57,29 +470,214 @@ class Database:
                     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
                 );
                 
-                CREATE TABLE IF NOT EXISTS tasks (
+                {_TASKS_TABLE_SQL};
+                
+                CREATE INDEX IF NOT EXISTS idx_tasks_user_id ON tasks(user_id);
+                CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+                CREATE INDEX IF NOT EXISTS idx_tasks_due_at ON tasks(due_at);
+                -- Indexes implicitly end in the rowid, so these cover the
+                -- (due_at, id) keyset used by query_tasks
+                DROP INDEX IF EXISTS idx_tasks_user_status;
+                CREATE INDEX IF NOT EXISTS idx_tasks_user_due
+                    ON tasks(user_id, due_at);
+                CREATE INDEX IF NOT EXISTS idx_tasks_user_status_due
+                    ON tasks(user_id, status, due_at);
+                CREATE INDEX IF NOT EXISTS idx_tasks_user_priority_due
+                    ON tasks(user_id, priority, due_at);
+                -- Finish order, as replayed by iter_finished_tasks
+                CREATE INDEX IF NOT EXISTS idx_tasks_user_finished
+                    ON tasks(user_id, COALESCE(completed_at, updated_at));
+                
+                -- Covering indexes for the leaderboards, in ranking order
+                CREATE INDEX IF NOT EXISTS idx_users_xp
+                    ON users(xp DESC, id, username);
+                CREATE INDEX IF NOT EXISTS idx_users_level
+                    ON users(level DESC, xp DESC, id, username);
+                CREATE INDEX IF NOT EXISTS idx_users_longest_streak
+                    ON users(longest_streak DESC, id, username);
+                
+                CREATE TABLE IF NOT EXISTS user_achievements (
+                    user_id INTEGER NOT NULL,
+                    achievement TEXT NOT NULL,
+                    unlocked_at TIMESTAMP NOT NULL,
+                    PRIMARY KEY (user_id, achievement),
+                    FOREIGN KEY (user_id) REFERENCES users (id)
+                ) WITHOUT ROWID;
+            """)
+            
+            stats_exists = _table_exists(conn, "user_stats")
+            conn.executescript(_USER_STATS_SQL)
+            if migrated or not stats_exists:
+                # Migrated counters are keyed by enum name; recount by code
+                self.rebuild_user_stats()
+            
+            rollups_exist = _table_exists(conn, "daily_rollups")
+            conn.execute(_DAILY_ROLLUPS_TABLE_SQL)
+            if not rollups_exist:
+                self.rebuild_daily_rollups()
+            
+            ledger_exists = _table_exists(conn, "xp_events")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS xp_events (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     user_id INTEGER NOT NULL,
-                    title TEXT NOT NULL,
-                    description TEXT,
-                    priority TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    category TEXT,
-                    due_at TIMESTAMP NOT NULL,
-                    completed_at TIMESTAMP,
-                    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    task_id INTEGER,
+                    delta INTEGER NOT NULL,
+                    reason TEXT NOT NULL,
+                    created_at INTEGER NOT NULL,  -- Epoch microseconds
                     FOREIGN KEY (user_id) REFERENCES users (id)
                 );
                 
-                CREATE INDEX IF NOT EXISTS idx_tasks_user_id ON tasks(user_id);
-                CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
-                CREATE INDEX IF NOT EXISTS idx_tasks_due_at ON tasks(due_at);
+                CREATE INDEX IF NOT EXISTS idx_xp_events_user ON xp_events(user_id);
+                
+                -- Balance after event_id, written every xp_snapshot_interval
+                -- events. Events can be backdated, so created_at is the latest
+                -- created_at of any event up to event_id, not that event's own.
+                CREATE TABLE IF NOT EXISTS xp_snapshots (
+                    user_id INTEGER NOT NULL,
+                    event_id INTEGER NOT NULL,
+                    xp INTEGER NOT NULL,
+                    created_at INTEGER NOT NULL,  -- Epoch microseconds
+                    PRIMARY KEY (user_id, event_id)
+                ) WITHOUT ROWID;
             """)
+            if not ledger_exists:
+                # Existing balances enter the ledger as an opening event
+                conn.execute(
+                    """
+                    INSERT INTO xp_events (user_id, delta, reason, created_at)
+                    SELECT id, xp, 'opening_balance', ? FROM users WHERE xp != 0
+                    """,
+                    (_to_epoch(datetime.datetime.now(datetime.UTC)),)
+                )
+            elif version < 3:
+                self._migrate_ledger_times(conn)
+                # Restamp snapshots with the latest event time they cover
+                conn.execute(
+                    """
+                    UPDATE xp_snapshots SET created_at = (
+                        SELECT MAX(created_at) FROM xp_events
+                        WHERE user_id = xp_snapshots.user_id
+                          AND id <= xp_snapshots.event_id
+                    )
+                    """
+                )
+            
+            calendars_exist = _table_exists(conn, "completion_calendars")
+            conn.executescript("""
+                -- Days with a completed task, one bit per day from start_day
+                CREATE TABLE IF NOT EXISTS completion_calendars (
+                    user_id INTEGER PRIMARY KEY,
+                    start_day DATE NOT NULL,
+                    days BLOB NOT NULL,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
+                );
+            """)
+            if not calendars_exist:
+                self.rebuild_completion_calendars()
+            
+            search_exists = _table_exists(conn, "tasks_fts")
+            conn.executescript(_TASK_SEARCH_SQL)
+            if migrated or not search_exists:
+                conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+            
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
+    def _migrate_ledger_times(self, conn, chunk_size: int = 10000) -> None:
+        """Convert ISO ledger times, in whatever zone they were written, to epochs.
+        
+        Naive values are taken as UTC, as _to_epoch does for tasks.
+        """
+        with self.transaction():
+            while True:
+                # Converted rows drop out of the filter, so each query reads the next chunk
+                rows = conn.execute(
+                    """
+                    SELECT id, created_at FROM xp_events
+                    WHERE typeof(created_at) = 'text' LIMIT ?
+                    """,
+                    (chunk_size,)
+                ).fetchall()
+                if not rows:
+                    break
+                conn.executemany(
+                    "UPDATE xp_events SET created_at = ? WHERE id = ?",
+                    (
+                        (_to_epoch(datetime.datetime.fromisoformat(created_at)), event_id)
+                        for event_id, created_at in rows
+                    )
+                )
+    
+    def _migrate_typed_columns(self, conn, chunk_size: int = 10000) -> None:
+        """Migrate TEXT enum names and ISO timestamps to integer columns.
+        
+        Rebuilds tasks with integer enum codes and epoch-microsecond
+        timestamps, converting rows in chunks, and recodes the priority
+        column of daily_rollups. The old tables' triggers and indexes are
+        dropped with them and recreated by _init_db.
+        """
+        def epoch(value):
+            """Convert a stored ISO (or SQLite CURRENT_TIMESTAMP) string."""
+            if value is None:
+                return None
+            return _to_epoch(datetime.datetime.fromisoformat(value))
+        
+        with self.transaction():
+            conn.execute("ALTER TABLE tasks RENAME TO tasks_v0")
+            conn.execute(_TASKS_TABLE_SQL)
+            cursor = conn.execute(
+                """
+                SELECT id, user_id, title, description, priority, status,
+                       category, due_at, completed_at, created_at, updated_at
+                FROM tasks_v0 ORDER BY id
+                """
+            )
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                conn.executemany(
+                    """
+                    INSERT INTO tasks (
+                        id, user_id, title, description, priority, status,
+                        category, due_at, completed_at, created_at, updated_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        (
+                            task_id, user_id, title, description,
+                            TaskPriority[priority].value, TaskStatus[status].value,
+                            category, epoch(due_at), epoch(completed_at),
+                            epoch(created_at), epoch(updated_at)
+                        )
+                        for (
+                            task_id, user_id, title, description, priority, status,
+                            category, due_at, completed_at, created_at, updated_at
+                        ) in rows
+                    )
+                )
+            conn.execute("DROP TABLE tasks_v0")
+            
+            if _table_exists(conn, "daily_rollups"):
+                conn.execute("ALTER TABLE daily_rollups RENAME TO daily_rollups_v0")
+                conn.execute(_DAILY_ROLLUPS_TABLE_SQL)
+                codes = " ".join(
+                    f"WHEN '{priority.name}' THEN {priority.value}"
+                    for priority in TaskPriority
+                )
+                conn.execute(
+                    f"""
+                    INSERT INTO daily_rollups
+                    SELECT user_id, day, CASE priority {codes} END,
+                           completed, failed, xp_gained, xp_lost
+                    FROM daily_rollups_v0
+                    """
+                )
+                conn.execute("DROP TABLE daily_rollups_v0")
     
     def create_user(self, username: str) -> User:
         """Create a new user profile."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.execute(
                 "INSERT INTO users (username) VALUES (?)",
                 (username,)
@@ -89,66 +687,835 @@ class Database:
     
     def get_user(self, username: str) -> Optional[User]:
         """Get user by username."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._pool.connection() as conn:
             cursor = conn.execute(
                 "SELECT * FROM users WHERE username = ?",
                 (username,)
             )
             row = cursor.fetchone()
             if row:
-                return User(**dict(row))
+                return _row_to_user(row)
+            return None
+    
+    def get_user_by_id(self, user_id: int) -> Optional[User]:
+        """Get user by id, from the object cache when possible."""
+        key = ("user", user_id)
+        user = self.cache.get(key)
+        if user is not None:
+            return user
+        
+        version = self.cache.version
+        with self._pool.connection() as conn:
+            cursor = conn.execute(
+                "SELECT * FROM users WHERE id = ?",
+                (user_id,)
+            )
+            row = cursor.fetchone()
+            if row:
+                return self.cache.put(key, _row_to_user(row), version)
             return None
     
+    def count_users(self) -> int:
+        """Count user profiles."""
+        with self._pool.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+    
+    def iter_users(self, chunk_size: int = 500) -> Iterator[User]:
+        """Iterate over all users by id, fetching ``chunk_size`` rows at a time."""
+        last_id = 0
+        while True:
+            with self._pool.connection() as conn:
+                rows = conn.execute(
+                    "SELECT * FROM users WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, chunk_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield _row_to_user(row)
+            last_id = rows[-1]["id"]
+    
+    def list_users(
+        self,
+        limit: int = 100,
+        after: Optional[str] = None
+    ) -> List[User]:
+        """Get one page of users ordered by username.
+        
+        Pass the username of the last user of a page as ``after`` to get
+        the next page.
+        """
+        where, params = "", []
+        if after is not None:
+            where, params = "WHERE username > ?", [after]
+        with self._pool.connection() as conn:
+            cursor = conn.execute(
+                f"SELECT * FROM users {where} ORDER BY username LIMIT ?",
+                params + [limit]
+            )
+            return [_row_to_user(row) for row in cursor.fetchall()]
+    
+    def get_leaderboard(
+        self,
+        metric: str = "xp",
+        limit: int = 10,
+        offset: int = 0,
+        since: Optional[datetime.date] = None
+    ) -> List[LeaderboardEntry]:
+        """Get one page of a leaderboard, best first.
+        
+        ``metric`` is one of LEADERBOARD_METRICS. Ties share a rank. The
+        page is read in index order and only the first row's rank needs a
+        count, so the cost does not grow with the number of profiles.
+        ``since`` starts the week for ``weekly_xp`` (default: this Monday).
+        """
+        source, keys, params = self._leaderboard_source(metric, since)
+        order = ", ".join(f"{key} DESC" for key in keys)
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT id, username, {", ".join(keys)} FROM {source}
+                ORDER BY {order}, id LIMIT ? OFFSET ?
+                """,
+                params + [limit, offset]
+            ).fetchall()
+            if not rows:
+                return []
+            first_key = tuple(rows[0])[2:]
+            first_rank = self._count_ahead(conn, source, keys, params, first_key) + 1
+        
+        entries: List[LeaderboardEntry] = []
+        previous = None
+        for position, row in enumerate(rows):
+            key = tuple(row)[2:]
+            if previous is None:
+                rank = first_rank
+            elif key != previous:
+                # Everything before this row in ranking order is strictly ahead
+                rank = offset + position + 1
+            entries.append(LeaderboardEntry(rank, row[0], row[1], key[0]))
+            previous = key
+        return entries
+    
+    def get_user_rank(
+        self,
+        user_id: int,
+        metric: str = "xp",
+        since: Optional[datetime.date] = None
+    ) -> Optional[LeaderboardEntry]:
+        """Get a single user's leaderboard position."""
+        source, keys, params = self._leaderboard_source(metric, since)
+        with self._pool.connection() as conn:
+            row = conn.execute(
+                f"SELECT id, username, {', '.join(keys)} FROM {source} WHERE id = ?",
+                params + [user_id]
+            ).fetchone()
+            if row is None:
+                return None
+            key = tuple(row)[2:]
+            rank = self._count_ahead(conn, source, keys, params, key) + 1
+        return LeaderboardEntry(rank, row[0], row[1], key[0])
+    
+    @staticmethod
+    def _leaderboard_source(
+        metric: str,
+        since: Optional[datetime.date]
+    ) -> Tuple[str, Tuple[str, ...], list]:
+        """FROM clause, ranking columns and parameters for a leaderboard."""
+        if metric in _LEADERBOARD_KEYS:
+            return "users", _LEADERBOARD_KEYS[metric], []
+        if metric == "weekly_xp":
+            if since is None:
+                today = datetime.date.today()
+                since = today - datetime.timedelta(days=today.weekday())
+            end = since + datetime.timedelta(days=7)
+            return _WEEKLY_XP_SQL, ("weekly_xp",), [since.isoformat(), end.isoformat()]
+        raise ValueError(f"Unknown leaderboard metric: {metric}")
+    
+    @staticmethod
+    def _count_ahead(
+        conn,
+        source: str,
+        keys: Tuple[str, ...],
+        params: list,
+        key: tuple
+    ) -> int:
+        """Count users ranked strictly ahead of ``key``."""
+        return conn.execute(
+            f"""
+            SELECT COUNT(*) FROM {source}
+            WHERE ({", ".join(keys)}) > ({", ".join("?" * len(keys))})
+            """,
+            params + list(key)
+        ).fetchone()[0]
+    
     def create_task(self, task: Task) -> Task:
         """Create a new task."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
+            cursor = conn.execute(_INSERT_TASK_SQL, _task_params(task))
+            task.id = cursor.lastrowid
+        self.cache.invalidate(_task_list_keys(task.user_id))
+        return task
+    
+    def create_tasks(
+        self,
+        tasks: Iterable[Task],
+        chunk_size: int = 1000
+    ) -> List[int]:
+        """Bulk-insert tasks and return their assigned ids in order.
+        
+        Tasks are consumed lazily and written in chunks of ``chunk_size``,
+        each chunk through one ``executemany`` in its own transaction.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        
+        ids: List[int] = []
+        iterator = iter(tasks)
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if not chunk:
+                return ids
+            
+            with self.transaction(), self._pool.connection() as conn:
+                conn.executemany(
+                    _INSERT_TASK_SQL,
+                    (_task_params(task) for task in chunk)
+                )
+                # The write lock is held, so AUTOINCREMENT ids are contiguous
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            
+            first_id = last_id - len(chunk) + 1
+            for offset, task in enumerate(chunk):
+                task.id = first_id + offset
+            ids.extend(range(first_id, last_id + 1))
+            self.cache.invalidate(
+                key
+                for user_id in {task.user_id for task in chunk}
+                for key in _task_list_keys(user_id)
+            )
+    
+    def get_tasks(self, user_id: int, status: Optional[TaskStatus] = None) -> List[Task]:
+        """Get tasks for a user, optionally filtered by status.
+        
+        The ids are cached per (user, status) until one of the user's tasks
+        is written, and resolved to the cached Tasks; if any of those was
+        evicted the list is read again. Each call returns a new list.
+        """
+        key = ("tasks", user_id, status)
+        task_ids = self.cache.get(key)
+        if task_ids is not None:
+            tasks = self.cache.get_all(("task", task_id) for task_id in task_ids)
+            if tasks is not None:
+                return tasks
+        
+        version = self.cache.version
+        where, params = _task_filters(user_id, status)
+        with self._pool.connection() as conn:
+            tasks = _fetch_tasks(
+                conn, f"SELECT {_TASK_COLUMNS} FROM tasks WHERE {where}", params
+            )
+        tasks = self.cache.put_all(
+            ((("task", task.id), task) for task in tasks), version
+        )
+        self.cache.put(key, tuple(task.id for task in tasks), version)
+        return tasks
+    
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """Get a single task by id, from the object cache when possible."""
+        key = ("task", task_id)
+        task = self.cache.get(key)
+        if task is not None:
+            return task
+        
+        version = self.cache.version
+        with self._pool.connection() as conn:
+            tasks = _fetch_tasks(
+                conn, f"SELECT {_TASK_COLUMNS} FROM tasks WHERE id = ?", (task_id,)
+            )
+        return self.cache.put(key, tasks[0], version) if tasks else None
+    
+    def query_tasks(
+        self,
+        user_id: int,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None,
+        category: Optional[str] = None,
+        due_from: Optional[datetime.datetime] = None,
+        due_before: Optional[datetime.datetime] = None,
+        after: Optional[Tuple[datetime.datetime, int]] = None,
+        limit: Optional[int] = None,
+        descending: bool = False
+    ) -> List[Task]:
+        """Get one page of a user's tasks ordered by (due_at, id).
+        
+        Filtering, ordering and pagination all run in SQL. Pass the
+        ``(due_at, id)`` of the last task of a page as ``after`` to fetch
+        the next page; this is a keyset seek, so every page costs the same
+        regardless of how deep into the list it is.
+        """
+        where, params = _task_filters(
+            user_id, status, priority, category, due_from, due_before
+        )
+        if after is not None:
+            after_due, after_id = after
+            where += f" AND (due_at, id) {'<' if descending else '>'} (?, ?)"
+            params += [_to_epoch(after_due), after_id]
+        
+        direction = "DESC" if descending else "ASC"
+        query = (
+            f"SELECT {_TASK_COLUMNS} FROM tasks WHERE {where} "
+            f"ORDER BY due_at {direction}, id {direction}"
+        )
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        
+        with self._pool.connection() as conn:
+            return _fetch_tasks(conn, query, params)
+    
+    def get_overdue_tasks(
+        self,
+        due_before: datetime.datetime,
+        after: Optional[Tuple[datetime.datetime, int]] = None,
+        limit: Optional[int] = None
+    ) -> List[Task]:
+        """Get open tasks of all users due before ``due_before``.
+        
+        Pending, in-progress and already overdue tasks are returned ordered
+        by (due_at, id); pass the last task's (due_at, id) as ``after`` for
+        the next page. The status filter is kept out of index selection so
+        the query is a range scan on idx_tasks_due_at.
+        """
+        open_statuses = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.OVERDUE)
+        where = "due_at < ? AND +status IN (?, ?, ?)"
+        params: list = [_to_epoch(due_before), *(s.value for s in open_statuses)]
+        if after is not None:
+            after_due, after_id = after
+            where += " AND (due_at, id) > (?, ?)"
+            params += [_to_epoch(after_due), after_id]
+        
+        query = f"SELECT {_TASK_COLUMNS} FROM tasks WHERE {where} ORDER BY due_at, id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        
+        with self._pool.connection() as conn:
+            return _fetch_tasks(conn, query, params)
+    
+    def iter_finished_tasks(
+        self,
+        user_id: int,
+        chunk_size: int = 10000
+    ) -> Iterator[List[FinishedTask]]:
+        """Stream a user's completed and failed tasks in chunks.
+        
+        Yields lists of FinishedTask tuples in the order the tasks were
+        finished: by completion time, or last update time for failures,
+        then id. Rows are read with a keyset seek, so only the columns
+        needed to replay XP are decoded and memory stays bounded.
+        """
+        last_key = (-1, 0)
+        while True:
+            with self._pool.connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT id, priority, status, due_at, completed_at,
+                           COALESCE(completed_at, updated_at) AS finished_at
+                    FROM tasks
+                    WHERE user_id = ? AND status IN (?, ?)
+                      AND (COALESCE(completed_at, updated_at), id) > (?, ?)
+                    ORDER BY COALESCE(completed_at, updated_at), id LIMIT ?
+                    """,
+                    (
+                        user_id,
+                        TaskStatus.COMPLETED.value, TaskStatus.FAILED.value,
+                        *last_key, chunk_size
+                    )
+                ).fetchall()
+            if not rows:
+                return
+            yield [
+                (
+                    _PRIORITY_CODES[priority],
+                    _STATUS_CODES[status],
+                    _from_epoch(due_at),
+                    _from_epoch(completed_at) if completed_at is not None else None,
+                    _from_epoch(finished_at)
+                )
+                for _id, priority, status, due_at, completed_at, finished_at in rows
+            ]
+            last_key = (rows[-1][5], rows[-1][0])
+    
+    def count_tasks(
+        self,
+        user_id: int,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None,
+        category: Optional[str] = None
+    ) -> int:
+        """Count a user's tasks matching the given filters."""
+        where, params = _task_filters(user_id, status, priority, category)
+        with self._pool.connection() as conn:
+            cursor = conn.execute(f"SELECT COUNT(*) FROM tasks WHERE {where}", params)
+            return cursor.fetchone()[0]
+    
+    def exists_task(
+        self,
+        user_id: int,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None,
+        category: Optional[str] = None
+    ) -> bool:
+        """Check whether the user has any task matching the given filters."""
+        where, params = _task_filters(user_id, status, priority, category)
+        with self._pool.connection() as conn:
+            cursor = conn.execute(
+                f"SELECT EXISTS (SELECT 1 FROM tasks WHERE {where})",
+                params
+            )
+            return bool(cursor.fetchone()[0])
+    
+    def count_tasks_by(
+        self,
+        user_id: int,
+        group_by: str,
+        status: Optional[TaskStatus] = None
+    ) -> Dict[Any, int]:
+        """Count a user's tasks grouped by status, priority or category.
+        
+        Status and priority keys are returned as enum members; groups with
+        no tasks are omitted.
+        """
+        if group_by not in _GROUP_DECODERS:
+            raise ValueError(f"Cannot group tasks by {group_by!r}")
+        
+        where, params = _task_filters(user_id, status)
+        decode = _GROUP_DECODERS[group_by]
+        with self._pool.connection() as conn:
             cursor = conn.execute(
+                f"""
+                SELECT {group_by}, COUNT(*) FROM tasks
+                WHERE {where}
+                GROUP BY {group_by}
+                """,
+                params
+            )
+            return {decode(key): count for key, count in cursor.fetchall()}
+    
+    def get_task_frame(
+        self,
+        user_id: int,
+        columns: Optional[Sequence[str]] = None,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None,
+        category: Optional[str] = None,
+        due_from: Optional[datetime.datetime] = None,
+        due_before: Optional[datetime.datetime] = None
+    ) -> "TaskFrame":
+        """Fetch a user's tasks as NumPy arrays, one per column.
+    
+        ``columns`` defaults to all of analytics.TASK_FRAME_COLUMNS. No
+        Task objects are built, so reports over very large histories
+        stay cheap; see gamelife.core.analytics for the helpers.
+        """
+        from gamelife.core.analytics import TASK_FRAME_COLUMNS, TaskFrame
+    
+        names = list(columns or TASK_FRAME_COLUMNS)
+        unknown = set(names) - set(TASK_FRAME_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown task frame columns: {sorted(unknown)}")
+    
+        where, params = _task_filters(
+            user_id, status, priority, category, due_from, due_before
+        )
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(names)} FROM tasks WHERE {where} ORDER BY id",
+                params
+            ).fetchall()
+        return TaskFrame.from_rows(names, rows)
+    
+    def search_tasks(
+        self,
+        user_id: int,
+        query: str,
+        limit: int = 50,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None
+    ) -> List[Task]:
+        """Full-text search a user's tasks, best matches first.
+        
+        Matches every word of ``query`` against title, description and
+        category, treating the last word as a prefix, and ranks by bm25
+        with title matches weighted highest. The index is restricted to
+        ``user_id`` inside FTS5, so only the user's matches are ranked. Returns an empty list when
+        the query has no words.
+        """
+        match = _fts_query(query)
+        if not match:
+            return []
+        
+        where, params = _task_filters(user_id, status, priority)
+        weights = ", ".join(map(str, _SEARCH_WEIGHTS))
+        with self._pool.connection() as conn:
+            return _fetch_tasks(
+                conn,
+                f"""
+                SELECT {_TASK_COLUMNS}
+                FROM tasks
+                JOIN (
+                    SELECT rowid AS match_id, bm25(tasks_fts, {weights}) AS score
+                    FROM tasks_fts
+                    WHERE tasks_fts MATCH ?
+                ) ON id = match_id
+                WHERE {where}
+                ORDER BY score, id
+                LIMIT ?
+                """,
+                [
+                    f'user_id : "{user_id}" AND {{title description category}} : ({match})',
+                    *params, limit
+                ]
+            )
+    
+    def get_user_stats(self, user_id: int) -> UserStats:
+        """Get a user's precomputed task counts and XP totals."""
+        stats = UserStats(
+            by_status={status: 0 for status in TaskStatus},
+            by_priority={priority: 0 for priority in TaskPriority},
+            by_category={}
+        )
+        with self._pool.connection() as conn:
+            cursor = conn.execute(
+                "SELECT dimension, value, amount FROM user_stats WHERE user_id = ?",
+                (user_id,)
+            )
+            for dimension, value, amount in cursor.fetchall():
+                if dimension == "status":
+                    stats.by_status[_STATUS_CODES[int(value)]] = amount
+                elif dimension == "priority":
+                    stats.by_priority[_PRIORITY_CODES[int(value)]] = amount
+                elif dimension == "category" and amount:
+                    stats.by_category[value or None] = amount
+                elif dimension == "xp" and value == "earned":
+                    stats.xp_earned = amount
+                elif dimension == "xp" and value == "lost":
+                    stats.xp_lost = amount
+        return stats
+    
+    def add_user_xp_totals(self, user_id: int, earned: int = 0, lost: int = 0) -> None:
+        """Add to a user's running totals of XP earned and lost."""
+        with self._pool.connection() as conn:
+            conn.executemany(
+                """
+                INSERT INTO user_stats (user_id, dimension, value, amount)
+                VALUES (?, 'xp', ?, ?)
+                ON CONFLICT (user_id, dimension, value)
+                DO UPDATE SET amount = amount + excluded.amount
+                """,
+                [
+                    (user_id, key, amount)
+                    for key, amount in (("earned", earned), ("lost", lost))
+                    if amount
+                ]
+            )
+    
+    def rebuild_user_stats(self) -> None:
+        """Recompute all task counters in user_stats from the tasks table."""
+        with self.transaction(), self._pool.connection() as conn:
+            conn.execute("DELETE FROM user_stats WHERE dimension != 'xp'")
+            for dimension, expr in _STATS_DIMENSIONS.items():
+                column = expr.format(row="tasks")
+                conn.execute(
+                    f"""
+                    INSERT INTO user_stats (user_id, dimension, value, amount)
+                    SELECT user_id, '{dimension}', {column}, COUNT(*)
+                    FROM tasks
+                    GROUP BY user_id, {column}
+                    """
+                )
+    
+    def get_unlocked_achievements(self, user_id: int) -> Dict[str, datetime.datetime]:
+        """Get the user's unlocked achievements mapped to their unlock time."""
+        with self._pool.connection() as conn:
+            cursor = conn.execute(
+                "SELECT achievement, unlocked_at FROM user_achievements WHERE user_id = ?",
+                (user_id,)
+            )
+            return {
+                achievement: datetime.datetime.fromisoformat(unlocked_at)
+                for achievement, unlocked_at in cursor.fetchall()
+            }
+    
+    def unlock_achievement(
+        self,
+        user_id: int,
+        achievement: str,
+        unlocked_at: datetime.datetime
+    ) -> bool:
+        """Record an unlock; returns False if it was already unlocked."""
+        with self._pool.connection() as conn:
+            cursor = conn.execute(
+                """
+                INSERT OR IGNORE INTO user_achievements (user_id, achievement, unlocked_at)
+                VALUES (?, ?, ?)
+                """,
+                (user_id, achievement, unlocked_at.isoformat())
+            )
+            return cursor.rowcount == 1
+    
+    def add_daily_rollups(
+        self,
+        rollups: Iterable[Tuple[int, DailyRollup]]
+    ) -> None:
+        """Add (user_id, rollup) deltas onto the stored daily rollups.
+        
+        Each rollup must carry its priority; rows are upserted so repeated
+        deltas for the same user, day and priority accumulate.
+        """
+        with self.transaction(), self._pool.connection() as conn:
+            conn.executemany(
                 """
-                INSERT INTO tasks (
-                    user_id, title, description, priority, status,
-                    category, due_at, completed_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO daily_rollups (
+                    user_id, day, priority, completed, failed, xp_gained, xp_lost
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (user_id, day, priority) DO UPDATE SET
+                    completed = completed + excluded.completed,
+                    failed = failed + excluded.failed,
+                    xp_gained = xp_gained + excluded.xp_gained,
+                    xp_lost = xp_lost + excluded.xp_lost
                 """,
                 (
-                    task.user_id, task.title, task.description,
-                    task.priority.name, task.status.name,
-                    task.category, task.due_at.isoformat(),
-                    task.completed_at.isoformat() if task.completed_at else None
+                    (
+                        user_id, rollup.day.isoformat(), rollup.priority.value,
+                        rollup.completed, rollup.failed,
+                        rollup.xp_gained, rollup.xp_lost
+                    )
+                    for user_id, rollup in rollups
                 )
             )
-            task.id = cursor.lastrowid
-            return task
     
-    def get_tasks(self, user_id: int, status: Optional[TaskStatus] = None) -> List[Task]:
-        """Get tasks for a user, optionally filtered by status."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            query = "SELECT * FROM tasks WHERE user_id = ?"
-            params = [user_id]
-            
-            if status:
-                query += " AND status = ?"
-                params.append(status.name)
-            
-            cursor = conn.execute(query, params)
+    def get_daily_rollups(
+        self,
+        user_id: int,
+        start: datetime.date,
+        end: datetime.date,
+        by_priority: bool = False
+    ) -> List[DailyRollup]:
+        """Get a user's rollups for days in [start, end), oldest first.
+        
+        Days without activity are omitted. Unless ``by_priority`` is set,
+        the priorities of each day are summed into one rollup.
+        """
+        group = "day, priority" if by_priority else "day"
+        with self._pool.connection() as conn:
+            cursor = conn.execute(
+                f"""
+                SELECT day, {"priority" if by_priority else "NULL"},
+                       SUM(completed), SUM(failed), SUM(xp_gained), SUM(xp_lost)
+                FROM daily_rollups
+                WHERE user_id = ? AND day >= ? AND day < ?
+                GROUP BY {group}
+                ORDER BY {group}
+                """,
+                (user_id, start.isoformat(), end.isoformat())
+            )
             return [
-                Task(
-                    **{
-                        **dict(row),
-                        'priority': TaskPriority[row['priority']],
-                        'status': TaskStatus[row['status']],
-                        'due_at': datetime.datetime.fromisoformat(row['due_at']),
-                        'completed_at': (
-                            datetime.datetime.fromisoformat(row['completed_at'])
-                            if row['completed_at']
-                            else None
-                        )
-                    }
+                DailyRollup(
+                    day=datetime.date.fromisoformat(day),
+                    completed=completed,
+                    failed=failed,
+                    xp_gained=xp_gained,
+                    xp_lost=xp_lost,
+                    priority=_PRIORITY_CODES[priority] if priority else None
+                )
+                for day, priority, completed, failed, xp_gained, xp_lost
+                in cursor.fetchall()
+            ]
+    
+    def rebuild_daily_rollups(self) -> None:
+        """Recompute rollup completion/failure counts from the tasks table.
+        
+        XP cannot be recovered from task rows, so rebuilt days keep zero XP.
+        Failed tasks are dated by their last update. Days are local calendar
+        days, as given by completion_day() for live updates.
+        """
+        with self.transaction(), self._pool.connection() as conn:
+            conn.execute("DELETE FROM daily_rollups")
+            conn.execute(
+                """
+                INSERT INTO daily_rollups (user_id, day, priority, completed, failed)
+                SELECT user_id,
+                       DATE(
+                           COALESCE(completed_at, updated_at) / 1000000,
+                           'unixepoch', 'localtime'
+                       ) AS day,
+                       priority, SUM(status = :completed), SUM(status = :failed)
+                FROM tasks
+                WHERE status IN (:completed, :failed)
+                GROUP BY user_id, day, priority
+                """,
+                {"completed": TaskStatus.COMPLETED.value, "failed": TaskStatus.FAILED.value}
+            )
+    
+    def add_task_rollups(self, task_ids: Iterable[int]) -> None:
+        """Count already finished tasks, e.g. imported ones, into the rollups.
+        
+        Unlike rebuild_daily_rollups() the existing rollups are kept and the
+        tasks' completion/failure counts are added onto them, dated the same
+        way. No XP was awarded for these tasks, so their XP stays zero.
+        """
+        task_ids = list(task_ids)
+        with self.transaction(), self._pool.connection() as conn:
+            for start in range(0, len(task_ids), _OWNER_LOOKUP_CHUNK):
+                chunk = task_ids[start:start + _OWNER_LOOKUP_CHUNK]
+                conn.execute(
+                    f"""
+                    INSERT INTO daily_rollups (user_id, day, priority, completed, failed)
+                    SELECT user_id,
+                           DATE(
+                               COALESCE(completed_at, updated_at) / 1000000,
+                               'unixepoch', 'localtime'
+                           ) AS day,
+                           priority, SUM(status = ?), SUM(status = ?)
+                    FROM tasks
+                    WHERE status IN (?, ?) AND id IN ({', '.join('?' * len(chunk))})
+                    GROUP BY user_id, day, priority
+                    ON CONFLICT (user_id, day, priority) DO UPDATE SET
+                        completed = completed + excluded.completed,
+                        failed = failed + excluded.failed
+                    """,
+                    [
+                        TaskStatus.COMPLETED.value, TaskStatus.FAILED.value,
+                        TaskStatus.COMPLETED.value, TaskStatus.FAILED.value,
+                        *chunk
+                    ]
+                )
+    
+    def record_xp_events(self, events: Iterable[XPEvent]) -> None:
+        """Append XP changes to the ledger, snapshotting balances as needed."""
+        now = datetime.datetime.now(datetime.UTC)
+        events = list(events)
+        with self.transaction(), self._pool.connection() as conn:
+            conn.executemany(
+                """
+                INSERT INTO xp_events (user_id, task_id, delta, reason, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    (
+                        event.user_id, event.task_id, event.delta, event.reason,
+                        _to_epoch(event.created_at or now)
+                    )
+                    for event in events
+                )
+            )
+            for user_id in {event.user_id for event in events}:
+                self._maybe_snapshot_xp(conn, user_id)
+    
+    def _maybe_snapshot_xp(self, conn, user_id: int) -> None:
+        """Snapshot a user's balance once enough events follow the last one."""
+        snapshot = conn.execute(
+            """
+            SELECT event_id, xp, created_at FROM xp_snapshots
+            WHERE user_id = ? ORDER BY event_id DESC LIMIT 1
+            """,
+            (user_id,)
+        ).fetchone()
+        last_event, xp, covered = tuple(snapshot) if snapshot else (0, 0, 0)
+        
+        count, delta, event_id, latest = conn.execute(
+            """
+            SELECT COUNT(*), COALESCE(SUM(delta), 0), MAX(id), MAX(created_at)
+            FROM xp_events
+            WHERE user_id = ? AND id > ?
+            """,
+            (user_id, last_event)
+        ).fetchone()
+        if count < self.db_config.xp_snapshot_interval:
+            return
+        
+        # Stamped with the latest event time covered so far, so a snapshot
+        # is only used for times after every event it includes
+        conn.execute(
+            """
+            INSERT INTO xp_snapshots (user_id, event_id, xp, created_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            (user_id, event_id, xp + delta, max(covered, latest))
+        )
+    
+    def get_xp_events(self, user_id: int, after_id: int = 0) -> List[XPEvent]:
+        """Get a user's ledger entries after ``after_id``, oldest first."""
+        with self._pool.connection() as conn:
+            cursor = conn.execute(
+                """
+                SELECT id, user_id, task_id, delta, reason, created_at
+                FROM xp_events WHERE user_id = ? AND id > ? ORDER BY id
+                """,
+                (user_id, after_id)
+            )
+            return [
+                XPEvent(
+                    id=row["id"],
+                    user_id=row["user_id"],
+                    task_id=row["task_id"],
+                    delta=row["delta"],
+                    reason=row["reason"],
+                    created_at=_from_epoch(row["created_at"])
                 )
                 for row in cursor.fetchall()
             ]
     
+    def get_xp_balance_at(self, user_id: int, when: datetime.datetime) -> int:
+        """Reconstruct a user's XP at ``when`` from the nearest snapshot.
+        
+        Reads the latest snapshot whose events all took effect at or before
+        ``when`` and sums only the later events that did too, rather than
+        replaying the whole ledger. Backdated events inserted after a
+        snapshot land in that tail, so they are counted by their own time.
+        Times are compared as epoch microseconds, so ``when`` may be in any
+        timezone; naive times are taken as UTC.
+        """
+        when = _to_epoch(when)
+        with self._pool.connection() as conn:
+            snapshot = conn.execute(
+                """
+                SELECT event_id, xp FROM xp_snapshots
+                WHERE user_id = ? AND created_at <= ?
+                ORDER BY event_id DESC LIMIT 1
+                """,
+                (user_id, when)
+            ).fetchone()
+            last_event, xp = tuple(snapshot) if snapshot else (0, 0)
+            
+            tail = conn.execute(
+                """
+                SELECT COALESCE(SUM(delta), 0) FROM xp_events
+                WHERE user_id = ? AND id > ? AND created_at <= ?
+                """,
+                (user_id, last_event, when)
+            ).fetchone()[0]
+            return xp + tail
+    
+    def update_task(self, task: Task) -> None:
+        """Update a task's editable fields."""
+        with self._pool.connection() as conn:
+            conn.execute(
+                f"""
+                UPDATE tasks
+                SET title = ?, description = ?, priority = ?, category = ?,
+                    due_at = ?, updated_at = {_NOW_EPOCH_SQL}
+                WHERE id = ?
+                """,
+                (
+                    task.title, task.description, task.priority.value,
+                    task.category, _to_epoch(task.due_at), task.id
+                )
+            )
+        self.cache.invalidate([("task", task.id), *_task_list_keys(task.user_id)])
+    
     def update_task_status(
         self,
         task_id: int,
@@ -156,27 +1523,76 @@ class Database:
         completed_at: Optional[datetime.datetime] = None
     ) -> None:
         """Update task status and completion time."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
+        self.update_task_statuses([(task_id, status, completed_at)])
+    
+    def update_task_statuses(
+        self,
+        updates: Iterable[
+            Tuple[int, TaskStatus, Optional[datetime.datetime]]
+        ]
+    ) -> None:
+        """Update many (task_id, status, completed_at) rows in one transaction.
+        
+        updated_at is taken from the Python clock rather than SQLite's
+        millisecond 'now', so failures order correctly against completion
+        and achievement times when recompute_xp replays them.
+        """
+        updates = list(updates)
+        now = _to_epoch(datetime.datetime.now(datetime.UTC))
+        with self.transaction(), self._pool.connection() as conn:
+            conn.executemany(
                 """
                 UPDATE tasks 
-                SET status = ?, completed_at = ?, updated_at = CURRENT_TIMESTAMP
+                SET status = ?, completed_at = ?, updated_at = ?
                 WHERE id = ?
                 """,
                 (
-                    status.name,
-                    completed_at.isoformat() if completed_at else None,
-                    task_id
+                    (
+                        status.value,
+                        _to_epoch(completed_at) if completed_at else None,
+                        now,
+                        task_id
+                    )
+                    for task_id, status, completed_at in updates
                 )
             )
+            task_ids = [task_id for task_id, _, _ in updates]
+            owners = set()
+            for start in range(0, len(task_ids), _OWNER_LOOKUP_CHUNK):
+                chunk = task_ids[start:start + _OWNER_LOOKUP_CHUNK]
+                owners.update(
+                    user_id for (user_id,) in conn.execute(
+                        f"""
+                        SELECT DISTINCT user_id FROM tasks
+                        WHERE id IN ({', '.join('?' * len(chunk))})
+                        """,
+                        chunk
+                    )
+                )
+        self.cache.invalidate([
+            *(("task", task_id) for task_id in task_ids),
+            *(key for user_id in owners for key in _task_list_keys(user_id))
+        ])
     
     def update_user_xp(self, user_id: int, xp: int, level: int) -> None:
         """Update user XP and level."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             conn.execute(
                 "UPDATE users SET xp = ?, level = ? WHERE id = ?",
                 (xp, level, user_id)
             )
+        self.cache.update(("user", user_id), xp=xp, level=level)
+    
+    def update_users_xp(self, updates: Iterable[Tuple[int, int, int]]) -> None:
+        """Update many (user_id, xp, level) rows in one transaction."""
+        updates = list(updates)
+        with self.transaction(), self._pool.connection() as conn:
+            conn.executemany(
+                "UPDATE users SET xp = ?, level = ? WHERE id = ?",
+                ((xp, level, user_id) for user_id, xp, level in updates)
+            )
+        for user_id, xp, level in updates:
+            self.cache.update(("user", user_id), xp=xp, level=level)
     
     def update_user_streak(
         self,
@@ -186,7 +1602,7 @@ class Database:
         last_completion_date: datetime.date
     ) -> None:
         """Update user streak information."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             conn.execute(
                 """
                 UPDATE users 
@@ -194,4 +1610,120 @@ class Database:
                 WHERE id = ?
                 """,
                 (streak, longest_streak, last_completion_date.isoformat(), user_id)
-            )
\ No newline at end of file
+            )
+        self.cache.update(
+            ("user", user_id),
+            streak=streak,
+            longest_streak=longest_streak,
+            last_completion_date=last_completion_date
+        )
+    
+    def get_completion_calendar(self, user_id: int) -> CompletionCalendar:
+        """Get the days on which a user completed tasks."""
+        with self._pool.connection() as conn:
+            row = conn.execute(
+                "SELECT start_day, days FROM completion_calendars WHERE user_id = ?",
+                (user_id,)
+            ).fetchone()
+        if row is None:
+            return CompletionCalendar()
+        return CompletionCalendar.from_bytes(
+            datetime.date.fromisoformat(row["start_day"]),
+            row["days"]
+        )
+    
+    def save_completion_calendar(self, user_id: int, calendar: CompletionCalendar) -> None:
+        """Store a user's completion calendar."""
+        with self._pool.connection() as conn:
+            self._save_completion_calendar(conn, user_id, calendar)
+    
+    @staticmethod
+    def _save_completion_calendar(conn, user_id: int, calendar: CompletionCalendar) -> None:
+        """Upsert or, for an empty calendar, delete a user's calendar row."""
+        if calendar.start is None:
+            conn.execute("DELETE FROM completion_calendars WHERE user_id = ?", (user_id,))
+            return
+        conn.execute(
+            """
+            INSERT INTO completion_calendars (user_id, start_day, days)
+            VALUES (?, ?, ?)
+            ON CONFLICT (user_id) DO UPDATE SET
+                start_day = excluded.start_day,
+                days = excluded.days
+            """,
+            (user_id, calendar.start.isoformat(), calendar.to_bytes())
+        )
+    
+    def rebuild_completion_calendars(
+        self,
+        user_ids: Optional[Iterable[int]] = None,
+        today: Optional[datetime.date] = None
+    ) -> None:
+        """Recompute completion calendars and streaks from the tasks table.
+        
+        Used after bulk imports or backfills. Completion times are read in
+        one ordered pass and each user's calendar is built in one go; the
+        streak columns on users are then derived from it as of ``today``.
+        """
+        today = today or datetime.date.today()
+        where, params = "", []
+        if user_ids is not None:
+            user_ids = list(user_ids)
+            where = f"AND user_id IN ({', '.join('?' * len(user_ids))})"
+            params = user_ids
+        
+        with self.transaction(), self._pool.connection() as conn:
+            if user_ids is None:
+                conn.execute("DELETE FROM completion_calendars")
+                conn.execute(
+                    """
+                    UPDATE users
+                    SET streak = 0, longest_streak = 0, last_completion_date = NULL
+                    """
+                )
+            else:
+                conn.executemany(
+                    "DELETE FROM completion_calendars WHERE user_id = ?",
+                    ((user_id,) for user_id in user_ids)
+                )
+                conn.executemany(
+                    """
+                    UPDATE users
+                    SET streak = 0, longest_streak = 0, last_completion_date = NULL
+                    WHERE id = ?
+                    """,
+                    ((user_id,) for user_id in user_ids)
+                )
+            
+            rows = conn.execute(
+                f"""
+                SELECT user_id, completed_at FROM tasks
+                WHERE status = ? AND completed_at IS NOT NULL {where}
+                ORDER BY user_id
+                """,
+                [TaskStatus.COMPLETED.value, *params]
+            )
+            for user_id, group in itertools.groupby(rows, key=lambda row: row[0]):
+                calendar = CompletionCalendar.from_days(
+                    completion_day(_from_epoch(completed_at))
+                    for _, completed_at in group
+                )
+                self._save_completion_calendar(conn, user_id, calendar)
+                conn.execute(
+                    """
+                    UPDATE users
+                    SET streak = ?, longest_streak = ?, last_completion_date = ?
+                    WHERE id = ?
+                    """,
+                    (
+                        calendar.current_streak(today),
+                        calendar.longest_streak(),
+                        calendar.last_day.isoformat(),
+                        user_id
+                    )
+                )
+        
+        if user_ids is None:
+            self.cache.invalidate_where(lambda key: key[0] == "user")
+        else:
+            self.cache.invalidate(("user", user_id) for user_id in user_ids)
\ No newline at end of file
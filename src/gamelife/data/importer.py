@@ -0,0 +1,69 @@
+"""Streaming task import from CSV and JSON Lines files."""
+import csv
+import datetime
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from gamelife.core.config import TaskPriority, TaskStatus
+from gamelife.data.database import Task
+
+FORMATS = ("csv", "jsonl")
+
+def detect_format(path: Path) -> str:
+    """Guess the import format from the file extension."""
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Cannot detect import format of {path.name}")
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime.datetime]:
+    """Parse an ISO 8601 timestamp, treating empty values as missing."""
+    if not value:
+        return None
+    return datetime.datetime.fromisoformat(value)
+
+def record_to_task(record: Dict[str, Any], user_id: int) -> Task:
+    """Convert one imported record into a Task for ``user_id``."""
+    title = (record.get("title") or "").strip()
+    if not title:
+        raise ValueError("Title is required")
+
+    due_at = _parse_datetime(record.get("due_at"))
+    if due_at is None:
+        raise ValueError("Due date is required")
+
+    return Task(
+        id=None,
+        user_id=user_id,
+        title=title,
+        description=record.get("description") or "",
+        priority=TaskPriority[(record.get("priority") or "MEDIUM").upper()],
+        status=TaskStatus[(record.get("status") or "PENDING").upper()],
+        category=record.get("category") or None,
+        due_at=due_at,
+        completed_at=_parse_datetime(record.get("completed_at"))
+    )
+
+def iter_records(path: Path, fmt: str) -> Iterator[Dict[str, Any]]:
+    """Yield raw records from ``path`` one at a time."""
+    with open(path, encoding="utf-8", newline="") as fp:
+        if fmt == "csv":
+            yield from csv.DictReader(fp)
+        elif fmt == "jsonl":
+            for line in fp:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            raise ValueError(f"Unsupported import format: {fmt}")
+
+def iter_tasks(path: Path, user_id: int, fmt: Optional[str] = None) -> Iterator[Task]:
+    """Stream Tasks from a CSV or JSONL file without loading it whole."""
+    fmt = fmt or detect_format(path)
+    for line_no, record in enumerate(iter_records(path, fmt), start=1):
+        try:
+            yield record_to_task(record, user_id)
+        except (KeyError, ValueError, TypeError) as e:
+            raise ValueError(f"{path.name}: record {line_no}: {e}") from e
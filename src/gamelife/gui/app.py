@@ -1,4 +1,6 @@
 """Main application GUI."""
+import importlib
+import logging
 import tkinter as tk
 from tkinter import ttk
 from typing import Optional
@@ -9,16 +11,30 @@ try:
 except ImportError:
     USING_BOOTSTRAP = False
 
+from gamelife.core.config import config
 from gamelife.core.game import GameEngine
-from gamelife.data.database import Database
-from gamelife.gui.views import (
-    AchievementsView,
-    DashboardView,
-    ProfileSelectView,
-    ReportsView,
-    TaskEditorView,
-    TaskListView
-)
+from gamelife.core.sweeper import SweepResult, sweep_overdue
+from gamelife.data.database import Database, User
+from gamelife.gui.worker import DatabaseWorker
+
+logger = logging.getLogger(__name__)
+
+# Views are imported on first navigation so startup only pays for the
+# profile screen; ReportsView lives apart because it pulls in matplotlib.
+VIEW_MODULES = {
+    "ProfileSelectView": "gamelife.gui.views",
+    "DashboardView": "gamelife.gui.views",
+    "TaskListView": "gamelife.gui.views",
+    "TaskEditorView": "gamelife.gui.views",
+    "AchievementsView": "gamelife.gui.views",
+    "LeaderboardView": "gamelife.gui.views",
+    "ReportsView": "gamelife.gui.reports",
+}
+
+def load_view(name: str) -> type:
+    """Import and return a view class by name."""
+    module = importlib.import_module(VIEW_MODULES[name])
+    return getattr(module, name)
 
 class GameLifeApp:
     """Main application window."""
@@ -36,9 +52,14 @@ class GameLifeApp:
         
         self.db = Database()
         self.game = GameEngine(self.db)
+        self.worker = DatabaseWorker(self.root)
         self.current_user = None
+        self._sweep_id = None
+        
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         self.setup_ui()
+        self.run_sweep()
     
     def setup_ui(self):
         """Set up the main UI components."""
@@ -87,6 +108,14 @@ class GameLifeApp:
             width=20
         ).pack(pady=2)
         
+        ttk.Button(
+            self.nav_frame,
+            text="Leaderboard",
+            command=self.show_leaderboard,
+            style=nav_style,
+            width=20
+        ).pack(pady=2)
+        
         ttk.Button(
             self.nav_frame,
             text="Reports",
@@ -111,10 +140,11 @@ class GameLifeApp:
     def show_profile_select(self):
         """Show the profile selection view."""
         self.clear_content()
-        ProfileSelectView(
+        load_view("ProfileSelectView")(
             self.content_frame,
             self.db,
-            self.on_profile_selected
+            self.on_profile_selected,
+            self.worker
         ).pack(fill=tk.BOTH, expand=True)
     
     def show_dashboard(self):
@@ -124,10 +154,11 @@ class GameLifeApp:
             return
         
         self.clear_content()
-        DashboardView(
+        load_view("DashboardView")(
             self.content_frame,
             self.current_user,
-            self.game
+            self.game,
+            self.worker
         ).pack(fill=tk.BOTH, expand=True)
     
     def show_task_list(self):
@@ -137,10 +168,11 @@ class GameLifeApp:
             return
         
         self.clear_content()
-        TaskListView(
+        load_view("TaskListView")(
             self.content_frame,
             self.current_user,
             self.game,
+            self.worker,
             self.show_task_editor
         ).pack(fill=tk.BOTH, expand=True)
     
@@ -151,10 +183,11 @@ class GameLifeApp:
             return
         
         self.clear_content()
-        TaskEditorView(
+        load_view("TaskEditorView")(
             self.content_frame,
             self.current_user,
             self.game,
+            self.worker,
             task_id,
             self.show_task_list
         ).pack(fill=tk.BOTH, expand=True)
@@ -166,10 +199,25 @@ class GameLifeApp:
             return
         
         self.clear_content()
-        AchievementsView(
+        load_view("AchievementsView")(
             self.content_frame,
             self.current_user,
-            self.game
+            self.game,
+            self.worker
+        ).pack(fill=tk.BOTH, expand=True)
+    
+    def show_leaderboard(self):
+        """Show the leaderboard view."""
+        if not self.current_user:
+            self.show_profile_select()
+            return
+        
+        self.clear_content()
+        load_view("LeaderboardView")(
+            self.content_frame,
+            self.current_user,
+            self.game,
+            self.worker
         ).pack(fill=tk.BOTH, expand=True)
     
     def show_reports(self):
@@ -179,10 +227,11 @@ class GameLifeApp:
             return
         
         self.clear_content()
-        ReportsView(
+        load_view("ReportsView")(
             self.content_frame,
             self.current_user,
-            self.game
+            self.game,
+            self.worker
         ).pack(fill=tk.BOTH, expand=True)
     
     def on_profile_selected(self, user):
@@ -190,6 +239,42 @@ class GameLifeApp:
         self.current_user = user
         self.show_dashboard()
     
+    def run_sweep(self):
+        """Sweep overdue tasks in the background, then schedule the next sweep."""
+        self.worker.write(sweep_overdue, self.game, callback=self.on_swept)
+        self._sweep_id = self.root.after(
+            config.sweep_config.interval_seconds * 1000,
+            self.run_sweep
+        )
+    
+    def on_swept(self, result: SweepResult):
+        """Log a finished sweep and reload the profile if it was penalized."""
+        if result.overdue or result.failed:
+            logger.info(
+                "Swept %d overdue and %d failed tasks",
+                result.overdue,
+                result.failed
+            )
+        if self.current_user and self.current_user.id in result.xp_lost:
+            self.worker.read(
+                self.db.get_user_by_id,
+                self.current_user.id,
+                callback=self.on_user_reloaded
+            )
+    
+    def on_user_reloaded(self, user: Optional[User]):
+        """Replace the current profile with fresh data."""
+        if user and self.current_user and user.id == self.current_user.id:
+            self.current_user = user
+    
+    def on_close(self):
+        """Finish background database work and close the window."""
+        if self._sweep_id is not None:
+            self.root.after_cancel(self._sweep_id)
+        self.worker.shutdown()
+        self.db.close()
+        self.root.destroy()
+    
     def run(self):
         """Start the application main loop."""
         self.root.mainloop()
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""Cached Matplotlib rendering of report charts."""
+import io
+import threading
+from collections import OrderedDict
+from typing import Hashable, Sequence, Tuple
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+class ReportRenderer:
+    """Renders report charts to PNG, reusing figures and cached images.
+
+    Each (user, report) keeps one persistent figure whose artists are
+    updated in place when the data changes, and rendered images are kept
+    in an LRU cache keyed by (user, report, data version) so reopening an
+    unchanged report costs nothing. Figures are capped by an LRU as well,
+    since each one holds its own Agg canvas. Rendering uses the Agg
+    backend only, so it is safe to call from a worker thread.
+    """
+
+    def __init__(
+        self,
+        max_images: int = 32,
+        max_figures: int = 16,
+        figsize: Tuple[float, float] = (6, 4),
+        dpi: int = 100
+    ):
+        """Initialize an empty renderer."""
+        self.max_images = max_images
+        self.max_figures = max_figures
+        self.figsize = figsize
+        self.dpi = dpi
+        self._figures: "OrderedDict[Tuple[int, str], Tuple[Figure, list]]" = OrderedDict()
+        self._images: "OrderedDict[Tuple[int, str, Hashable], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def render_bar_chart(
+        self,
+        user_id: int,
+        report: str,
+        labels: Sequence[str],
+        values: Sequence[float],
+        title: str,
+        ylabel: str
+    ) -> bytes:
+        """Render a bar chart as PNG bytes."""
+        version = (tuple(labels), tuple(values), title, ylabel)
+        with self._lock:
+            cached = self._cached(user_id, report, version)
+            if cached is not None:
+                return cached
+
+            figure, bars = self._figure(user_id, report)
+            if figure is None or len(bars) != len(values):
+                figure = self._new_figure()
+                ax = figure.add_subplot(111)
+                bars = list(ax.bar(labels, values))
+                self._keep_figure(user_id, report, figure, bars)
+            else:
+                ax = figure.axes[0]
+                for bar, value in zip(bars, values):
+                    bar.set_height(value)
+                ax.set_xticks(range(len(labels)), labels)
+                ax.relim()
+                ax.autoscale_view()
+            ax.set_title(title)
+            ax.set_ylabel(ylabel)
+
+            return self._store(user_id, report, version, figure)
+
+    def render_line_chart(
+        self,
+        user_id: int,
+        report: str,
+        x: Sequence,
+        y: Sequence[float],
+        title: str,
+        ylabel: str
+    ) -> bytes:
+        """Render a line chart (e.g. a time series) as PNG bytes."""
+        version = (tuple(x), tuple(y), title, ylabel)
+        with self._lock:
+            cached = self._cached(user_id, report, version)
+            if cached is not None:
+                return cached
+
+            figure, artists = self._figure(user_id, report)
+            if figure is None:
+                figure = self._new_figure()
+                ax = figure.add_subplot(111)
+                artists = ax.plot(x, y, marker=".")
+                figure.autofmt_xdate()
+                self._keep_figure(user_id, report, figure, artists)
+            else:
+                ax = figure.axes[0]
+                artists[0].set_data(x, y)
+                ax.relim()
+                ax.autoscale_view()
+            ax.set_title(title)
+            ax.set_ylabel(ylabel)
+
+            return self._store(user_id, report, version, figure)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop all figures and images for a user."""
+        with self._lock:
+            for key in [k for k in self._figures if k[0] == user_id]:
+                del self._figures[key]
+            for key in [k for k in self._images if k[0] == user_id]:
+                del self._images[key]
+
+    def _new_figure(self) -> Figure:
+        """Create a figure attached to an Agg canvas."""
+        figure = Figure(figsize=self.figsize, dpi=self.dpi)
+        FigureCanvasAgg(figure)
+        return figure
+
+    def _figure(self, user_id: int, report: str):
+        """Return the persistent figure and artists for a report, if any."""
+        key = (user_id, report)
+        if key not in self._figures:
+            return None, None
+        self._figures.move_to_end(key)
+        return self._figures[key]
+
+    def _keep_figure(self, user_id: int, report: str, figure: Figure, artists: list) -> None:
+        """Keep a report's figure, evicting the least recently used ones."""
+        self._figures[(user_id, report)] = (figure, artists)
+        while len(self._figures) > self.max_figures:
+            self._figures.popitem(last=False)
+
+    def _cached(self, user_id: int, report: str, version: Hashable):
+        """Return a cached image and mark it recently used."""
+        key = (user_id, report, version)
+        image = self._images.get(key)
+        if image is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._images.move_to_end(key)
+        return image
+
+    def _store(self, user_id: int, report: str, version: Hashable, figure: Figure) -> bytes:
+        """Draw the figure once to PNG and cache the result."""
+        figure.tight_layout()
+        buffer = io.BytesIO()
+        figure.savefig(buffer, format="png")
+        image = buffer.getvalue()
+
+        self._images[(user_id, report, version)] = image
+        while len(self._images) > self.max_images:
+            self._images.popitem(last=False)
+        return image
+
+# Shared renderer, so figures and images outlive individual ReportsViews
+renderer = ReportRenderer()
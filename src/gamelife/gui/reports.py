@@ -0,0 +1,132 @@
+"""Reports view for the Game of Life application.
+
+Kept separate from gamelife.gui.views so matplotlib is only imported the
+first time the Reports tab is opened.
+"""
+import datetime
+import tkinter as tk
+from tkinter import ttk
+
+from gamelife.core import trends
+from gamelife.core.config import TaskPriority
+from gamelife.core.game import GameEngine
+from gamelife.data.database import User
+from gamelife.gui.rendering import renderer
+from gamelife.gui.worker import DatabaseWorker
+
+# Days of history shown by the daily and weekly trend reports
+DAILY_WINDOW = 90
+WEEKLY_WINDOW = 52 * 7
+
+class ReportsView(ttk.Frame):
+    """Reports and statistics view."""
+
+    REPORTS = {
+        "Tasks by Priority": "render_tasks_by_priority",
+        "XP Over Time": "render_xp_over_time",
+        "Completions per Day": "render_completions_per_day",
+        "Completions per Week": "render_completions_per_week",
+        "Failure Rate": "render_failure_rate",
+    }
+
+    def __init__(
+        self,
+        parent: ttk.Frame,
+        user: User,
+        game: GameEngine,
+        worker: DatabaseWorker
+    ):
+        """Initialize reports view."""
+        super().__init__(parent)
+        self.user = user
+        self.game = game
+        self.worker = worker
+        self.image = None
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Set up the UI components."""
+        controls = ttk.Frame(self)
+        controls.pack(fill=tk.X, padx=10, pady=5)
+
+        ttk.Label(controls, text="Report:").pack(side=tk.LEFT, padx=5)
+        self.report_var = tk.StringVar(value=next(iter(self.REPORTS)))
+        ttk.Combobox(
+            controls,
+            textvariable=self.report_var,
+            values=list(self.REPORTS),
+            state="readonly"
+        ).pack(side=tk.LEFT, padx=5)
+
+        # Charts are rendered off the Tk thread and shown as images
+        self.chart = ttk.Label(self, text="Loading report…", anchor=tk.CENTER)
+        self.chart.pack(fill=tk.BOTH, expand=True)
+
+        self.report_var.trace("w", lambda *args: self.show_report())
+        self.show_report()
+
+    def show_report(self):
+        """Render the selected report in the background."""
+        render = getattr(self, self.REPORTS[self.report_var.get()])
+        self.worker.read(render, callback=self.show_chart, owner=self)
+
+    def render_tasks_by_priority(self) -> bytes:
+        """Render the tasks by priority chart; runs on a worker thread."""
+        stats = self.game.db.get_user_stats(self.user.id)
+        return renderer.render_bar_chart(
+            self.user.id,
+            "tasks_by_priority",
+            [p.name for p in TaskPriority],
+            [stats.by_priority[p] for p in TaskPriority],
+            title="Tasks by Priority",
+            ylabel="Number of Tasks"
+        )
+
+    def _recent_days(self, window: int):
+        """Zero-filled daily rollups for the last ``window`` days."""
+        end = datetime.date.today() + datetime.timedelta(days=1)
+        start = end - datetime.timedelta(days=window)
+        rollups = self.game.db.get_daily_rollups(self.user.id, start, end)
+        return trends.fill_days(rollups, start, end)
+
+    def render_xp_over_time(self) -> bytes:
+        """Render cumulative task XP over the daily window."""
+        days, xp = trends.xp_over_time(self._recent_days(DAILY_WINDOW))
+        return renderer.render_line_chart(
+            self.user.id, "xp_over_time", days, xp,
+            title=f"Net Task XP, Last {DAILY_WINDOW} Days",
+            ylabel="XP"
+        )
+
+    def render_completions_per_day(self) -> bytes:
+        """Render tasks completed per day."""
+        days, counts = trends.completions_per_day(self._recent_days(DAILY_WINDOW))
+        return renderer.render_line_chart(
+            self.user.id, "completions_per_day", days, counts,
+            title="Completions per Day",
+            ylabel="Tasks"
+        )
+
+    def render_completions_per_week(self) -> bytes:
+        """Render tasks completed per week."""
+        weeks, counts = trends.completions_per_week(self._recent_days(WEEKLY_WINDOW))
+        return renderer.render_line_chart(
+            self.user.id, "completions_per_week", weeks, counts,
+            title="Completions per Week",
+            ylabel="Tasks"
+        )
+
+    def render_failure_rate(self) -> bytes:
+        """Render the weekly failure rate trend."""
+        weeks, rates = trends.failure_rate_per_week(self._recent_days(WEEKLY_WINDOW))
+        return renderer.render_line_chart(
+            self.user.id, "failure_rate", weeks, rates,
+            title="Failure Rate per Week",
+            ylabel="% of Finished Tasks"
+        )
+
+    def show_chart(self, png: bytes):
+        """Display a rendered chart."""
+        self.image = tk.PhotoImage(master=self, data=png, format="png")
+        self.chart.configure(image=self.image, text="")
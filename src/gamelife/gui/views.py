@@ -1,15 +1,24 @@
 """GUI views for the Game of Life application."""
+import dataclasses
+import datetime
+import functools
+import sqlite3
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Callable, Optional
-
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
+from typing import Callable, List, Optional, Tuple
 
 from gamelife.core.config import TaskPriority, TaskStatus
 from gamelife.core.game import GameEngine
-from gamelife.data.database import Database, Task, User
+from gamelife.core.progression import get_progression
+from gamelife.data.database import Database, LeaderboardEntry, Task, User
+from gamelife.gui.widgets import LazyTaskTree
+from gamelife.gui.worker import DatabaseWorker
+
+# Profiles fetched per query when filling the profile list
+PROFILE_PAGE_SIZE = 100
+
+# Pause in typing, in milliseconds, before the task search runs
+SEARCH_DEBOUNCE_MS = 200
 
 class ProfileSelectView(ttk.Frame):
     """Profile selection and creation view."""
@@ -18,12 +27,15 @@ class ProfileSelectView(ttk.Frame):
         self,
         parent: ttk.Frame,
         db: Database,
-        on_select: Callable[[User], None]
+        on_select: Callable[[User], None],
+        worker: DatabaseWorker
     ):
         """Initialize profile selection view."""
         super().__init__(parent)
         self.db = db
         self.on_select = on_select
+        self.worker = worker
+        self._generation = 0
         
         self.setup_ui()
     
@@ -60,9 +72,33 @@ class ProfileSelectView(ttk.Frame):
         self.load_profiles()
     
     def load_profiles(self):
-        """Load existing profiles into the listbox."""
-        # TODO: Implement get_all_users in Database class
-        pass
+        """Load existing profiles into the listbox, a page at a time.
+        
+        Each page is read on the worker and the next one is requested
+        once it has been shown, so the Tk thread never waits on a query.
+        """
+        self._generation += 1
+        self.profiles_listbox.delete(0, tk.END)
+        self._fetch_profiles(None, self._generation)
+    
+    def _fetch_profiles(self, after: Optional[str], generation: int):
+        """Request the page of profiles after ``after`` in the background."""
+        def show(users: List[User]) -> None:
+            if generation != self._generation:
+                return
+            for user in users:
+                self.profiles_listbox.insert(tk.END, user.username)
+            if len(users) == PROFILE_PAGE_SIZE:
+                self._fetch_profiles(users[-1].username, generation)
+        
+        self.worker.read(
+            self.db.list_users,
+            limit=PROFILE_PAGE_SIZE,
+            after=after,
+            callback=show,
+            errback=lambda e: messagebox.showerror("Error", str(e)),
+            owner=self
+        )
     
     def create_profile(self):
         """Create a new user profile."""
@@ -71,11 +107,19 @@ class ProfileSelectView(ttk.Frame):
             messagebox.showerror("Error", "Username cannot be empty")
             return
         
-        try:
-            user = self.db.create_user(username)
-            self.on_select(user)
-        except sqlite3.IntegrityError:
-            messagebox.showerror("Error", "Username already exists")
+        def fail(error: BaseException) -> None:
+            if isinstance(error, sqlite3.IntegrityError):
+                messagebox.showerror("Error", "Username already exists")
+            else:
+                messagebox.showerror("Error", str(error))
+        
+        self.worker.write(
+            self.db.create_user,
+            username,
+            callback=self.on_select,
+            errback=fail,
+            owner=self
+        )
     
     def select_profile(self):
         """Select an existing profile."""
@@ -85,18 +129,29 @@ class ProfileSelectView(ttk.Frame):
             return
         
         username = self.profiles_listbox.get(selection[0])
-        user = self.db.get_user(username)
-        if user:
-            self.on_select(user)
+        self.worker.read(
+            self.db.get_user,
+            username,
+            callback=lambda user: user and self.on_select(user),
+            errback=lambda e: messagebox.showerror("Error", str(e)),
+            owner=self
+        )
 
 class DashboardView(ttk.Frame):
     """Main dashboard view."""
     
-    def __init__(self, parent: ttk.Frame, user: User, game: GameEngine):
+    def __init__(
+        self,
+        parent: ttk.Frame,
+        user: User,
+        game: GameEngine,
+        worker: DatabaseWorker
+    ):
         """Initialize dashboard view."""
         super().__init__(parent)
         self.user = user
         self.game = game
+        self.worker = worker
         
         self.setup_ui()
         
@@ -132,31 +187,29 @@ class DashboardView(ttk.Frame):
         summary_frame = ttk.LabelFrame(self, text="Task Summary")
         summary_frame.pack(padx=10, pady=5, fill=tk.X)
         
-        tasks = self.game.db.get_tasks(self.user.id)
-        pending = len([t for t in tasks if t.status == TaskStatus.PENDING])
-        in_progress = len([t for t in tasks if t.status == TaskStatus.IN_PROGRESS])
-        completed = len([t for t in tasks if t.status == TaskStatus.COMPLETED])
-        failed = len([t for t in tasks if t.status == TaskStatus.FAILED])
-        
-        ttk.Label(
-            summary_frame,
-            text=f"Pending: {pending}"
-        ).pack()
-        
-        ttk.Label(
-            summary_frame,
-            text=f"In Progress: {in_progress}"
-        ).pack()
-        
-        ttk.Label(
-            summary_frame,
-            text=f"Completed: {completed}"
-        ).pack()
-        
-        ttk.Label(
-            summary_frame,
-            text=f"Failed: {failed}"
-        ).pack()
+        # Counts are filled in once the background query returns
+        self.summary_labels = {}
+        for status, label in (
+            (TaskStatus.PENDING, "Pending"),
+            (TaskStatus.IN_PROGRESS, "In Progress"),
+            (TaskStatus.COMPLETED, "Completed"),
+            (TaskStatus.FAILED, "Failed")
+        ):
+            widget = ttk.Label(summary_frame, text=f"{label}: …")
+            widget.pack()
+            self.summary_labels[status] = (label, widget)
+        
+        self.worker.read(
+            self.game.db.get_user_stats,
+            self.user.id,
+            callback=self.show_summary,
+            owner=self
+        )
+    
+    def show_summary(self, stats):
+        """Fill in the task summary counts."""
+        for status, (label, widget) in self.summary_labels.items():
+            widget.configure(text=f"{label}: {stats.by_status[status]}")
 
 class TaskListView(ttk.Frame):
     """Task list view with filtering and sorting."""
@@ -166,13 +219,16 @@ class TaskListView(ttk.Frame):
         parent: ttk.Frame,
         user: User,
         game: GameEngine,
+        worker: DatabaseWorker,
         on_edit: Callable[[Optional[int]], None]
     ):
         """Initialize task list view."""
         super().__init__(parent)
         self.user = user
         self.game = game
+        self.worker = worker
         self.on_edit = on_edit
+        self._search_id = None
         
         self.setup_ui()
     
@@ -188,6 +244,11 @@ class TaskListView(ttk.Frame):
             command=lambda: self.on_edit(None)
         ).pack(side=tk.LEFT, padx=5)
         
+        # Search box
+        ttk.Label(controls, text="Search:").pack(side=tk.LEFT, padx=5)
+        self.search_var = tk.StringVar()
+        ttk.Entry(controls, textvariable=self.search_var).pack(side=tk.LEFT, padx=5)
+        
         # Filter controls
         filter_frame = ttk.LabelFrame(controls, text="Filters")
         filter_frame.pack(side=tk.LEFT, padx=5)
@@ -212,67 +273,84 @@ class TaskListView(ttk.Frame):
         )
         priority_cb.pack(side=tk.LEFT, padx=5)
         
-        # Task list
-        self.tree = ttk.Treeview(
-            self,
-            columns=("title", "priority", "status", "due_at"),
-            show="headings"
-        )
-        
-        self.tree.heading("title", text="Title")
-        self.tree.heading("priority", text="Priority")
-        self.tree.heading("status", text="Status")
-        self.tree.heading("due_at", text="Due Date")
-        
-        self.tree.column("title", width=200)
-        self.tree.column("priority", width=100)
-        self.tree.column("status", width=100)
-        self.tree.column("due_at", width=150)
-        
-        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        # Task list, loaded a page at a time as it scrolls
+        self.task_tree = LazyTaskTree(self, self.fetch_page, worker=self.worker)
+        self.task_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.tree = self.task_tree.tree
         
         # Bind events
         self.tree.bind("<Double-1>", self.on_double_click)
-        self.status_var.trace("w", lambda *args: self.refresh_tasks())
-        self.priority_var.trace("w", lambda *args: self.refresh_tasks())
+        self.status_var.trace("w", lambda *args: self.apply_filters())
+        self.priority_var.trace("w", lambda *args: self.apply_filters())
+        self.search_var.trace("w", lambda *args: self.schedule_search())
         
         self.refresh_tasks()
     
-    def refresh_tasks(self):
-        """Refresh the task list with current filters."""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        tasks = self.game.db.get_tasks(self.user.id)
-        
-        # Apply filters
-        if self.status_var.get() != "ALL":
-            tasks = [t for t in tasks if t.status.name == self.status_var.get()]
-        
-        if self.priority_var.get() != "ALL":
-            tasks = [t for t in tasks if t.priority.name == self.priority_var.get()]
-        
-        # Sort by due date
-        tasks.sort(key=lambda t: t.due_at)
-        
-        for task in tasks:
-            self.tree.insert(
-                "",
-                tk.END,
-                values=(
-                    task.title,
-                    task.priority.name,
-                    task.status.name,
-                    task.due_at.strftime("%Y-%m-%d %H:%M")
-                ),
-                tags=(str(task.id),)
+    def fetch_page(
+        self,
+        after: Optional[Tuple[datetime.datetime, int]],
+        limit: int
+    ) -> List[Task]:
+        """Fetch one page of tasks matching the current filters."""
+        status = self.status_var.get()
+        priority = self.priority_var.get()
+        status = TaskStatus[status] if status != "ALL" else None
+        priority = TaskPriority[priority] if priority != "ALL" else None
+        
+        query = self.search_var.get().strip()
+        if query:
+            # Search results are ranked by relevance, not due date, so
+            # they come as a single page
+            if after is not None:
+                return []
+            return self.game.db.search_tasks(
+                self.user.id, query, limit, status=status, priority=priority
             )
+        
+        # Filtering and sorting by due date happen in the database
+        return self.game.db.query_tasks(
+            self.user.id,
+            status=status,
+            priority=priority,
+            after=after,
+            limit=limit
+        )
+    
+    def apply_filters(self):
+        """Reload the task list from the first page after a filter change."""
+        self.task_tree.refresh(self.fetch_page)
+    
+    def schedule_search(self):
+        """Re-run the search once typing pauses for SEARCH_DEBOUNCE_MS.
+        
+        Each keystroke restarts the timer; results of a search overtaken
+        by a newer one are dropped by the task tree.
+        """
+        if self._search_id is not None:
+            self.after_cancel(self._search_id)
+        self._search_id = self.after(SEARCH_DEBOUNCE_MS, self.run_search)
+    
+    def run_search(self):
+        """Run the pending search."""
+        self._search_id = None
+        self.apply_filters()
+    
+    def destroy(self):
+        """Cancel any pending search before the view goes away."""
+        if self._search_id is not None:
+            self.after_cancel(self._search_id)
+            self._search_id = None
+        super().destroy()
+    
+    def refresh_tasks(self):
+        """Refresh the loaded task rows with current filters."""
+        self.task_tree.refresh()
     
     def on_double_click(self, event):
         """Handle double click on task."""
-        item = self.tree.selection()[0]
-        task_id = int(self.tree.item(item, "tags")[0])
-        self.on_edit(task_id)
+        task_id = self.task_tree.selected_task_id()
+        if task_id is not None:
+            self.on_edit(task_id)
 
 class TaskEditorView(ttk.Frame):
     """Task editor view."""
@@ -282,6 +360,7 @@ class TaskEditorView(ttk.Frame):
         parent: ttk.Frame,
         user: User,
         game: GameEngine,
+        worker: DatabaseWorker,
         task_id: Optional[int],
         on_save: Callable[[], None]
     ):
@@ -289,14 +368,22 @@ class TaskEditorView(ttk.Frame):
         super().__init__(parent)
         self.user = user
         self.game = game
+        self.worker = worker
         self.task_id = task_id
         self.on_save = on_save
         self.task = None
         
-        if task_id:
-            self.task = self.game.db.get_task(task_id)
-        
         self.setup_ui()
+        if task_id:
+            # Saving waits for the task, or it would be created anew
+            self.save_button.configure(state=tk.DISABLED)
+            self.worker.read(
+                self.game.db.get_task,
+                task_id,
+                callback=self.show_task,
+                errback=lambda e: messagebox.showerror("Error", str(e)),
+                owner=self
+            )
     
     def setup_ui(self):
         """Set up the UI components."""
@@ -308,9 +395,6 @@ class TaskEditorView(ttk.Frame):
         self.title_entry = ttk.Entry(title_frame, width=50)
         self.title_entry.pack(side=tk.LEFT, padx=5)
         
-        if self.task:
-            self.title_entry.insert(0, self.task.title)
-        
         # Description
         desc_frame = ttk.LabelFrame(self, text="Description")
         desc_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
@@ -318,51 +402,40 @@ class TaskEditorView(ttk.Frame):
         self.desc_text = tk.Text(desc_frame, wrap=tk.WORD, height=5)
         self.desc_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        if self.task:
-            self.desc_text.insert("1.0", self.task.description)
-        
         # Task details
         details_frame = ttk.Frame(self)
         details_frame.pack(fill=tk.X, padx=10, pady=5)
         
         # Priority
         ttk.Label(details_frame, text="Priority:").pack(side=tk.LEFT)
-        self.priority_var = tk.StringVar(
-            value=self.task.priority.name if self.task else TaskPriority.MEDIUM.name
-        )
-        priority_cb = ttk.Combobox(
+        self.priority_var = tk.StringVar(value=TaskPriority.MEDIUM.name)
+        self.priority_cb = ttk.Combobox(
             details_frame,
             textvariable=self.priority_var,
-            values=[p.name for p in TaskPriority],
-            state="readonly" if self.task else "normal"
+            values=[p.name for p in TaskPriority]
         )
-        priority_cb.pack(side=tk.LEFT, padx=5)
+        self.priority_cb.pack(side=tk.LEFT, padx=5)
         
         # Due date/time
         ttk.Label(details_frame, text="Due:").pack(side=tk.LEFT, padx=5)
         self.due_entry = ttk.Entry(details_frame)
         self.due_entry.pack(side=tk.LEFT)
         
-        if self.task:
-            self.due_entry.insert(0, self.task.due_at.strftime("%Y-%m-%d %H:%M"))
-        
         # Category
         ttk.Label(details_frame, text="Category:").pack(side=tk.LEFT, padx=5)
         self.category_entry = ttk.Entry(details_frame)
         self.category_entry.pack(side=tk.LEFT)
         
-        if self.task and self.task.category:
-            self.category_entry.insert(0, self.task.category)
-        
         # Buttons
         btn_frame = ttk.Frame(self)
         btn_frame.pack(pady=10)
         
-        ttk.Button(
+        self.save_button = ttk.Button(
             btn_frame,
             text="Save",
             command=self.save_task
-        ).pack(side=tk.LEFT, padx=5)
+        )
+        self.save_button.pack(side=tk.LEFT, padx=5)
         
         ttk.Button(
             btn_frame,
@@ -370,6 +443,24 @@ class TaskEditorView(ttk.Frame):
             command=self.on_save
         ).pack(side=tk.LEFT, padx=5)
     
+    def show_task(self, task: Optional[Task]):
+        """Fill the form with the task being edited, once it has loaded."""
+        if task is None:
+            messagebox.showerror("Error", "Task not found")
+            self.on_save()
+            return
+        
+        self.task = task
+        self.title_entry.insert(0, task.title)
+        self.desc_text.insert("1.0", task.description)
+        self.priority_var.set(task.priority.name)
+        self.priority_cb.configure(state="readonly")
+        # Stored in UTC; edited in local time
+        self.due_entry.insert(0, task.due_at.astimezone().strftime("%Y-%m-%d %H:%M"))
+        if task.category:
+            self.category_entry.insert(0, task.category)
+        self.save_button.configure(state=tk.NORMAL)
+    
     def save_task(self):
         """Save the task."""
         try:
@@ -386,15 +477,20 @@ class TaskEditorView(ttk.Frame):
             if not due_str:
                 raise ValueError("Due date is required")
             
-            due_at = datetime.datetime.strptime(due_str, "%Y-%m-%d %H:%M")
+            # Typed in local time; naive datetimes would be stored as UTC
+            due_at = datetime.datetime.strptime(due_str, "%Y-%m-%d %H:%M").astimezone()
             
             if self.task:
-                # Update existing task
-                self.task.title = title
-                self.task.description = description
-                self.task.category = category
-                self.task.due_at = due_at
-                self.game.db.update_task(self.task)
+                # Update a copy; self.task is the shared cached object and
+                # must not change unless the write succeeds
+                task = dataclasses.replace(
+                    self.task,
+                    title=title,
+                    description=description,
+                    category=category,
+                    due_at=due_at
+                )
+                save = functools.partial(self.game.db.update_task, task)
             else:
                 # Create new task
                 task = Task(
@@ -407,9 +503,14 @@ class TaskEditorView(ttk.Frame):
                     category=category,
                     due_at=due_at
                 )
-                self.game.db.create_task(task)
+                save = functools.partial(self.game.db.create_task, task)
             
-            self.on_save()
+            self.worker.write(
+                save,
+                callback=lambda _: self.on_save(),
+                errback=lambda e: messagebox.showerror("Error", str(e)),
+                owner=self
+            )
             
         except (ValueError, TypeError) as e:
             messagebox.showerror("Error", str(e))
@@ -417,11 +518,18 @@ class TaskEditorView(ttk.Frame):
 class AchievementsView(ttk.Frame):
     """Achievements view."""
     
-    def __init__(self, parent: ttk.Frame, user: User, game: GameEngine):
+    def __init__(
+        self,
+        parent: ttk.Frame,
+        user: User,
+        game: GameEngine,
+        worker: DatabaseWorker
+    ):
         """Initialize achievements view."""
         super().__init__(parent)
         self.user = user
         self.game = game
+        self.worker = worker
         
         self.setup_ui()
     
@@ -451,56 +559,132 @@ class AchievementsView(ttk.Frame):
     def load_achievements(self):
         """Load achievements into the tree view."""
         for achievement_class in self.game.achievements:
-            completed = achievement_class.check(self.user, self.game.db)
-            status = "Completed" if completed else "Locked"
-            
             self.tree.insert(
                 "",
                 tk.END,
+                iid=achievement_class.__name__,
                 values=(
                     achievement_class.name,
                     achievement_class.description,
-                    status,
+                    "…",
                     f"+{achievement_class.xp_reward} XP"
                 )
             )
+        
+        self.worker.read(
+            self.game.db.get_unlocked_achievements,
+            self.user.id,
+            callback=self.show_unlocked,
+            owner=self
+        )
+    
+    def show_unlocked(self, unlocked):
+        """Fill in the unlock status of each achievement."""
+        for achievement_class in self.game.achievements:
+            unlocked_at = unlocked.get(achievement_class.__name__)
+            status = (
+                f"Completed {unlocked_at:%Y-%m-%d}" if unlocked_at else "Locked"
+            )
+            self.tree.set(achievement_class.__name__, "status", status)
 
-class ReportsView(ttk.Frame):
-    """Reports and statistics view."""
+class LeaderboardView(ttk.Frame):
+    """Cross-profile leaderboard view."""
     
-    def __init__(self, parent: ttk.Frame, user: User, game: GameEngine):
-        """Initialize reports view."""
+    METRICS = {
+        "XP": "xp",
+        "Level": "level",
+        "Longest Streak": "longest_streak",
+        "Weekly XP": "weekly_xp",
+    }
+    SIZE = 50
+    
+    def __init__(
+        self,
+        parent: ttk.Frame,
+        user: User,
+        game: GameEngine,
+        worker: DatabaseWorker
+    ):
+        """Initialize leaderboard view."""
         super().__init__(parent)
         self.user = user
         self.game = game
+        self.worker = worker
         
         self.setup_ui()
     
     def setup_ui(self):
         """Set up the UI components."""
-        # Create figure
-        self.figure = Figure(figsize=(6, 4), dpi=100)
-        self.canvas = FigureCanvasTkAgg(self.figure, self)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        self.plot_tasks_by_priority()
-    
-    def plot_tasks_by_priority(self):
-        """Plot tasks by priority chart."""
-        tasks = self.game.db.get_tasks(self.user.id)
-        priority_counts = {p.name: 0 for p in TaskPriority}
+        controls = ttk.Frame(self)
+        controls.pack(fill=tk.X, padx=10, pady=5)
         
-        for task in tasks:
-            priority_counts[task.priority.name] += 1
+        ttk.Label(controls, text="Rank by:").pack(side=tk.LEFT, padx=5)
+        self.metric_var = tk.StringVar(value=next(iter(self.METRICS)))
+        ttk.Combobox(
+            controls,
+            textvariable=self.metric_var,
+            values=list(self.METRICS),
+            state="readonly"
+        ).pack(side=tk.LEFT, padx=5)
         
-        ax = self.figure.add_subplot(111)
-        priorities = list(priority_counts.keys())
-        counts = list(priority_counts.values())
+        self.own_rank_label = ttk.Label(controls, text="")
+        self.own_rank_label.pack(side=tk.RIGHT, padx=5)
         
-        ax.bar(priorities, counts)
-        ax.set_title("Tasks by Priority")
-        ax.set_ylabel("Number of Tasks")
+        self.tree = ttk.Treeview(
+            self,
+            columns=("rank", "username", "value", "title"),
+            show="headings"
+        )
+        self.tree.heading("rank", text="#")
+        self.tree.heading("username", text="Profile")
+        self.tree.heading("value", text="Score")
+        self.tree.heading("title", text="Rank")
+        self.tree.column("rank", width=50)
+        self.tree.column("username", width=200)
+        self.tree.column("value", width=100)
+        self.tree.column("title", width=150)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
-        self.figure.tight_layout()
-        self.canvas.draw()
\ No newline at end of file
+        self.metric_var.trace("w", lambda *args: self.load_leaderboard())
+        self.load_leaderboard()
+    
+    def load_leaderboard(self):
+        """Fetch the top profiles and the current user's position."""
+        metric = self.METRICS[self.metric_var.get()]
+        self.worker.read(
+            self.game.db.get_leaderboard,
+            metric,
+            limit=self.SIZE,
+            callback=functools.partial(self.show_leaderboard, metric),
+            owner=self
+        )
+        self.worker.read(
+            self.game.db.get_user_rank,
+            self.user.id,
+            metric,
+            callback=self.show_own_rank,
+            owner=self
+        )
+    
+    def show_leaderboard(self, metric: str, entries: List[LeaderboardEntry]):
+        """Fill the tree with leaderboard entries."""
+        self.tree.delete(*self.tree.get_children())
+        titles = (
+            get_progression().ranks_for(entry.value for entry in entries)
+            if metric == "xp"
+            else [""] * len(entries)
+        )
+        for entry, title in zip(entries, titles):
+            self.tree.insert(
+                "",
+                tk.END,
+                iid=str(entry.user_id),
+                values=(entry.rank, entry.username, entry.value, title)
+            )
+        if self.tree.exists(str(self.user.id)):
+            self.tree.selection_set(str(self.user.id))
+    
+    def show_own_rank(self, entry: Optional[LeaderboardEntry]):
+        """Show where the current user stands."""
+        if entry is not None:
+            self.own_rank_label.configure(text=f"Your position: #{entry.rank}")
\ No newline at end of file
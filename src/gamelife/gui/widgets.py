@@ -0,0 +1,186 @@
+"""Reusable widgets for the Game of Life GUI."""
+import datetime
+import logging
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, List, Optional, Tuple
+
+from gamelife.data.database import Task
+from gamelife.gui.worker import DatabaseWorker
+
+logger = logging.getLogger(__name__)
+
+# Fetches up to ``limit`` tasks positioned after the (due_at, id) keyset
+PageFetcher = Callable[[Optional[Tuple[datetime.datetime, int]], int], List[Task]]
+
+class LazyTaskTree(ttk.Frame):
+    """Task Treeview that loads rows page by page as the user scrolls.
+
+    Only the first page is fetched up front; further pages are requested
+    through ``fetch_page`` when the view scrolls near the bottom. Rows are
+    keyed by task id, so a refresh updates, moves, inserts or deletes
+    individual rows instead of rebuilding the whole tree.
+    """
+
+    COLUMNS = ("title", "priority", "status", "due_at")
+
+    def __init__(
+        self,
+        parent: ttk.Frame,
+        fetch_page: PageFetcher,
+        page_size: int = 100,
+        prefetch_at: float = 0.8,
+        worker: Optional[DatabaseWorker] = None
+    ):
+        """Initialize the tree; call refresh() to load the first page.
+
+        With a ``worker``, pages are fetched in the background and applied
+        when they arrive; otherwise they are fetched inline.
+        """
+        super().__init__(parent)
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.prefetch_at = prefetch_at
+        self.worker = worker
+        self._last_key: Optional[Tuple[datetime.datetime, int]] = None
+        self._exhausted = False
+        self._loading = False
+        self._generation = 0
+
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show="headings")
+        self.scrollbar = ttk.Scrollbar(
+            self,
+            orient=tk.VERTICAL,
+            command=self.tree.yview
+        )
+        self.tree.configure(yscrollcommand=self._on_scroll)
+
+        self.tree.heading("title", text="Title")
+        self.tree.heading("priority", text="Priority")
+        self.tree.heading("status", text="Status")
+        self.tree.heading("due_at", text="Due Date")
+
+        self.tree.column("title", width=200)
+        self.tree.column("priority", width=100)
+        self.tree.column("status", width=100)
+        self.tree.column("due_at", width=150)
+
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+    @staticmethod
+    def row_values(task: Task) -> Tuple[str, ...]:
+        """Column values displayed for a task, with the due time in local time."""
+        return (
+            task.title,
+            task.priority.name,
+            task.status.name,
+            task.due_at.astimezone().strftime("%Y-%m-%d %H:%M")
+        )
+
+    def refresh(self, fetch_page: Optional[PageFetcher] = None) -> None:
+        """Reload from the top, diffing against the rows already shown.
+
+        Passing a new ``fetch_page`` (e.g. after a filter change) restarts
+        at one page; otherwise as many rows as are loaded are re-fetched so
+        the scroll position survives.
+        """
+        if fetch_page is not None:
+            self.fetch_page = fetch_page
+            limit = self.page_size
+        else:
+            limit = max(self.page_size, len(self.tree.get_children()))
+
+        # Pages still in flight from before this refresh are discarded
+        self._generation += 1
+        self._loading = True
+        self._fetch(None, limit, lambda tasks: self._apply_refresh(tasks, limit))
+
+    def load_more(self) -> None:
+        """Append the next page of tasks, if there is one."""
+        if self._exhausted or self._loading or self._last_key is None:
+            return
+
+        self._loading = True
+        self._fetch(self._last_key, self.page_size, self._apply_page)
+
+    def _fetch(self, after, limit: int, apply: Callable[[List[Task]], None]) -> None:
+        """Fetch a page inline or via the worker, then apply it."""
+        generation = self._generation
+
+        def deliver(tasks: List[Task]) -> None:
+            if generation == self._generation:
+                self._loading = False
+                apply(tasks)
+
+        def fail(error: BaseException) -> None:
+            if generation == self._generation:
+                self._loading = False
+            logger.error("Failed to load tasks", exc_info=error)
+
+        if self.worker is None:
+            try:
+                tasks = self.fetch_page(after, limit)
+            finally:
+                self._loading = False
+            apply(tasks)
+        else:
+            self.worker.read(
+                self.fetch_page,
+                after,
+                limit,
+                callback=deliver,
+                errback=fail,
+                owner=self
+            )
+
+    def _apply_refresh(self, tasks: List[Task], limit: int) -> None:
+        """Replace the loaded rows with ``tasks``, diffing by task id."""
+        self._exhausted = len(tasks) < limit
+        self._last_key = (tasks[-1].due_at, tasks[-1].id) if tasks else None
+
+        keep = {str(task.id) for task in tasks}
+        stale = [iid for iid in self.tree.get_children() if iid not in keep]
+        if stale:
+            self.tree.delete(*stale)
+
+        for index, task in enumerate(tasks):
+            self._upsert_row(task, index)
+
+    def _apply_page(self, tasks: List[Task]) -> None:
+        """Append a page fetched by load_more()."""
+        self._exhausted = len(tasks) < self.page_size
+        if tasks:
+            self._last_key = (tasks[-1].due_at, tasks[-1].id)
+        for task in tasks:
+            self._upsert_row(task, tk.END)
+
+    def update_task(self, task: Task) -> None:
+        """Refresh a single row in place if it is loaded."""
+        iid = str(task.id)
+        if self.tree.exists(iid):
+            self.tree.item(iid, values=self.row_values(task))
+
+    def selected_task_id(self) -> Optional[int]:
+        """Id of the selected task, if any."""
+        selection = self.tree.selection()
+        return int(selection[0]) if selection else None
+
+    def _upsert_row(self, task: Task, index) -> None:
+        """Insert a task's row or update it and move it to ``index``."""
+        iid = str(task.id)
+        values = self.row_values(task)
+        if not self.tree.exists(iid):
+            self.tree.insert("", index, iid=iid, values=values)
+            return
+
+        if tuple(map(str, self.tree.item(iid, "values"))) != values:
+            self.tree.item(iid, values=values)
+        if index != tk.END and self.tree.index(iid) != index:
+            self.tree.move(iid, "", index)
+
+    def _on_scroll(self, first: str, last: str) -> None:
+        """Track the scrollbar and fetch the next page near the bottom."""
+        self.scrollbar.set(first, last)
+        if float(last) >= self.prefetch_at and not self._exhausted:
+            self.after_idle(self.load_more)
@@ -0,0 +1,117 @@
+"""Background execution of database calls for the Tk GUI."""
+import logging
+import queue
+import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+Callback = Callable[[Any], None]
+Errback = Callable[[BaseException], None]
+
+class DatabaseWorker:
+    """Runs database calls off the Tk event loop.
+
+    Reads go to a small thread pool; writes go to a single writer thread so
+    SQLite never sees competing writers from the GUI. Results are handed
+    back to the Tk thread by polling a queue with ``root.after``, since Tk
+    must only be touched from the thread running the main loop.
+    """
+
+    def __init__(self, root: tk.Misc, readers: int = 2, poll_ms: int = 15):
+        """Initialize worker threads bound to the given Tk root."""
+        self.root = root
+        self.poll_ms = poll_ms
+        self._readers = ThreadPoolExecutor(
+            max_workers=readers,
+            thread_name_prefix="gamelife-db-read"
+        )
+        self._writer = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="gamelife-db-write"
+        )
+        self._done: queue.SimpleQueue = queue.SimpleQueue()
+        self._pending = 0
+        self._poll_id: Optional[str] = None
+
+    def read(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        callback: Optional[Callback] = None,
+        errback: Optional[Errback] = None,
+        owner: Optional[tk.Misc] = None,
+        **kwargs: Any
+    ) -> Future:
+        """Run a read-only call in the background.
+
+        ``callback`` (or ``errback`` on failure) runs on the Tk thread,
+        and is skipped if ``owner`` has been destroyed by then.
+        """
+        return self._submit(self._readers, fn, args, kwargs, callback, errback, owner)
+
+    def write(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        callback: Optional[Callback] = None,
+        errback: Optional[Errback] = None,
+        owner: Optional[tk.Misc] = None,
+        **kwargs: Any
+    ) -> Future:
+        """Run a call that writes to the database on the writer thread."""
+        return self._submit(self._writer, fn, args, kwargs, callback, errback, owner)
+
+    def shutdown(self) -> None:
+        """Stop accepting work and wait for running calls to finish."""
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self._readers.shutdown(wait=True, cancel_futures=True)
+        self._writer.shutdown(wait=True, cancel_futures=True)
+
+    def _submit(self, executor, fn, args, kwargs, callback, errback, owner) -> Future:
+        """Submit a call and make sure the result queue is being polled."""
+        future = executor.submit(fn, *args, **kwargs)
+        self._pending += 1
+        future.add_done_callback(
+            lambda f: self._done.put((f, callback, errback, owner))
+        )
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+        return future
+
+    def _poll(self) -> None:
+        """Deliver finished results on the Tk thread."""
+        self._poll_id = None
+        while True:
+            try:
+                future, callback, errback, owner = self._done.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            if owner is not None and not owner.winfo_exists():
+                continue
+            try:
+                self._deliver(future, callback, errback)
+            except Exception:  # Keep polling for the remaining results
+                logger.exception("Database callback failed")
+
+        if self._pending:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    @staticmethod
+    def _deliver(future: Future, callback, errback) -> None:
+        """Invoke the callback or errback for a finished future."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            if errback is not None:
+                errback(error)
+            else:
+                logger.error("Background database call failed", exc_info=error)
+            return
+        if callback is not None:
+            callback(future.result())
@@ -18,7 +18,10 @@ def temp_db():
     db = Database(Path(path))
     yield db
     
-    os.unlink(path)
+    db.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
 
 @pytest.fixture
 def test_user(temp_db):
@@ -0,0 +1,55 @@
+"""Test cases for columnar task frames and analytics."""
+import datetime
+import math
+
+import numpy as np
+import pytest
+
+from gamelife.core.analytics import count_by, lateness_histogram, on_time_rate
+from gamelife.core.config import TaskPriority, TaskStatus
+from gamelife.data.database import Task
+
+def test_task_frame(temp_db, test_user):
+    """Test fetching a frame and the vectorized helpers over it."""
+    due = datetime.datetime(2024, 1, 10, 12, tzinfo=datetime.UTC)
+    hour = datetime.timedelta(hours=1)
+    temp_db.create_tasks([
+        Task(None, test_user.id, "Early", "", TaskPriority.HIGH,
+             TaskStatus.COMPLETED, due, due - 30 * hour, "work"),
+        Task(None, test_user.id, "Late", "", TaskPriority.LOW,
+             TaskStatus.COMPLETED, due, due + 2 * hour, "home"),
+        Task(None, test_user.id, "On time", "", TaskPriority.LOW,
+             TaskStatus.COMPLETED, due, due, "work"),
+        Task(None, test_user.id, "Open", "", TaskPriority.LOW,
+             TaskStatus.PENDING, due),
+    ])
+    
+    frame = temp_db.get_task_frame(test_user.id)
+    assert len(frame) == 4
+    assert frame["due_at"][0] == due.timestamp()
+    assert math.isnan(frame["completed_at"][3])
+    assert frame.categories == ("work", "home")
+    assert frame["category"].tolist() == [0, 1, 0, -1]
+    
+    assert count_by(frame, "priority") == {TaskPriority.LOW: 3, TaskPriority.HIGH: 1}
+    assert count_by(frame, "status") == {TaskStatus.PENDING: 1, TaskStatus.COMPLETED: 3}
+    assert count_by(frame, "category") == {None: 1, "work": 2, "home": 1}
+    assert on_time_rate(frame) == pytest.approx(200 / 3)
+    
+    counts, edges = lateness_histogram(frame)
+    assert counts.sum() == 3
+    assert counts[np.searchsorted(edges, -30) - 1] == 1
+    assert counts[np.searchsorted(edges, 2) - 1] == 1
+    
+    # Column subsets and filters are applied in SQL
+    pending = temp_db.get_task_frame(
+        test_user.id, columns=["id", "status"], status=TaskStatus.PENDING
+    )
+    assert list(pending.columns) == ["id", "status"]
+    assert len(pending) == 1
+    assert math.isnan(on_time_rate(temp_db.get_task_frame(test_user.id, category="none")))
+    
+    with pytest.raises(ValueError):
+        temp_db.get_task_frame(test_user.id, columns=["title"])
+    with pytest.raises(ValueError):
+        count_by(frame, "due_at")
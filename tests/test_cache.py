@@ -0,0 +1,160 @@
+"""Test cases for the read-through object cache."""
+import dataclasses
+import datetime
+import sqlite3
+import threading
+
+import pytest
+
+from gamelife.core.config import DatabaseConfig, TaskPriority, TaskStatus
+from gamelife.core.game import GameEngine
+from gamelife.data.cache import ObjectCache
+from gamelife.data.database import Database, Task
+
+def test_lru_and_versioning():
+    """Test eviction order and that reads racing a write are not cached."""
+    cache = ObjectCache(max_entries=2)
+    cache.put("a", [1], cache.version)
+    cache.put("b", [2], cache.version)
+    assert cache.get("a") == [1]  # "b" is now least recently used
+    cache.put("c", [3], cache.version)
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 2)
+    
+    # The first object stored for a key stays the canonical one
+    assert cache.put("c", [3], cache.version) is cache.get("c")
+    
+    version = cache.version
+    cache.invalidate(["a"])
+    cache.put("d", [4], version)
+    assert cache.get("d") is None
+    
+    # Reads inside a transaction are published only when it commits,
+    # and other threads' reads are not cached while it is open
+    with cache.writing():
+        cache.put("e", [5], cache.version)
+        assert cache.get("e") == [5]
+        other = threading.Thread(target=cache.put, args=("f", [6], cache.version))
+        other.start()
+        other.join()
+    assert cache.get("e") == [5]
+    assert cache.get("f") is None
+    
+    with pytest.raises(RuntimeError):
+        with cache.writing():
+            cache.put("g", [7], cache.version)
+            raise RuntimeError
+    assert cache.get("g") is None
+
+def test_database_cache(temp_db, test_user):
+    """Test identity, invalidation on writes and rollback."""
+    user = temp_db.get_user_by_id(test_user.id)
+    assert temp_db.get_user_by_id(test_user.id) is user
+    
+    # User writes are applied to the cached object
+    temp_db.update_user_xp(test_user.id, 40, 1)
+    temp_db.update_user_streak(test_user.id, 2, 3, datetime.date(2024, 1, 2))
+    assert temp_db.get_user_by_id(test_user.id) is user
+    assert (user.xp, user.streak) == (40, 2)
+    temp_db.rebuild_completion_calendars([test_user.id])
+    refreshed = temp_db.get_user_by_id(test_user.id)
+    assert refreshed is not user
+    assert (refreshed.xp, refreshed.streak) == (40, 0)
+    
+    due = datetime.datetime.now(datetime.UTC)
+    task = temp_db.create_task(Task(
+        None, test_user.id, "Cached", "", TaskPriority.LOW, TaskStatus.PENDING, due
+    ))
+    listed = temp_db.get_tasks(test_user.id)
+    assert listed == temp_db.get_tasks(test_user.id)
+    assert temp_db.get_task(task.id) is listed[0]
+    
+    temp_db.create_task(Task(
+        None, test_user.id, "Second", "", TaskPriority.LOW, TaskStatus.PENDING, due
+    ))
+    assert len(temp_db.get_tasks(test_user.id)) == 2
+    
+    temp_db.update_task_status(task.id, TaskStatus.COMPLETED, due)
+    assert temp_db.get_task(task.id).status == TaskStatus.COMPLETED
+    assert len(temp_db.get_tasks(test_user.id, TaskStatus.PENDING)) == 1
+    
+    # A rollback evicts objects that may have been changed in memory;
+    # holders of the old object still see the change
+    other = temp_db.create_user("other_user")
+    other_tasks = temp_db.get_tasks(other.id)
+    temp_db.update_task_status(task.id, TaskStatus.FAILED)
+    assert ("tasks", other.id, None) in temp_db.cache._entries
+    assert temp_db.get_tasks(other.id) == other_tasks
+    
+    with pytest.raises(RuntimeError):
+        with temp_db.transaction():
+            changed = temp_db.get_user_by_id(test_user.id)
+            changed.xp = 999
+            raise RuntimeError
+    reloaded = temp_db.get_user_by_id(test_user.id)
+    assert reloaded is not changed
+    assert (reloaded.xp, changed.xp) == (40, 999)
+    assert temp_db.cache.hits > 0 and temp_db.cache.misses > 0
+
+def test_cache_disabled(tmp_path):
+    """Test that the cache can be switched off."""
+    with Database(tmp_path / "uncached.db", DatabaseConfig(object_cache=False)) as db:
+        user = db.create_user("uncached")
+        assert db.get_user_by_id(user.id) is not db.get_user_by_id(user.id)
+        assert (db.cache.hits, db.cache.misses, len(db.cache)) == (0, 0, 0)
+
+def test_failed_update_leaves_cached_task(temp_db, test_user):
+    """Test that edits written from a copy never reach the cache on failure."""
+    due = datetime.datetime.now(datetime.UTC)
+    task = temp_db.create_task(Task(
+        None, test_user.id, "Original", "", TaskPriority.LOW, TaskStatus.PENDING, due
+    ))
+    cached = temp_db.get_task(task.id)
+    listed = temp_db.get_tasks(test_user.id)
+    
+    # Editors write a copy, as TaskEditorView does; a NULL title fails
+    edited = dataclasses.replace(cached, title=None, due_at=due.replace(tzinfo=None))
+    with pytest.raises(sqlite3.IntegrityError):
+        temp_db.update_task(edited)
+    
+    assert temp_db.get_task(task.id) is cached
+    assert (cached.title, cached.due_at) == ("Original", due)
+    assert temp_db.get_tasks(test_user.id)[0].title == "Original"
+    assert listed[0] is cached
+
+
+def test_engine_reads_hit_cache(temp_db, test_user):
+    """Test that users read inside completion transactions get cached."""
+    game = GameEngine(temp_db)
+    now = datetime.datetime.now(datetime.UTC)
+    tasks = [
+        temp_db.create_task(Task(
+            None, test_user.id, f"Task {i}", "", TaskPriority.LOW,
+            TaskStatus.PENDING, now
+        ))
+        for i in range(20)
+    ]
+    for task in tasks:
+        game.complete_task(task, now)
+    
+    assert temp_db.cache.hits >= 19
+    user = temp_db.get_user_by_id(test_user.id)
+    assert temp_db.get_user_by_id(test_user.id) is user
+    assert user.xp == temp_db.get_user(test_user.username).xp
+
+def test_task_lists_resolve_cached_tasks(tmp_path):
+    """Test that task lists and get_task agree when tasks are evicted."""
+    with Database(tmp_path / "small.db", DatabaseConfig(object_cache_size=3)) as db:
+        user = db.create_user("small")
+        due = datetime.datetime.now(datetime.UTC)
+        for i in range(5):
+            db.create_task(Task(
+                None, user.id, f"Task {i}", "", TaskPriority.LOW,
+                TaskStatus.PENDING, due
+            ))
+        
+        listed = db.get_tasks(user.id)
+        for task in listed:
+            fetched = db.get_task(task.id)
+            assert any(t is fetched for t in db.get_tasks(user.id))
+        assert len(db.cache) <= 3
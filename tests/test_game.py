@@ -1,10 +1,19 @@
 """Test cases for game mechanics."""
 import datetime
+import time
 
 import pytest
 
-from gamelife.core.config import TaskPriority, TaskStatus
-from gamelife.core.game import GameEngine
+from gamelife.core.config import TaskPriority, TaskStatus, config
+from gamelife.core.game import (
+    Achievement,
+    AchievementRegistry,
+    FirstTaskCompleted,
+    GameEngine,
+    GameEvent,
+    SevenDayStreak
+)
+from gamelife.data.database import Task
 
 def test_task_completion_xp(temp_db, test_user, test_task):
     """Test XP calculation for task completion."""
@@ -104,4 +113,276 @@ def test_achievement_unlocking(temp_db, test_user):
     # Should get task XP + achievement XP
     assert test_user.xp > initial_xp
     achievements = game.check_achievements(test_user)
-    assert any(a.__name__ == "FirstTaskCompleted" for a in achievements)
\ No newline at end of file
+    assert any(a.__name__ == "FirstTaskCompleted" for a in achievements)
+
+def test_batch_completion(temp_db, test_user):
+    """Test completing many tasks in one batch."""
+    game = GameEngine(temp_db)
+    now = datetime.datetime.now(datetime.UTC)
+    tasks = [
+        temp_db.create_task(Task(
+            id=None,
+            user_id=test_user.id,
+            title=f"Batch Task {i}",
+            description="Test batch completion",
+            priority=TaskPriority.LOW,
+            status=TaskStatus.PENDING,
+            due_at=now
+        ))
+        for i in range(3)
+    ]
+    
+    result = game.complete_tasks(tasks, now)
+    
+    assert result.task_xp == {task.id: 10 for task in tasks}
+    assert result.achievement_xp[test_user.id] == 25  # First Steps
+    assert result.total_xp == 55
+    
+    user = temp_db.get_user_by_id(test_user.id)
+    assert user.xp == 55
+    assert user.streak == 1
+    assert len(temp_db.get_tasks(test_user.id, TaskStatus.COMPLETED)) == 3
+    
+    # Already-completed tasks earn nothing
+    assert game.complete_tasks(tasks, now).total_xp == 0
+
+def test_xp_totals_tracked(temp_db, test_user, test_task):
+    """Test that completion and failure feed the XP totals."""
+    game = GameEngine(temp_db)
+    earned = game.complete_task(test_task, datetime.datetime.now(datetime.UTC))
+    
+    failed = temp_db.create_task(Task(
+        id=None,
+        user_id=test_user.id,
+        title="Missed Task",
+        description="Test XP totals",
+        priority=TaskPriority.LOW,
+        status=TaskStatus.PENDING,
+        due_at=datetime.datetime.now(datetime.UTC)
+    ))
+    penalty = game.fail_task(failed)
+    
+    stats = temp_db.get_user_stats(test_user.id)
+    assert stats.xp_earned == earned
+    assert stats.xp_lost == -penalty
+    assert stats.by_status[TaskStatus.FAILED] == 1
+
+
+def test_achievement_xp_raises_level(temp_db, test_user, test_task):
+    """Test that achievement XP counts toward the level and raises LEVEL_UP."""
+    game = GameEngine(temp_db)
+    
+    @game.achievements.register
+    class Promoted(Achievement):
+        """Unlocked on the first level up."""
+        name = "Promoted"
+        description = "Reach level 2"
+        xp_reward = 5
+        events = frozenset({GameEvent.LEVEL_UP})
+        
+        @classmethod
+        def check(cls, user, db):
+            """Check if the user has passed level 1."""
+            return user.level > 1
+    
+    temp_db.update_user_xp(test_user.id, 80, 1)
+    test_task.priority = TaskPriority.LOW
+    # 10 task XP keeps the user at level 1; First Steps' 25 XP does not
+    game.complete_task(test_task, test_task.due_at)
+    
+    user = temp_db.get_user_by_id(test_user.id)
+    assert (user.xp, user.level) == (120, 2)
+    assert set(temp_db.get_unlocked_achievements(user.id)) == {
+        "FirstTaskCompleted", "Promoted"
+    }
+
+def test_achievement_unlocked_once(temp_db, test_user):
+    """Test that achievement rewards are only granted on first unlock."""
+    game = GameEngine(temp_db)
+    now = datetime.datetime.now(datetime.UTC)
+    tasks = [
+        temp_db.create_task(Task(
+            id=None,
+            user_id=test_user.id,
+            title=f"Unlock Task {i}",
+            description="Test unlock persistence",
+            priority=TaskPriority.LOW,
+            status=TaskStatus.PENDING,
+            due_at=now
+        ))
+        for i in range(2)
+    ]
+    
+    assert game.complete_task(tasks[0], now) == 10 + FirstTaskCompleted.xp_reward
+    assert game.complete_task(tasks[1], now) == 10
+    
+    unlocked = temp_db.get_unlocked_achievements(test_user.id)
+    assert list(unlocked) == ["FirstTaskCompleted"]
+
+def test_achievement_registry_subscriptions():
+    """Test that achievements are only dispatched for their events."""
+    registry = AchievementRegistry([FirstTaskCompleted, SevenDayStreak])
+    
+    assert len(registry) == 2
+    assert registry.subscribers([GameEvent.TASK_COMPLETED]) == [FirstTaskCompleted]
+    assert registry.subscribers([GameEvent.STREAK_CHANGED]) == [SevenDayStreak]
+    assert registry.subscribers([GameEvent.TASK_FAILED]) == []
+
+def test_daily_rollups_maintained(temp_db, test_user):
+    """Test that completions and failures feed the daily rollups."""
+    game = GameEngine(temp_db)
+    now = datetime.datetime.now(datetime.UTC)
+    tasks = [
+        temp_db.create_task(Task(
+            id=None,
+            user_id=test_user.id,
+            title=f"Rollup Task {i}",
+            description="Test rollups",
+            priority=priority,
+            status=TaskStatus.PENDING,
+            due_at=now
+        ))
+        for i, priority in enumerate([TaskPriority.LOW, TaskPriority.LOW, TaskPriority.HIGH])
+    ]
+    
+    game.complete_tasks(tasks[:2], now)
+    game.fail_task(tasks[2])
+    
+    today = datetime.date.today()
+    rollups = temp_db.get_daily_rollups(
+        test_user.id, today - datetime.timedelta(days=1), today + datetime.timedelta(days=1),
+        by_priority=True
+    )
+    by_priority = {r.priority: r for r in rollups}
+    assert by_priority[TaskPriority.LOW].completed == 2
+    assert by_priority[TaskPriority.LOW].xp_gained == 20
+    assert by_priority[TaskPriority.HIGH].failed == 1
+    # The 75 XP penalty is floored at the 45 XP the user had
+    assert by_priority[TaskPriority.HIGH].xp_lost == 45
+    assert temp_db.get_user_stats(test_user.id).xp_lost == 45
+
+def test_batch_failure_floors_xp_lost(temp_db, test_user):
+    """Test that batch failures record only the XP actually lost."""
+    game = GameEngine(temp_db)
+    now = datetime.datetime.now(datetime.UTC)
+    temp_db.update_user_xp(test_user.id, 60, 1)
+    tasks = [
+        temp_db.create_task(Task(
+            None, test_user.id, f"Missed {i}", "", TaskPriority.MEDIUM,
+            TaskStatus.PENDING, now
+        ))
+        for i in range(3)
+    ]
+    
+    penalties = game.fail_tasks(tasks, now)
+    assert [penalties[t.id] for t in tasks] == [-38, -22, 0]
+    
+    # Only the 60 XP the user had can be lost, matching the ledger
+    assert -sum(
+        e.delta for e in temp_db.get_xp_events(test_user.id)
+        if e.reason == "task_failed"
+    ) == 60
+    assert temp_db.get_user_stats(test_user.id).xp_lost == 60
+    today = datetime.date.today()
+    rollups = temp_db.get_daily_rollups(
+        test_user.id, today - datetime.timedelta(days=1), today + datetime.timedelta(days=1)
+    )
+    assert sum(r.xp_lost for r in rollups) == 60
+
+def test_rollup_days_are_local(temp_db, test_user, monkeypatch):
+    """Test that rollups, rebuilt rollups and streaks share the local day."""
+    monkeypatch.setenv("TZ", "America/Los_Angeles")
+    time.tzset()
+    try:
+        game = GameEngine(temp_db)
+        # Evening of January 9th in Los Angeles, already the 10th in UTC
+        evening = datetime.datetime(2024, 1, 10, 3, tzinfo=datetime.UTC)
+        done, failed = [
+            temp_db.create_task(Task(
+                None, test_user.id, title, "", TaskPriority.LOW,
+                TaskStatus.PENDING, evening
+            ))
+            for title in ("Done", "Failed")
+        ]
+        game.complete_task(done, evening)
+        game.fail_tasks([failed], evening)
+        
+        local_day = datetime.date(2024, 1, 9)
+        assert temp_db.get_completion_calendar(test_user.id).last_day == local_day
+        
+        def days():
+            rollups = temp_db.get_daily_rollups(
+                test_user.id, local_day, local_day + datetime.timedelta(days=2)
+            )
+            return [(r.day, r.completed, r.failed) for r in rollups]
+        
+        assert days() == [(local_day, 1, 1)]
+        with temp_db._pool.connection() as conn:
+            # Date the failure by its sweep time, as the live update did
+            conn.execute(
+                "UPDATE tasks SET updated_at = ? WHERE id = ?",
+                (int(evening.timestamp() * 1e6), failed.id)
+            )
+        temp_db.rebuild_daily_rollups()
+        assert days() == [(local_day, 1, 1)]
+    finally:
+        monkeypatch.delenv("TZ")
+        time.tzset()
+
+def test_xp_ledger_matches_balance(temp_db, test_user):
+    """Test that every engine XP change is written to the ledger."""
+    game = GameEngine(temp_db)
+    now = datetime.datetime.now(datetime.UTC)
+    tasks = [
+        temp_db.create_task(Task(
+            id=None,
+            user_id=test_user.id,
+            title=f"Ledger Task {i}",
+            description="Test XP ledger",
+            priority=TaskPriority.HIGH,
+            status=TaskStatus.PENDING,
+            due_at=now
+        ))
+        for i in range(2)
+    ]
+    
+    game.complete_task(tasks[0], now)
+    game.fail_task(tasks[1])
+    
+    user = temp_db.get_user_by_id(test_user.id)
+    events = temp_db.get_xp_events(test_user.id)
+    assert [e.reason for e in events] == [
+        "task_completed", "achievement:FirstTaskCompleted", "task_failed"
+    ]
+    assert sum(e.delta for e in events) == user.xp
+    assert game.xp_at(user, datetime.datetime.now(datetime.UTC)) == (user.xp, user.level)
+
+def test_xp_batch_matches_single_task_xp(test_user):
+    """Test batch scoring against per-task scoring and config changes."""
+    game = GameEngine(None)
+    due = datetime.datetime(2024, 1, 10, tzinfo=datetime.UTC)
+    tasks = [
+        Task(None, test_user.id, f"Task {i}", "", priority, status, due, completed_at)
+        for i, (priority, status, completed_at) in enumerate([
+            (TaskPriority.MEDIUM, TaskStatus.COMPLETED, due - datetime.timedelta(days=7)),
+            (TaskPriority.LOW, TaskStatus.COMPLETED, due - datetime.timedelta(hours=30)),
+            (TaskPriority.CRITICAL, TaskStatus.COMPLETED, due + datetime.timedelta(hours=1)),
+            (TaskPriority.HIGH, TaskStatus.FAILED, None),
+            (TaskPriority.HIGH, TaskStatus.PENDING, None),
+        ])
+    ]
+    
+    batch = game.calculate_xp_batch(tasks)
+    assert batch == [37, 11, 100, -75, 0]
+    assert batch == [game.calculate_task_xp(t, t.completed_at) for t in tasks]
+    
+    xp_config = config.xp_config
+    rules = xp_config.rules
+    assert xp_config.rules is rules
+    old_rewards = xp_config.base_rewards
+    try:
+        xp_config.base_rewards = {**old_rewards, TaskPriority.CRITICAL: 200}
+        assert xp_config.rules is not rules
+        assert game.calculate_xp_batch(tasks[2:3]) == [200]
+    finally:
+        xp_config.base_rewards = old_rewards
@@ -0,0 +1,98 @@
+"""Test cases for streaming task import."""
+import datetime
+import json
+
+import pytest
+
+from gamelife.__main__ import build_parser, run_import
+from gamelife.core.config import TaskPriority, TaskStatus, config
+from gamelife.data.importer import iter_tasks
+
+def test_import_csv(temp_db, test_user, tmp_path):
+    """Test importing tasks from a CSV file."""
+    path = tmp_path / "tasks.csv"
+    path.write_text(
+        "title,description,priority,due_at,category\n"
+        "Write report,Quarterly,HIGH,2026-01-01T09:00:00+00:00,work\n"
+        "Buy milk,,,2026-01-02T09:00:00+00:00,\n",
+        encoding="utf-8"
+    )
+    
+    ids = temp_db.create_tasks(iter_tasks(path, test_user.id))
+    assert len(ids) == 2
+    
+    tasks = sorted(temp_db.get_tasks(test_user.id), key=lambda t: t.id)
+    assert tasks[0].priority == TaskPriority.HIGH
+    assert tasks[0].category == "work"
+    assert tasks[1].priority == TaskPriority.MEDIUM
+    assert tasks[1].category is None
+
+def test_import_jsonl(temp_db, test_user, tmp_path):
+    """Test importing tasks from a JSON Lines file."""
+    path = tmp_path / "tasks.jsonl"
+    records = [
+        {"title": "Done", "due_at": "2026-01-03T00:00:00+00:00",
+         "status": "COMPLETED", "completed_at": "2026-01-02T00:00:00+00:00"},
+        {"title": "Todo", "due_at": "2026-01-04T00:00:00+00:00"},
+    ]
+    path.write_text("\n".join(json.dumps(r) for r in records), encoding="utf-8")
+    
+    temp_db.create_tasks(iter_tasks(path, test_user.id))
+    completed = temp_db.get_tasks(test_user.id, TaskStatus.COMPLETED)
+    assert [t.title for t in completed] == ["Done"]
+
+def test_import_invalid_record(test_user, tmp_path):
+    """Test that bad records report their position."""
+    path = tmp_path / "tasks.jsonl"
+    path.write_text('{"title": "No due date"}\n', encoding="utf-8")
+    
+    with pytest.raises(ValueError, match="record 1"):
+        list(iter_tasks(path, test_user.id))
+
+def test_run_import_checks_file_first(temp_db, tmp_path, monkeypatch):
+    """Test that a bad record fails the import before any chunk is written."""
+    monkeypatch.setattr(config, "db_path", temp_db.db_path)
+    path = tmp_path / "tasks.jsonl"
+    records = [
+        {"title": f"Task {i}", "due_at": "2026-01-04T00:00:00+00:00"}
+        for i in range(5)
+    ]
+    records.append({"title": "No due date"})
+    path.write_text("\n".join(json.dumps(r) for r in records), encoding="utf-8")
+    args = build_parser().parse_args(
+        ["import", str(path), "--user", "importer", "--chunk-size", "2"]
+    )
+    
+    assert run_import(args) == 1
+    assert run_import(args) == 1
+    assert temp_db.get_user("importer") is None
+    
+    path.write_text("\n".join(json.dumps(r) for r in records[:5]), encoding="utf-8")
+    assert run_import(args) == 0
+    assert len(temp_db.get_tasks(temp_db.get_user("importer").id)) == 5
+
+def test_run_import_adds_rollups(temp_db, tmp_path, monkeypatch):
+    """Test that imported completions and failures show up in the rollups."""
+    monkeypatch.setattr(config, "db_path", temp_db.db_path)
+    user = temp_db.create_user("importer")
+    path = tmp_path / "tasks.jsonl"
+    records = [
+        {"title": f"Done {i}", "due_at": "2026-01-04T12:00:00+00:00",
+         "status": "COMPLETED", "completed_at": "2026-01-03T12:00:00+00:00"}
+        for i in range(3)
+    ]
+    records.append({"title": "Todo", "due_at": "2026-01-04T12:00:00+00:00"})
+    path.write_text("\n".join(json.dumps(r) for r in records), encoding="utf-8")
+    args = build_parser().parse_args(
+        ["import", str(path), "--user", "importer", "--chunk-size", "2"]
+    )
+    
+    assert run_import(args) == 0
+    assert run_import(args) == 0
+    
+    rollups = temp_db.get_daily_rollups(
+        user.id, datetime.date(2026, 1, 1), datetime.date(2026, 1, 8)
+    )
+    assert sum(r.completed for r in rollups) == 6
+    assert sum(r.failed for r in rollups) == 0
+    assert sum(r.xp_gained for r in rollups) == 0
@@ -0,0 +1,62 @@
+"""Test cases for rank and level progression."""
+import pytest
+
+from gamelife.core.config import LevelConfig, RankConfig, config
+from gamelife.core.progression import (
+    LinearCurve,
+    Progression,
+    TableCurve,
+    build_curve,
+    get_progression
+)
+
+def test_rank_lookup():
+    """Test rank lookup with unsorted and many tiers."""
+    ranks = [RankConfig("Gold", 500), RankConfig("Bronze", 0), RankConfig("Silver", 100)]
+    progression = Progression(ranks, LinearCurve(100))
+
+    assert progression.rank_for(-10) == "Bronze"
+    assert progression.rank_for(99) == "Bronze"
+    assert progression.rank_for(100) == "Silver"
+    assert progression.rank_for(10**6) == "Gold"
+    assert progression.ranks_for([0, 250, 500]) == ["Bronze", "Silver", "Gold"]
+
+    tiers = Progression(
+        [RankConfig(f"Tier {i}", i * 10) for i in range(500)],
+        LinearCurve(100)
+    )
+    assert tiers.ranks_for([0, 15, 4990, 99999]) == [
+        "Tier 0", "Tier 1", "Tier 499", "Tier 499"
+    ]
+
+def test_level_curves():
+    """Test linear, exponential and table level curves."""
+    linear = build_curve(LevelConfig(), 100)
+    assert [linear.level_for(xp) for xp in (0, 99, 100, 250)] == [1, 1, 2, 3]
+    assert linear.xp_for_level(3) == 200
+
+    exponential = build_curve(LevelConfig(curve="exponential", growth=2, max_level=5), 100)
+    assert exponential.thresholds == (0, 100, 300, 700, 1500)
+    assert [exponential.level_for(xp) for xp in (0, 299, 300, 10**6)] == [1, 2, 3, 5]
+
+    table = build_curve(LevelConfig(curve="table", thresholds=(0, 10, 50)), 100)
+    assert [table.level_for(xp) for xp in (-5, 10, 49, 50)] == [1, 2, 2, 3]
+    assert table.xp_for_level(2) == 10
+
+    with pytest.raises(ValueError):
+        TableCurve([5, 10])
+    with pytest.raises(ValueError):
+        build_curve(LevelConfig(curve="cubic"), 100)
+
+def test_progression_rebuilt_on_config_change():
+    """Test that the global progression follows config replacements."""
+    progression = get_progression()
+    assert get_progression() is progression
+
+    old_ranks = config.ranks
+    try:
+        config.ranks = [RankConfig("Only", 0)]
+        assert get_progression() is not progression
+        assert get_progression().rank_for(10**6) == "Only"
+    finally:
+        config.ranks = old_ranks
@@ -0,0 +1,107 @@
+"""Test cases for bulk XP recomputation."""
+import datetime
+
+import numpy as np
+
+from gamelife.core.config import TaskPriority, TaskStatus, XPConfig
+from gamelife.core.game import GameEngine
+from gamelife.core.recompute import recompute_xp, replay_balance, score_tasks
+from gamelife.data.database import Task
+
+def test_score_tasks_buckets_early_bonus():
+    """Test batch scoring against the bonus thresholds."""
+    rules = XPConfig().rules
+    due = datetime.datetime(2024, 1, 10, tzinfo=datetime.UTC)
+    tasks = [
+        (TaskPriority.MEDIUM, TaskStatus.COMPLETED, due, due - datetime.timedelta(days=8)),
+        (TaskPriority.MEDIUM, TaskStatus.COMPLETED, due, due - datetime.timedelta(days=3)),
+        (TaskPriority.LOW, TaskStatus.COMPLETED, due, due - datetime.timedelta(hours=1)),
+        (TaskPriority.HIGH, TaskStatus.FAILED, due, None),
+    ]
+
+    # 25 + 50%, 25 + 25%, no bonus, then the HIGH penalty
+    assert score_tasks(tasks, rules) == 37 + 31 + 10 - 75
+    assert score_tasks([], rules) == 0
+
+    # Array scoring agrees with the per-task rules, including late tasks
+    hours = [-48, -1, 0, 1, 12, 24, 47, 72, 200, None]
+    mixed = [
+        (priority, status, due, due - datetime.timedelta(hours=h) if h is not None else None)
+        for priority in TaskPriority
+        for status in (TaskStatus.COMPLETED, TaskStatus.FAILED)
+        for h in hours
+    ]
+    assert score_tasks(mixed, rules) == sum(
+        rules.task_xp(p, s, (d - c).total_seconds() if c else None)
+        for p, s, d, c in mixed
+    )
+
+def test_recompute_xp(temp_db, test_user):
+    """Test dry-run and applied recomputation of a user's XP."""
+    due = datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=10)
+    temp_db.create_tasks([
+        Task(None, test_user.id, "Early", "", TaskPriority.MEDIUM,
+             TaskStatus.COMPLETED, due, due - datetime.timedelta(days=8)),
+        Task(None, test_user.id, "Late", "", TaskPriority.LOW,
+             TaskStatus.FAILED, due),
+        Task(None, test_user.id, "Open", "", TaskPriority.CRITICAL,
+             TaskStatus.PENDING, due),
+    ])
+    temp_db.unlock_achievement(test_user.id, "FirstTaskCompleted", due)
+    temp_db.update_user_xp(test_user.id, 999, 10)
+    rewards = {"FirstTaskCompleted": 25}
+
+    # The failure comes first and is floored at 0, then 25 + 50% and the
+    # achievement unlocked after it
+    changes = recompute_xp(temp_db, rewards, dry_run=True, chunk_size=1)
+    assert [(c.old_xp, c.new_xp, c.new_level) for c in changes] == [(999, 62, 1)]
+    assert temp_db.get_user_by_id(test_user.id).xp == 999
+
+    progress = []
+    changes = recompute_xp(
+        temp_db, rewards, progress=lambda *args: progress.append(args)
+    )
+    user = temp_db.get_user_by_id(test_user.id)
+    assert (user.xp, user.level) == (62, 1)
+    assert progress == [(1, 1, 2)]
+    assert [(e.delta, e.reason) for e in temp_db.get_xp_events(user.id)] == [
+        (-937, "recompute")
+    ]
+
+    # Already consistent, so a second run changes nothing
+    assert recompute_xp(temp_db, rewards) == []
+
+def test_replay_balance_floors_each_step():
+    """Test that the running balance is floored at 0 after each change."""
+    deltas = [10, -75, 10, 25, -15, 5]
+    expected = 0
+    for delta in deltas:
+        expected = max(0, expected + delta)
+    assert replay_balance(0, np.array(deltas)) == expected == 25
+    assert replay_balance(100, np.array(deltas)) == 60
+    assert replay_balance(7, np.array([], dtype=np.int64)) == 7
+
+def test_recompute_matches_engine(temp_db, test_user):
+    """Test that recomputing engine-produced XP under unchanged rules is a no-op."""
+    game = GameEngine(temp_db)
+    due = datetime.datetime.now(datetime.UTC) + datetime.timedelta(hours=1)
+    
+    def make(title):
+        """Create a pending task for the test user."""
+        return temp_db.create_task(Task(
+            None, test_user.id, title, "", TaskPriority.LOW, TaskStatus.PENDING, due
+        ))
+    
+    # The penalty is floored at 0, then the completion unlocks an achievement
+    game.fail_task(make("Missed"))
+    game.complete_task(make("Done"), datetime.datetime.now(datetime.UTC))
+    game.fail_tasks([make("Missed again")])
+    game.complete_tasks(
+        [make("Batch 1"), make("Batch 2")], datetime.datetime.now(datetime.UTC)
+    )
+    
+    user = temp_db.get_user_by_id(test_user.id)
+    rewards = {a.__name__: a.xp_reward for a in game.achievements}
+    assert recompute_xp(temp_db, rewards, dry_run=True) == []
+    assert recompute_xp(temp_db, rewards, chunk_size=1) == []
+    assert temp_db.get_user_by_id(test_user.id).xp == user.xp > 0
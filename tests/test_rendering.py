@@ -0,0 +1,68 @@
+"""Test cases for cached report rendering."""
+import datetime
+
+from gamelife.gui.rendering import ReportRenderer
+
+def test_bar_chart_cache():
+    """Test that unchanged data is served from the image cache."""
+    renderer = ReportRenderer()
+    labels = ["LOW", "HIGH"]
+    
+    first = renderer.render_bar_chart(1, "priority", labels, [1, 2], "T", "Y")
+    assert first.startswith(b"\x89PNG")
+    assert renderer.render_bar_chart(1, "priority", labels, [1, 2], "T", "Y") is first
+    assert (renderer.hits, renderer.misses) == (1, 1)
+    
+    figure, bars = renderer._figures[(1, "priority")]
+    updated = renderer.render_bar_chart(1, "priority", labels, [3, 2], "T", "Y")
+    assert updated != first
+    
+    # The persistent figure was updated in place rather than rebuilt
+    assert renderer._figures[(1, "priority")][0] is figure
+    assert bars[0].get_height() == 3
+
+def test_bar_chart_relabels_reused_figure():
+    """Test that a reused bar chart shows the new labels and title."""
+    renderer = ReportRenderer()
+    renderer.render_bar_chart(1, "category", ["Work", "Home"], [1, 2], "Old", "Tasks")
+    figure, _ = renderer._figures[(1, "category")]
+    renderer.render_bar_chart(1, "category", ["Gym", "Study"], [1, 2], "New", "Count")
+    
+    ax = renderer._figures[(1, "category")][0].axes[0]
+    assert renderer._figures[(1, "category")][0] is figure
+    assert [t.get_text() for t in ax.get_xticklabels()] == ["Gym", "Study"]
+    assert (ax.get_title(), ax.get_ylabel()) == ("New", "Count")
+    
+    # A new title alone is not served from the image cache
+    renderer.render_bar_chart(1, "category", ["Gym", "Study"], [1, 2], "Newer", "Count")
+    assert renderer.hits == 0
+
+def test_figures_bounded():
+    """Test that persistent figures are evicted least recently used first."""
+    renderer = ReportRenderer(max_figures=2)
+    for user_id in range(3):
+        renderer.render_bar_chart(user_id, "priority", ["A"], [1], "T", "Y")
+    
+    assert list(renderer._figures) == [(1, "priority"), (2, "priority")]
+
+def test_image_cache_bounded():
+    """Test that the image cache evicts least recently used entries."""
+    renderer = ReportRenderer(max_images=2)
+    for user_id in range(3):
+        renderer.render_bar_chart(user_id, "priority", ["A"], [1], "T", "Y")
+    
+    assert len(renderer._images) == 2
+    renderer.invalidate(2)
+    assert all(key[0] != 2 for key in renderer._images)
+
+def test_line_chart_updates_in_place():
+    """Test that time-series charts reuse their line artist."""
+    renderer = ReportRenderer()
+    days = [datetime.date(2026, 1, d) for d in range(1, 4)]
+    
+    renderer.render_line_chart(1, "xp", days, [0, 10, 20], "XP", "XP")
+    figure, lines = renderer._figures[(1, "xp")]
+    renderer.render_line_chart(1, "xp", days, [0, 10, 50], "XP", "XP")
+    
+    assert renderer._figures[(1, "xp")][0] is figure
+    assert list(lines[0].get_ydata()) == [0, 10, 50]
@@ -1,10 +1,21 @@
 """Integration tests for repository operations."""
+import dataclasses
 import datetime
+import sqlite3
+import tracemalloc
 
 import pytest
 
-from gamelife.core.config import TaskPriority, TaskStatus
-from gamelife.data.database import Task, User
+from gamelife.core.config import DatabaseConfig, TaskPriority, TaskStatus
+from gamelife.data.connection import PoolClosedError
+from gamelife.data.database import (
+    SCHEMA_VERSION,
+    DailyRollup,
+    Database,
+    Task,
+    User,
+    XPEvent
+)
 
 def test_user_crud(temp_db):
     """Test user creation, retrieval, and update operations."""
@@ -101,4 +112,491 @@ def test_task_filtering(temp_db, test_user):
     
     # Test getting all tasks
     all_tasks = temp_db.get_tasks(test_user.id)
-    assert len(all_tasks) == 4
\ No newline at end of file
+    assert len(all_tasks) == 4
+
+def test_connection_pool_reuse(temp_db):
+    """Test that connections are pooled and configured with WAL."""
+    with temp_db._pool.connection() as conn:
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode.lower() == "wal"
+        
+        # Nested use on the same thread shares the connection
+        with temp_db._pool.connection() as nested:
+            assert nested is conn
+    
+    with temp_db._pool.connection() as again:
+        assert again is conn
+
+def test_database_close(temp_db):
+    """Test that a closed database refuses further queries."""
+    temp_db.close()
+    with pytest.raises(PoolClosedError):
+        temp_db.get_user("nobody")
+
+def test_transaction_commit_and_rollback(temp_db, test_user):
+    """Test that transactions commit together or not at all."""
+    with temp_db.transaction():
+        temp_db.update_user_xp(test_user.id, 50, 1)
+        temp_db.update_user_streak(test_user.id, 2, 2, datetime.date.today())
+    
+    updated = temp_db.get_user_by_id(test_user.id)
+    assert updated.xp == 50
+    assert updated.streak == 2
+    
+    with pytest.raises(RuntimeError):
+        with temp_db.transaction():
+            temp_db.update_user_xp(test_user.id, 500, 6)
+            raise RuntimeError("abort")
+    
+    updated = temp_db.get_user_by_id(test_user.id)
+    assert updated.xp == 50
+    assert updated.level == 1
+
+def test_bulk_task_creation(temp_db, test_user):
+    """Test chunked bulk task insertion and id assignment."""
+    now = datetime.datetime.now(datetime.UTC)
+    tasks = (
+        Task(
+            id=None,
+            user_id=test_user.id,
+            title=f"Bulk {i}",
+            description="",
+            priority=TaskPriority.LOW,
+            status=TaskStatus.PENDING,
+            due_at=now
+        )
+        for i in range(25)
+    )
+    
+    ids = temp_db.create_tasks(tasks, chunk_size=10)
+    assert len(ids) == 25
+    assert ids == sorted(set(ids))
+    
+    stored = {t.id: t.title for t in temp_db.get_tasks(test_user.id)}
+    assert [stored[i] for i in ids] == [f"Bulk {i}" for i in range(25)]
+
+def test_task_counts(temp_db, test_user):
+    """Test aggregate task counting without loading tasks."""
+    now = datetime.datetime.now(datetime.UTC)
+    for priority, status, category in [
+        (TaskPriority.LOW, TaskStatus.COMPLETED, "home"),
+        (TaskPriority.LOW, TaskStatus.PENDING, "home"),
+        (TaskPriority.HIGH, TaskStatus.COMPLETED, "work"),
+        (TaskPriority.CRITICAL, TaskStatus.FAILED, None),
+    ]:
+        temp_db.create_task(Task(
+            id=None,
+            user_id=test_user.id,
+            title="Counted",
+            description="",
+            priority=priority,
+            status=status,
+            category=category,
+            due_at=now
+        ))
+    
+    assert temp_db.count_tasks(test_user.id) == 4
+    assert temp_db.count_tasks(test_user.id, TaskStatus.COMPLETED) == 2
+    assert temp_db.count_tasks(test_user.id, priority=TaskPriority.LOW) == 2
+    assert temp_db.count_tasks(test_user.id, category="work") == 1
+    assert temp_db.exists_task(test_user.id, TaskStatus.FAILED)
+    assert not temp_db.exists_task(test_user.id, TaskStatus.OVERDUE)
+    
+    assert temp_db.count_tasks_by(test_user.id, "status") == {
+        TaskStatus.COMPLETED: 2,
+        TaskStatus.PENDING: 1,
+        TaskStatus.FAILED: 1,
+    }
+    assert temp_db.count_tasks_by(
+        test_user.id, "priority", TaskStatus.COMPLETED
+    ) == {TaskPriority.LOW: 1, TaskPriority.HIGH: 1}
+    assert temp_db.count_tasks_by(test_user.id, "category") == {
+        "home": 2, "work": 1, None: 1
+    }
+
+def test_user_stats_maintained_on_write(temp_db, test_user):
+    """Test that per-user counters follow task inserts and updates."""
+    now = datetime.datetime.now(datetime.UTC)
+    task = temp_db.create_task(Task(
+        id=None,
+        user_id=test_user.id,
+        title="Tracked",
+        description="",
+        priority=TaskPriority.HIGH,
+        status=TaskStatus.PENDING,
+        category="work",
+        due_at=now
+    ))
+    
+    stats = temp_db.get_user_stats(test_user.id)
+    assert stats.total_tasks == 1
+    assert stats.by_status[TaskStatus.PENDING] == 1
+    assert stats.by_priority[TaskPriority.HIGH] == 1
+    assert stats.by_category == {"work": 1}
+    
+    temp_db.update_task_status(task.id, TaskStatus.COMPLETED, now)
+    temp_db.add_user_xp_totals(test_user.id, earned=50)
+    
+    stats = temp_db.get_user_stats(test_user.id)
+    assert stats.by_status[TaskStatus.PENDING] == 0
+    assert stats.by_status[TaskStatus.COMPLETED] == 1
+    assert stats.xp_earned == 50
+    assert stats.xp_lost == 0
+
+def test_keyset_pagination(temp_db, test_user):
+    """Test SQL-side filtering, ordering and keyset pagination."""
+    start = datetime.datetime(2026, 1, 1, tzinfo=datetime.UTC)
+    for i in range(10):
+        temp_db.create_task(Task(
+            id=None,
+            user_id=test_user.id,
+            title=f"Task {i}",
+            description="",
+            priority=TaskPriority.HIGH if i % 2 else TaskPriority.LOW,
+            status=TaskStatus.PENDING,
+            due_at=start + datetime.timedelta(days=9 - i)
+        ))
+    
+    pages = []
+    after = None
+    while True:
+        page = temp_db.query_tasks(test_user.id, after=after, limit=4)
+        if not page:
+            break
+        pages.append([t.title for t in page])
+        after = (page[-1].due_at, page[-1].id)
+    
+    assert [len(p) for p in pages] == [4, 4, 2]
+    assert sum(pages, []) == [f"Task {i}" for i in reversed(range(10))]
+    
+    high = temp_db.query_tasks(
+        test_user.id,
+        priority=TaskPriority.HIGH,
+        due_before=start + datetime.timedelta(days=5)
+    )
+    assert [t.title for t in high] == ["Task 9", "Task 7", "Task 5"]
+    
+    assert temp_db.get_task(high[0].id).title == "Task 9"
+
+def test_xp_ledger_snapshots(tmp_path):
+    """Test XP reconstruction from snapshots plus the ledger tail."""
+    with Database(tmp_path / "ledger.db", DatabaseConfig(xp_snapshot_interval=3)) as db:
+        user = db.create_user("ledger_user")
+        start = datetime.datetime(2026, 1, 1, tzinfo=datetime.UTC)
+        
+        for i in range(7):
+            db.record_xp_events([XPEvent(
+                user.id, 10 * (i + 1), "task_completed", None,
+                start + datetime.timedelta(days=i)
+            )])
+        
+        events = db.get_xp_events(user.id)
+        assert [e.delta for e in events] == [10, 20, 30, 40, 50, 60, 70]
+        
+        with db._pool.connection() as conn:
+            snapshots = conn.execute(
+                "SELECT xp FROM xp_snapshots WHERE user_id = ?", (user.id,)
+            ).fetchall()
+        assert [row[0] for row in snapshots] == [60, 210]  # After events 3 and 6
+        
+        assert db.get_xp_balance_at(user.id, start - datetime.timedelta(days=1)) == 0
+        assert db.get_xp_balance_at(user.id, start + datetime.timedelta(days=1)) == 30
+        assert db.get_xp_balance_at(user.id, start + datetime.timedelta(days=4)) == 150
+        assert db.get_xp_balance_at(user.id, start + datetime.timedelta(days=30)) == 280
+        
+        # A completion backdated before the snapshots, recorded after them
+        db.record_xp_events([XPEvent(
+            user.id, 5, "task_completed", None, start + datetime.timedelta(hours=12)
+        )])
+        assert db.get_xp_balance_at(user.id, start + datetime.timedelta(hours=1)) == 10
+        assert db.get_xp_balance_at(user.id, start + datetime.timedelta(days=1)) == 35
+        assert db.get_xp_balance_at(user.id, start + datetime.timedelta(days=30)) == 285
+        
+        # Snapshots never include events dated after the requested time
+        for i in range(3):
+            db.record_xp_events([XPEvent(
+                user.id, 1, "task_completed", None, start + datetime.timedelta(days=60)
+            )])
+        db.record_xp_events([XPEvent(
+            user.id, 100, "task_completed", None, start + datetime.timedelta(days=2)
+        )])
+        assert db.get_xp_balance_at(user.id, start + datetime.timedelta(days=30)) == 385
+        assert db.get_xp_balance_at(user.id, start + datetime.timedelta(days=61)) == 388
+
+def test_xp_ledger_timezones(temp_db, test_user):
+    """Test that ledger times are compared as instants, whatever their zone."""
+    pacific = datetime.timezone(datetime.timedelta(hours=-8))
+    # 06:00 at -08:00 is 14:00 UTC
+    temp_db.record_xp_events([XPEvent(
+        test_user.id, 35, "task_completed", None,
+        datetime.datetime(2026, 3, 1, 6, tzinfo=pacific)
+    )])
+    temp_db.record_xp_events([XPEvent(
+        test_user.id, 5, "task_completed", None, datetime.datetime(2026, 3, 1, 16)
+    )])
+    
+    def balance_at(hour, tz=datetime.UTC):
+        """Balance at ``hour`` on March 1st in ``tz``."""
+        when = datetime.datetime(2026, 3, 1, hour, tzinfo=tz)
+        return temp_db.get_xp_balance_at(test_user.id, when)
+    
+    assert balance_at(13) == 0
+    assert balance_at(14) == balance_at(6, pacific) == 35
+    assert balance_at(16) == temp_db.get_xp_balance_at(
+        test_user.id, datetime.datetime(2026, 3, 1, 16)
+    ) == 40
+    assert temp_db.get_xp_events(test_user.id)[0].created_at == datetime.datetime(
+        2026, 3, 1, 14, tzinfo=datetime.UTC
+    )
+
+def test_migrate_ledger_times(tmp_path):
+    """Test that ISO ledger times from schema version 2 become epochs."""
+    path = tmp_path / "ledger_v2.db"
+    with Database(path, DatabaseConfig(xp_snapshot_interval=2)) as db:
+        user = db.create_user("ledger_user")
+    
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO xp_events (user_id, delta, reason, created_at) VALUES (?, ?, ?, ?)",
+        [
+            (user.id, 10, "task_completed", "2026-03-01T06:00:00-08:00"),
+            (user.id, 20, "task_completed", "2026-03-01T10:00:00"),
+            (user.id, 30, "task_completed", "2026-03-01T12:00:00+00:00"),
+        ]
+    )
+    conn.execute(
+        "INSERT INTO xp_snapshots VALUES (?, 2, 30, '2026-03-01T10:00:00')", (user.id,)
+    )
+    conn.execute("PRAGMA user_version = 2")
+    conn.commit()
+    conn.close()
+    
+    with Database(path, DatabaseConfig(xp_snapshot_interval=2)) as db:
+        def balance_at(hour):
+            """Balance at ``hour`` UTC on March 1st."""
+            when = datetime.datetime(2026, 3, 1, hour, tzinfo=datetime.UTC)
+            return db.get_xp_balance_at(user.id, when)
+        
+        assert [balance_at(h) for h in (9, 11, 13, 15)] == [0, 20, 50, 60]
+        assert db.get_xp_events(user.id)[0].created_at.hour == 14
+
+def test_list_users_paginated(temp_db):
+    """Test keyset pagination of profiles by username."""
+    for name in ("carol", "alice", "dave", "bob", "erin"):
+        temp_db.create_user(name)
+    
+    pages = []
+    after = None
+    while True:
+        page = temp_db.list_users(limit=2, after=after)
+        if not page:
+            break
+        pages.append([user.username for user in page])
+        after = page[-1].username
+    
+    assert pages == [["alice", "bob"], ["carol", "dave"], ["erin"]]
+
+def test_leaderboard(temp_db):
+    """Test leaderboard pages, shared ranks and rank of a user."""
+    users = {}
+    for name, xp, streak in [
+        ("alice", 500, 3), ("bob", 900, 9), ("carol", 500, 1),
+        ("dave", 100, 4), ("erin", 0, 0)
+    ]:
+        users[name] = temp_db.create_user(name)
+        temp_db.update_user_xp(users[name].id, xp, xp // 100 + 1)
+        temp_db.update_user_streak(users[name].id, 0, streak, datetime.date(2024, 1, 1))
+    
+    top = temp_db.get_leaderboard("xp", limit=3)
+    assert [(e.rank, e.username, e.value) for e in top] == [
+        (1, "bob", 900), (2, "alice", 500), (2, "carol", 500)
+    ]
+    # A page starting inside a tie keeps the shared rank
+    page = temp_db.get_leaderboard("xp", limit=3, offset=2)
+    assert [(e.rank, e.username) for e in page] == [(2, "carol"), (4, "dave"), (5, "erin")]
+    
+    assert temp_db.get_user_rank(users["carol"].id, "xp").rank == 2
+    assert temp_db.get_user_rank(users["dave"].id, "longest_streak").rank == 2
+    assert temp_db.get_leaderboard("level", limit=1)[0].username == "bob"
+    
+    monday = datetime.date(2024, 1, 1)
+    temp_db.add_daily_rollups([
+        (users["erin"].id, DailyRollup(monday, 2, 0, 60, 0, TaskPriority.LOW)),
+        (users["dave"].id, DailyRollup(monday, 0, 1, 0, 15, TaskPriority.LOW)),
+        # Sunday belongs to the previous week
+        (users["bob"].id, DailyRollup(
+            monday - datetime.timedelta(days=1), 1, 0, 99, 0, TaskPriority.HIGH
+        )),
+    ])
+    weekly = temp_db.get_leaderboard("weekly_xp", limit=5, since=monday)
+    assert (weekly[0].username, weekly[0].value) == ("erin", 60)
+    assert (weekly[-1].rank, weekly[-1].username, weekly[-1].value) == (5, "dave", -15)
+    assert temp_db.get_user_rank(users["bob"].id, "weekly_xp", since=monday).rank == 2
+    
+    with pytest.raises(ValueError):
+        temp_db.get_leaderboard("karma")
+
+def test_timestamps_round_trip_exactly(temp_db, test_user):
+    """Test that epoch-encoded timestamps keep microseconds and come back aware."""
+    due = datetime.datetime(2024, 2, 29, 23, 59, 59, 999999, tzinfo=datetime.UTC)
+    local = datetime.timezone(datetime.timedelta(hours=5, minutes=30))
+    completed = datetime.datetime(2024, 3, 1, 4, 0, 0, 1, tzinfo=local)
+    task = temp_db.create_task(Task(
+        None, test_user.id, "Precise", "", TaskPriority.HIGH,
+        TaskStatus.COMPLETED, due, completed
+    ))
+    
+    stored = temp_db.get_task(task.id)
+    assert stored.due_at == due
+    assert stored.completed_at == completed
+    assert stored.completed_at.tzinfo is datetime.UTC
+    assert (stored.priority, stored.status) == (TaskPriority.HIGH, TaskStatus.COMPLETED)
+    assert stored.created_at.tzinfo is datetime.UTC
+
+def test_migrate_text_columns(tmp_path):
+    """Test that a version 0 database with TEXT enums and ISO dates is migrated."""
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            xp INTEGER NOT NULL DEFAULT 0,
+            level INTEGER NOT NULL DEFAULT 1,
+            streak INTEGER NOT NULL DEFAULT 0,
+            longest_streak INTEGER NOT NULL DEFAULT 0,
+            last_completion_date DATE,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT,
+            priority TEXT NOT NULL,
+            status TEXT NOT NULL,
+            category TEXT,
+            due_at TIMESTAMP NOT NULL,
+            completed_at TIMESTAMP,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE daily_rollups (
+            user_id INTEGER NOT NULL,
+            day DATE NOT NULL,
+            priority TEXT NOT NULL,
+            completed INTEGER NOT NULL DEFAULT 0,
+            failed INTEGER NOT NULL DEFAULT 0,
+            xp_gained INTEGER NOT NULL DEFAULT 0,
+            xp_lost INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, day, priority)
+        ) WITHOUT ROWID;
+        INSERT INTO users (username) VALUES ('legacy');
+        INSERT INTO tasks (user_id, title, priority, status, due_at, completed_at)
+        VALUES
+            (1, 'Done', 'HIGH', 'COMPLETED',
+             '2024-01-02T09:00:00+00:00', '2024-01-01T18:30:00.250000+00:00'),
+            (1, 'Open', 'LOW', 'PENDING', '2024-01-05T12:00:00', NULL);
+        INSERT INTO daily_rollups VALUES (1, '2024-01-01', 'HIGH', 1, 0, 50, 0);
+    """)
+    conn.commit()
+    conn.close()
+    
+    with Database(path) as db:
+        done, open_task = sorted(db.get_tasks(1), key=lambda task: task.id)
+        assert (done.priority, done.status) == (TaskPriority.HIGH, TaskStatus.COMPLETED)
+        assert done.completed_at == datetime.datetime(
+            2024, 1, 1, 18, 30, 0, 250000, tzinfo=datetime.UTC
+        )
+        # Naive legacy timestamps are read as UTC
+        assert open_task.due_at == datetime.datetime(2024, 1, 5, 12, tzinfo=datetime.UTC)
+        assert open_task.completed_at is None
+        
+        stats = db.get_user_stats(1)
+        assert stats.by_status[TaskStatus.COMPLETED] == 1
+        assert stats.by_priority[TaskPriority.LOW] == 1
+        rollups = db.get_daily_rollups(
+            1, datetime.date(2024, 1, 1), datetime.date(2024, 1, 2), by_priority=True
+        )
+        assert [(r.priority, r.xp_gained) for r in rollups] == [(TaskPriority.HIGH, 50)]
+        
+        # New writes go through the triggers with integer codes
+        db.update_task_status(open_task.id, TaskStatus.FAILED)
+        assert db.get_user_stats(1).by_status[TaskStatus.FAILED] == 1
+        
+        with db._pool.connection() as check:
+            assert check.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+
+def test_model_timestamp_defaults():
+    """Test that models get their own creation time and no instance dict."""
+    due = datetime.datetime.now(datetime.UTC)
+    first = Task(None, 1, "First", "", TaskPriority.LOW, TaskStatus.PENDING, due)
+    second = Task(None, 1, "Second", "", TaskPriority.LOW, TaskStatus.PENDING, due)
+    assert first.created_at >= due
+    assert second.created_at >= first.created_at
+    assert User(None, "fresh").created_at >= due
+    assert not hasattr(first, "__dict__")
+
+def test_task_memory_footprint():
+    """Test that a Task takes less memory than the unslotted layout it replaced.
+    
+    Sizes include each object's list slot, with field values shared as
+    when built from one row.
+    """
+    def bytes_per_task(model, count=20000):
+        """Traced allocation per instance of ``model``."""
+        due = datetime.datetime.now(datetime.UTC)
+        values = (None, 1, "Task", "", TaskPriority.LOW, TaskStatus.PENDING,
+                  due, None, None, due, due)
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            tasks = [model(*values) for _ in range(count)]
+            used = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        assert len(tasks) == count
+        return used / count
+    
+    unslotted = dataclasses.make_dataclass(
+        "UnslottedTask", [(f.name, f.type) for f in dataclasses.fields(Task)]
+    )
+    assert bytes_per_task(Task) < bytes_per_task(unslotted)
+
+def test_search_tasks(temp_db, test_user):
+    """Test ranked full-text search kept in sync with task writes."""
+    other = temp_db.create_user("other_user")
+    due = datetime.datetime.now(datetime.UTC)
+    tasks = [
+        Task(None, test_user.id, "Quarterly report", "Draft the numbers",
+             TaskPriority.HIGH, TaskStatus.PENDING, due, None, "work"),
+        Task(None, test_user.id, "Meeting notes", "Attach to the report",
+             TaskPriority.LOW, TaskStatus.PENDING, due, None, "work"),
+        Task(None, test_user.id, "Groceries", "Café, milk and eggs",
+             TaskPriority.LOW, TaskStatus.COMPLETED, due, due, "home"),
+        Task(None, other.id, "Other report", "", TaskPriority.LOW,
+             TaskStatus.PENDING, due),
+    ]
+    report, notes, groceries, _ = [temp_db.create_task(task) for task in tasks]
+    
+    # Title matches rank above description matches; other users are excluded
+    assert [t.id for t in temp_db.search_tasks(test_user.id, "report")] == [
+        report.id, notes.id
+    ]
+    assert [t.id for t in temp_db.search_tasks(test_user.id, "quart")] == [report.id]
+    assert [t.id for t in temp_db.search_tasks(test_user.id, "cafe HOME")] == [groceries.id]
+    assert temp_db.search_tasks(test_user.id, "report", priority=TaskPriority.LOW)[0].id == notes.id
+    assert temp_db.search_tasks(test_user.id, "report", limit=1)[0].id == report.id
+    # Query syntax is taken literally
+    assert temp_db.search_tasks(test_user.id, 'report" OR "eggs') == []
+    assert temp_db.search_tasks(test_user.id, "  *  ") == []
+    
+    notes.title = "Standup summary"
+    notes.description = ""
+    temp_db.update_task(notes)
+    assert [t.id for t in temp_db.search_tasks(test_user.id, "report")] == [report.id]
+    assert [t.id for t in temp_db.search_tasks(test_user.id, "standup")] == [notes.id]
+    
+    with temp_db._pool.connection() as conn:
+        conn.execute("DELETE FROM tasks WHERE id = ?", (report.id,))
+    assert temp_db.search_tasks(test_user.id, "report") == []
@@ -0,0 +1,10 @@
+"""Test cases for application startup cost."""
+from gamelife.__main__ import profile_startup_imports
+
+def test_startup_skips_matplotlib():
+    """Test that matplotlib and NumPy are not imported before they are needed."""
+    packages = dict(profile_startup_imports())
+    
+    assert "gamelife" in packages
+    assert "matplotlib" not in packages
+    assert "numpy" not in packages
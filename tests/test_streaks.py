@@ -0,0 +1,66 @@
+"""Test cases for completion calendars and streaks."""
+import datetime
+
+from gamelife.core.config import TaskPriority, TaskStatus
+from gamelife.core.game import GameEngine
+from gamelife.core.streaks import CompletionCalendar
+from gamelife.data.database import Task
+
+def day(n: int) -> datetime.date:
+    """The n-th day of January 2024."""
+    return datetime.date(2024, 1, n)
+
+def test_calendar_streaks():
+    """Test streak runs computed from the bitmap."""
+    calendar = CompletionCalendar.from_days(
+        [day(5), day(2), day(3), day(4), day(10), day(11)]
+    )
+    assert calendar.start == day(2)
+    assert calendar.last_day == day(11)
+    assert calendar.longest_streak() == 4
+    assert calendar.run_ending(day(4)) == 3
+    assert calendar.current_streak(day(11)) == 2
+    assert calendar.current_streak(day(12)) == 2  # Yesterday still counts
+    assert calendar.current_streak(day(13)) == 0
+
+    # Backfilling before the start re-bases the bitmap
+    calendar.add(day(1))
+    assert calendar.start == day(1)
+    assert calendar.longest_streak() == 5
+
+    restored = CompletionCalendar.from_bytes(calendar.start, calendar.to_bytes())
+    assert restored.bits == calendar.bits
+    assert CompletionCalendar().longest_streak() == 0
+
+def test_streaks_from_backfilled_completions(temp_db, test_user):
+    """Test streaks when completions arrive out of order or in bulk."""
+    game = GameEngine(temp_db)
+    today = datetime.date.today()
+    noon = datetime.datetime.combine(today, datetime.time(12)).astimezone()
+
+    def complete(days_ago: int):
+        """Complete a new task ``days_ago`` days before today."""
+        task = temp_db.create_task(Task(
+            None, test_user.id, f"Task {days_ago}", "", TaskPriority.LOW,
+            TaskStatus.PENDING, noon
+        ))
+        game.complete_task(task, noon - datetime.timedelta(days=days_ago))
+
+    complete(0)
+    complete(2)
+    assert temp_db.get_user_by_id(test_user.id).streak == 1
+    complete(1)  # Fills the gap
+    user = temp_db.get_user_by_id(test_user.id)
+    assert (user.streak, user.longest_streak, user.last_completion_date) == (3, 3, today)
+
+    # Bulk-imported history is picked up by a rebuild
+    temp_db.create_tasks(
+        Task(None, test_user.id, f"Old {n}", "", TaskPriority.LOW,
+             TaskStatus.COMPLETED, noon, noon - datetime.timedelta(days=n))
+        for n in range(10, 15)
+    )
+    temp_db.rebuild_completion_calendars([test_user.id])
+    user = temp_db.get_user_by_id(test_user.id)
+    assert (user.streak, user.longest_streak) == (3, 5)
+    calendar = temp_db.get_completion_calendar(test_user.id)
+    assert calendar.start == today - datetime.timedelta(days=14)
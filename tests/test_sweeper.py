@@ -0,0 +1,66 @@
+"""Test cases for the overdue task sweeper."""
+import datetime
+
+from gamelife.core.config import TaskPriority, TaskStatus
+from gamelife.core.game import GameEngine
+from gamelife.core.sweeper import sweep_overdue
+from gamelife.data.database import Task
+
+def test_sweep_overdue(temp_db, test_user):
+    """Test that past-due tasks become overdue, then fail with penalties."""
+    game = GameEngine(temp_db)
+    now = datetime.datetime.now(datetime.UTC)
+    temp_db.update_user_xp(test_user.id, 100, 2)
+
+    def make(title, status, due_at):
+        """Create a task for the test user."""
+        return temp_db.create_task(Task(
+            None, test_user.id, title, "", TaskPriority.MEDIUM, status, due_at
+        ))
+
+    expired = make("Expired", TaskStatus.PENDING, now - datetime.timedelta(days=2))
+    late = make("Late", TaskStatus.IN_PROGRESS, now - datetime.timedelta(hours=1))
+    future = make("Future", TaskStatus.PENDING, now + datetime.timedelta(days=1))
+    done = make("Done", TaskStatus.COMPLETED, now - datetime.timedelta(days=3))
+
+    result = sweep_overdue(game, now, batch_size=1)
+    assert (result.overdue, result.failed) == (1, 1)
+    assert dict(result.xp_lost) == {test_user.id: 38}
+
+    statuses = {t.id: t.status for t in temp_db.get_tasks(test_user.id)}
+    assert statuses == {
+        expired.id: TaskStatus.FAILED,
+        late.id: TaskStatus.OVERDUE,
+        future.id: TaskStatus.PENDING,
+        done.id: TaskStatus.COMPLETED,
+    }
+    user = temp_db.get_user_by_id(test_user.id)
+    assert user.xp == 62
+    assert temp_db.get_user_stats(test_user.id).xp_lost == 38
+
+    # Already-overdue tasks are not counted again
+    result = sweep_overdue(game, now)
+    assert (result.overdue, result.failed) == (0, 0)
+
+    # Once past the grace period the overdue task fails too
+    result = sweep_overdue(game, now + datetime.timedelta(days=1))
+    assert (result.overdue, result.failed) == (0, 1)
+    assert temp_db.get_task(late.id).status == TaskStatus.FAILED
+    assert temp_db.get_user_by_id(test_user.id).xp == 24
+
+def test_sweep_reports_floored_xp_lost(temp_db, test_user):
+    """Test that xp_lost counts only the XP users actually had to lose."""
+    game = GameEngine(temp_db)
+    now = datetime.datetime.now(datetime.UTC)
+    temp_db.update_user_xp(test_user.id, 20, 1)
+    for i in range(2):
+        temp_db.create_task(Task(
+            None, test_user.id, f"Expired {i}", "", TaskPriority.MEDIUM,
+            TaskStatus.PENDING, now - datetime.timedelta(days=2)
+        ))
+
+    result = sweep_overdue(game, now)
+    assert result.failed == 2
+    assert dict(result.xp_lost) == {test_user.id: 20}
+    assert temp_db.get_user_by_id(test_user.id).xp == 0
+    assert temp_db.get_user_stats(test_user.id).xp_lost == 20
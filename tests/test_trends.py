@@ -0,0 +1,38 @@
+"""Test cases for time-series report data."""
+import datetime
+import math
+
+from gamelife.core import trends
+from gamelife.data.database import DailyRollup
+
+def test_fill_days_and_xp_over_time():
+    """Test zero-filling and cumulative XP."""
+    start = datetime.date(2026, 3, 2)  # A Monday
+    rollups = [
+        DailyRollup(day=start, completed=2, xp_gained=30),
+        DailyRollup(day=start + datetime.timedelta(days=2), failed=1, xp_lost=15),
+    ]
+    
+    days = trends.fill_days(rollups, start, start + datetime.timedelta(days=4))
+    assert [d.day for d in days] == [
+        start + datetime.timedelta(days=i) for i in range(4)
+    ]
+    assert trends.xp_over_time(days)[1] == [30, 30, 15, 15]
+    assert trends.completions_per_day(days)[1] == [2, 0, 0, 0]
+
+def test_weekly_trends():
+    """Test weekly completion counts and failure rates."""
+    start = datetime.date(2026, 3, 2)
+    rollups = [
+        DailyRollup(day=start, completed=3, failed=1),
+        DailyRollup(day=start + datetime.timedelta(days=6), completed=1),
+    ]
+    days = trends.fill_days(rollups, start, start + datetime.timedelta(days=14))
+    
+    weeks, counts = trends.completions_per_week(days)
+    assert weeks == [start, start + datetime.timedelta(days=7)]
+    assert counts == [4, 0]
+    
+    _, rates = trends.failure_rate_per_week(days)
+    assert rates[0] == 20
+    assert math.isnan(rates[1])
@@ -0,0 +1,20 @@
+"""Test cases for GUI widgets."""
+import datetime
+import time
+
+from gamelife.core.config import TaskPriority, TaskStatus
+from gamelife.data.database import Task
+from gamelife.gui.widgets import LazyTaskTree
+
+def test_row_values_local_due_time(monkeypatch):
+    """Test that due times stored in UTC are shown in local time."""
+    monkeypatch.setenv("TZ", "America/Los_Angeles")
+    time.tzset()
+    try:
+        due = datetime.datetime(2026, 1, 10, 3, tzinfo=datetime.UTC)
+        task = Task(None, 1, "Task", "", TaskPriority.LOW, TaskStatus.PENDING, due)
+        assert LazyTaskTree.row_values(task)[3] == "2026-01-09 19:00"
+
+    finally:
+        monkeypatch.delenv("TZ")
+        time.tzset()